@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+Position = Tuple[datetime, int]
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that resumes after the last row served.
+
+    The cursor encodes that row's sort key, so every page is one range scan of
+    an index: no ``COUNT(*)`` and no ``OFFSET``, whatever the page number.
+    Subclasses define the ordering and how a position is stored in the cursor.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size: Optional[int] = None  # defaults to the PAGE_SIZE setting
+    max_page_size = 200
+    invalid_cursor_message = "Invalid cursor"
+    ordering: Tuple[str, ...] = ()
+
+    def paginate_queryset(
+        self, queryset: QuerySet[Any, Any], request: Request, view: Any = None
+    ) -> List[Any]:
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = self.after(queryset, position)
+        rows = list(queryset[: page_size + 1])
+        page = rows[:page_size]
+        self.next_position = (
+            self.position_of(page[-1]) if len(rows) > page_size else None
+        )
+        return page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            page_size = 0
+        if page_size <= 0:
+            return int(self.page_size or api_settings.PAGE_SIZE or 20)
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def encode_cursor(self, position: Any) -> str:
+        raw = self.dump_position(position).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request: Request) -> Any:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            return self.load_position(raw.decode())
+        except ValueError as exc:  # also bad base64 and UTF-8
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def after(self, queryset: QuerySet[Any, Any], position: Any) -> QuerySet[Any, Any]:
+        raise NotImplementedError
+
+    def position_of(self, row: Any) -> Any:
+        raise NotImplementedError
+
+    def dump_position(self, position: Any) -> str:
+        raise NotImplementedError
+
+    def load_position(self, raw: str) -> Any:
+        """Parse a decoded cursor; raise ``ValueError`` if it is malformed."""
+        raise NotImplementedError
+
+
+class CreatedCursorPagination(KeysetPagination):
+    """Keyset pagination on ``(created_at, id)``, newest first.
+
+    Pages are range scans of the ``(user, created_at, id)`` index. Rows may be
+    model instances or ``values()`` dicts that include ``created_at`` and ``id``.
+    """
+
+    ordering = ("-created_at", "-id")
+
+    def after(
+        self, queryset: QuerySet[Any, Any], position: Tuple[datetime, int]
+    ) -> QuerySet[Any, Any]:
+        created_at, pk = position
+        return queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    def position_of(self, row: Any) -> Tuple[datetime, int]:
+        if isinstance(row, dict):
+            return row["created_at"], row["id"]
+        return row.created_at, row.pk
+
+    def dump_position(self, position: Tuple[datetime, int]) -> str:
+        created_at, pk = position
+        return f"{created_at.isoformat()}|{pk}"
+
+    def load_position(self, raw: str) -> Tuple[datetime, int]:
+        created_raw, pk_raw = raw.split("|")
+        created_at = parse_datetime(created_raw)
+        if created_at is None:
+            raise ValueError(created_raw)
+        return created_at, int(pk_raw)
+
+
+class InsertionCursorPagination(KeysetPagination):
+    """Keyset pagination on ``id``, oldest first: rows in the order they were stored.
+
+    Meant for the products of one search request, which are read back in query
+    order; pages are larger because clients usually walk all of them.
+    """
+
+    ordering = ("id",)
+    page_size = 500
+    max_page_size = 1000
+
+    def after(self, queryset: QuerySet[Any, Any], position: int) -> QuerySet[Any, Any]:
+        return queryset.filter(id__gt=position)
+
+    def position_of(self, row: Any) -> int:
+        return int(row["id"] if isinstance(row, dict) else row.pk)
+
+    def dump_position(self, position: int) -> str:
+        return str(position)
+
+    def load_position(self, raw: str) -> int:
+        return int(raw)
+
+
+class UpdatedCursorPagination(CreatedCursorPagination):
+    """Keyset pagination on ``(updated_at, id)``, oldest change first.
+
+    Used as a "changed since" cursor: each page holds the rows modified after
+    the position the client last saw.
+    """
+
+    ordering = ("updated_at", "id")
+
+    def after(
+        self, queryset: QuerySet[Any, Any], position: Tuple[datetime, int]
+    ) -> QuerySet[Any, Any]:
+        updated_at, pk = position
+        return queryset.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk)
+        )
+
+    def position_of(self, row: Any) -> Tuple[datetime, int]:
+        if isinstance(row, dict):
+            return row["updated_at"], row["id"]
+        return row.updated_at, row.pk
+
+
+class ChangesCursorPagination(KeysetPagination):
+    """``(updated_at, id)`` "changed since" cursor that survives late commits.
+
+    ``updated_at`` is stamped before the transaction commits, so a row can show
+    up after a later-stamped one was already served. The cursor holds two
+    positions: ``settled``, up to which every row has been served, and
+    ``served``, the last row handed out. Rows after ``settled`` are read again
+    until they are older than the settle window, so clients must de-duplicate.
+    A plain ``(updated_at, id)`` cursor is read as both positions.
+    """
+
+    ordering = UpdatedCursorPagination.ordering
+    positions = UpdatedCursorPagination()
+
+    def after(
+        self, queryset: QuerySet[Any, Any], position: Position
+    ) -> QuerySet[Any, Any]:
+        return self.positions.after(queryset, position)
+
+    def position_of(self, row: Any) -> Position:
+        return self.positions.position_of(row)
+
+    def dump_position(self, position: Tuple[Position, Position]) -> str:
+        settled, served = position
+        dump = self.positions.dump_position
+        return f"{dump(settled)}|{dump(served)}"
+
+    def load_position(self, raw: str) -> Tuple[Position, Position]:
+        parts = raw.split("|")
+        if len(parts) == 2:
+            position = self.positions.load_position(raw)
+            return position, position
+        if len(parts) != 4:
+            raise ValueError(raw)
+        load = self.positions.load_position
+        return load("|".join(parts[:2])), load("|".join(parts[2:]))
@@ -0,0 +1,83 @@
+"""Spreadsheet export of product lists, read and streamed in batches."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Sequence
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+
+from backend.apps.products.models import Product
+from backend.apps.products.renderers import TableRenderer
+from backend.apps.products.rows import iter_product_values
+
+# (values() key, column title), in the order of the SPA results table.
+EXPORT_COLUMNS = (
+    ("artid", "Артикул"),
+    ("brand", "Бренд"),
+    ("pin", "Номер"),
+    ("name", "Наименование"),
+    ("price", "Цена"),
+    ("currency", "Валюта"),
+    ("available_quantity", "Кол-во"),
+    ("multiplicity", "Кратн."),
+    ("minimum_order", "Мин. партия"),
+    ("supply_probability", "Вероятность"),
+    ("delivery_date", "Доставка"),
+    ("warehouse_partner", "Склад партнёра"),
+    ("warehouse_code", "Склад Armtek"),
+    ("return_days", "Возврат, дн."),
+    ("import_flag", "Импорт/ПРО"),
+    ("special_flag", "713"),
+    ("max_retail_price", "Макс. розн."),
+    ("markup", "Наценка"),
+    ("importer_markup", "Надбавка имп."),
+    ("producer_price", "Цена производителя"),
+    ("markup_rest_rub", "Остаток надб., ₽"),
+    ("markup_rest_percent", "Остаток надб., %"),
+    ("is_analog", "Аналог"),
+    ("note", "Примечание"),
+    ("details__image_url", "Фото"),
+    ("details__weight", "Вес, кг"),
+    ("details__length", "Длина, см"),
+    ("details__width", "Ширина, см"),
+    ("details__height", "Высота, см"),
+    ("details__analog_code", "Код аналога"),
+)
+EXPORT_HEADER = [title for _, title in EXPORT_COLUMNS]
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "да" if value else "нет"
+    if value == "":
+        return None
+    return value
+
+
+def _row(values: Dict[str, Any]) -> List[Any]:
+    return [_cell(values[key]) for key, _ in EXPORT_COLUMNS]
+
+
+def export_rows(products: QuerySet[Product]) -> Iterator[List[Sequence[Any]]]:
+    """Table rows of ``products`` in id order, one database batch at a time."""
+    for batch in iter_product_values(products):
+        yield [_row(values) for values in batch]
+
+
+def export_response(
+    renderer: TableRenderer, products: QuerySet[Product], filename: str
+) -> StreamingHttpResponse:
+    """Stream ``products`` as a ``renderer`` spreadsheet download."""
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f"{content_type}; charset={renderer.charset}"
+    response = StreamingHttpResponse(
+        renderer.stream(EXPORT_HEADER, export_rows(products)),
+        content_type=content_type,
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{renderer.format}"'
+    )
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_armtek_fields"),
+        ("search", "0005_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="product",
+            name="products_pr_user_id_c7a680_idx",
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="products_pr_user_id_6a0745_idx",
+            ),
+        ),
+    ]
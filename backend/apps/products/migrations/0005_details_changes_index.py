@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="productdetailsrequest",
+            index=models.Index(
+                fields=["updated_at", "id"], name="products_pr_updated_bb62a1_idx"
+            ),
+        ),
+    ]
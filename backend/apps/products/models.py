@@ -77,7 +77,8 @@ class Product(models.Model):
 
         unique_together = ("search_request", "artid")
         indexes = [
-            models.Index(fields=["user"]),
+            # Keyset pagination of a user's products, newest first.
+            models.Index(fields=["user", "created_at", "id"]),
             models.Index(fields=["search_request"]),
             models.Index(fields=["pin"]),
             models.Index(fields=["brand"]),
@@ -104,6 +105,11 @@ class ProductDetailsRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        """Index for the "changed since" details feed."""
+
+        indexes = [models.Index(fields=["updated_at", "id"])]
+
     def __str__(self) -> str:  # pragma: no cover - display helper
         return (
             f"Details request for {self.product_id}"
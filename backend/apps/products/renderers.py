@@ -0,0 +1,104 @@
+"""Spreadsheet renderers that write a table one batch of rows at a time."""
+
+from __future__ import annotations
+
+import csv
+import tempfile
+from itertools import chain
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+import xlsxwriter
+from rest_framework.renderers import BaseRenderer
+
+Row = Sequence[Any]
+
+
+class TableRenderer(BaseRenderer):
+    """Renderer of exported tables; plain responses become a ``detail`` table."""
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        # Used for error responses raised before streaming starts (401, 404, ...)
+        detail = data.get("detail", data) if isinstance(data, Mapping) else data
+        return b"".join(self.stream(["detail"], [[[str(detail)]]]))
+
+    def stream(self, header: Row, batches: Iterable[List[Row]]) -> Iterator[bytes]:
+        raise NotImplementedError
+
+
+# Spreadsheets evaluate text cells starting with these characters as formulas.
+_FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+
+def _escape_row(row: Row) -> List[Any]:
+    """Quote text cells that a spreadsheet would evaluate as a formula."""
+    return [
+        (
+            "'" + value
+            if value.__class__ is str and value.startswith(_FORMULA_PREFIXES)
+            else value
+        )
+        for value in row
+    ]
+
+
+class _Echo:
+    """File-like object for ``csv.writer`` that returns the line it is given."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class CSVRenderer(TableRenderer):
+    """UTF-8 CSV with a byte order mark so Excel detects the encoding."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def stream(self, header: Row, batches: Iterable[List[Row]]) -> Iterator[bytes]:
+        writer = csv.writer(_Echo())
+        yield ("\ufeff" + writer.writerow(header)).encode()
+        for batch in batches:
+            yield "".join(writer.writerow(_escape_row(row)) for row in batch).encode()
+
+
+# Spooled workbooks move to disk above this size; the file is sent in chunks.
+_SPOOL_SIZE = 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+
+class XLSXRenderer(TableRenderer):
+    """Single-sheet workbook built by ``xlsxwriter`` in constant memory.
+
+    Rows are flushed to a temporary file as they are written, the workbook goes
+    to a spooled temporary file and is sent from there once it is closed.
+    """
+
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    format = "xlsx"
+    charset = None
+    render_style = "binary"
+
+    def stream(self, header: Row, batches: Iterable[List[Row]]) -> Iterator[bytes]:
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE) as output:
+            workbook = xlsxwriter.Workbook(
+                output,
+                {
+                    "constant_memory": True,
+                    # Text from Armtek is data, never a formula or a link.
+                    "strings_to_formulas": False,
+                    "strings_to_urls": False,
+                },
+            )
+            sheet = workbook.add_worksheet("Products")
+            for index, row in enumerate(chain([header], *batches)):
+                sheet.write_row(index, 0, row)
+            workbook.close()
+            output.seek(0)
+            while chunk := output.read(_CHUNK_SIZE):
+                yield chunk
@@ -0,0 +1,170 @@
+"""Read-only fast path for product lists.
+
+Produces exactly what ``ProductSerializer(many=True)`` does, but from one
+``values()`` query joined with details and details_request: rows are plain
+dicts and only decimals and datetimes go through their DRF field for
+formatting, so no model instances or per-object field machinery are involved.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from backend.apps.products.models import DetailsRequestStatus, Product
+from backend.apps.products.serializers import (
+    ProductDetailsSerializer,
+    ProductSerializer,
+)
+
+# Rows fetched per query when serializing products already in memory.
+_BATCH_SIZE = 500
+_RELATED_FIELDS = ("details", "details_status", "details_error", "request_id")
+_PRODUCT_FIELDS = tuple(
+    name for name in ProductSerializer.Meta.fields if name not in _RELATED_FIELDS
+)
+_DETAILS_FIELDS = tuple(ProductDetailsSerializer.Meta.fields)
+PRODUCT_VALUES = (
+    *_PRODUCT_FIELDS,
+    "details__id",
+    *(f"details__{name}" for name in _DETAILS_FIELDS),
+    "details_request__status",
+    "details_request__request_id",
+    "details_request__last_error",
+)
+
+_Formats = Tuple[Tuple[str, str, Optional[Callable[[Any], Any]]], ...]
+
+
+@lru_cache(maxsize=None)
+def _formats() -> Tuple[_Formats, _Formats]:
+    def formats(
+        serializer: serializers.Serializer[Any], names: Sequence[str], prefix: str
+    ) -> _Formats:
+        found = []
+        for name in names:
+            field = serializer.fields[name]
+            # Other columns already come back from the database as JSON values.
+            formatter = (
+                field.to_representation
+                if isinstance(
+                    field, (serializers.DecimalField, serializers.DateTimeField)
+                )
+                else None
+            )
+            found.append((name, f"{prefix}{name}", formatter))
+        return tuple(found)
+
+    return (
+        formats(ProductSerializer(), _PRODUCT_FIELDS, ""),
+        formats(ProductDetailsSerializer(), _DETAILS_FIELDS, "details__"),
+    )
+
+
+def _pick(
+    values: Mapping[str, Any], formats: _Formats, memo: Dict[str, Dict[Any, Any]]
+) -> Dict[str, Any]:
+    row = {}
+    for name, key, formatter in formats:
+        value = values[key]
+        if formatter is not None and value is not None:
+            # Prices and fetch times repeat across rows; format each value once.
+            seen = memo[key]
+            formatted = seen.get(value)
+            if formatted is None:
+                formatted = seen[value] = formatter(value)
+            value = formatted
+        row[name] = value
+    return row
+
+
+def product_rows(values: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn ``values(*PRODUCT_VALUES)`` dicts into ``ProductSerializer`` rows."""
+    product_formats, details_formats = _formats()
+    memo: Dict[str, Dict[Any, Any]] = defaultdict(dict)
+    rows = []
+    for value in values:
+        row = _pick(value, product_formats, memo)
+        row["details"] = (
+            None
+            if value["details__id"] is None
+            else _pick(value, details_formats, memo)
+        )
+        request_id = value["details_request__request_id"]
+        if request_id is None:
+            row["details_status"] = DetailsRequestStatus.PENDING
+            row["details_error"] = None
+            row["request_id"] = None
+        else:
+            row["details_status"] = value["details_request__status"]
+            row["details_error"] = value["details_request__last_error"] or None
+            row["request_id"] = str(request_id)
+        rows.append(row)
+    return rows
+
+
+def product_values(
+    products: QuerySet[Product], *extra: str
+) -> QuerySet[Product, Dict[str, Any]]:
+    """The ``values()`` projection ``product_rows`` reads; can be paginated.
+
+    ``extra`` columns (e.g. a pagination key) are fetched but not serialized.
+    """
+    values: QuerySet[Product, Dict[str, Any]] = products.values(*PRODUCT_VALUES, *extra)
+    return values
+
+
+def serialize_products(products: QuerySet[Product]) -> List[Dict[str, Any]]:
+    """``ProductSerializer(products, many=True).data`` in a single query."""
+    return product_rows(product_values(products))
+
+
+def serialize_product_list(products: Sequence[Product]) -> List[Dict[str, Any]]:
+    """Rows for products already in memory, in their order (repeats allowed)."""
+    ids = list(dict.fromkeys(product.pk for product in products))
+    by_id: Dict[int, Dict[str, Any]] = {}
+    for start in range(0, len(ids), _BATCH_SIZE):
+        batch = Product.objects.filter(pk__in=ids[start : start + _BATCH_SIZE])
+        by_id.update((row["id"], row) for row in serialize_products(batch))
+    return [by_id[product.pk] for product in products]
+
+
+def iter_product_values(
+    products: QuerySet[Product], *extra: str, batch_size: int = _BATCH_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """``product_values`` rows in id order, one keyset query per batch.
+
+    Only a batch is held in memory at a time, however many products match.
+    """
+    last_id = 0
+    while True:
+        values = product_values(products.filter(id__gt=last_id).order_by("id"), *extra)
+        batch = list(values[:batch_size])
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1]["id"]
+
+
+def iter_product_rows(
+    products: QuerySet[Product], batch_size: int = _BATCH_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """Serialized rows of ``products`` in id order, a batch at a time."""
+    for batch in iter_product_values(products, batch_size=batch_size):
+        yield product_rows(batch)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable
 
+from django.db.models import Manager, QuerySet, prefetch_related_objects
 from rest_framework import serializers
 
 from backend.apps.products.models import (
@@ -49,6 +50,26 @@ class ProductDetailsInputSerializer(serializers.Serializer[dict[str, Any]]):
     analog_code = serializers.CharField(required=False, allow_blank=True)
 
 
+# Relations ProductSerializer reads for every product.
+PRODUCT_RELATED = ("details", "details_request")
+
+
+class ProductListSerializer(serializers.ListSerializer[Product]):
+    """Loads the relations of all products up front instead of once per row."""
+
+    def to_representation(  # type: ignore[override]
+        self, data: Manager[Any] | Iterable[Any]
+    ) -> list[Any]:
+        if isinstance(data, Manager):
+            data = data.all()
+        if isinstance(data, QuerySet):
+            data = data.select_related(*PRODUCT_RELATED)
+        else:
+            data = list(data)
+            prefetch_related_objects(data, *PRODUCT_RELATED)
+        return super().to_representation(data)
+
+
 class ProductSerializer(serializers.ModelSerializer[Product]):
     """Serialized product with optional details and request id."""
 
@@ -62,6 +83,7 @@ class ProductSerializer(serializers.ModelSerializer[Product]):
         """Product read serializer with relations."""
 
         model = Product
+        list_serializer_class = ProductListSerializer
         fields = [
             "id",
             "search_request_id",
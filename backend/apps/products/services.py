@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import threading
 from datetime import timedelta
+from decimal import Decimal
 from typing import Any, Iterable, Protocol
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 
@@ -15,6 +18,39 @@ from backend.apps.products.models import (
     ProductDetailsRequest,
 )
 
+# Wakes long-polling clients in this process when a details request changes;
+# other processes' changes show up in a per-user marker kept in the cache.
+_details_changed = threading.Condition()
+_DETAILS_MARKER_PREFIX = "products:details-changed:"
+# Long enough to outlive any waiting poll; a missing marker is only a reread.
+_DETAILS_MARKER_TTL = 24 * 60 * 60
+
+
+def notify_details_changed(user_ids: Iterable[int] = ()) -> None:
+    """Bump the change markers of ``user_ids`` and wake waiters in this process."""
+    token = uuid4().hex
+    cache.set_many(
+        {_DETAILS_MARKER_PREFIX + str(user_id): token for user_id in user_ids},
+        _DETAILS_MARKER_TTL,
+    )
+    with _details_changed:
+        _details_changed.notify_all()
+
+
+def details_change_marker(user_id: int) -> str | None:
+    """Token that changes whenever a details request of the user changes."""
+    marker = cache.get(_DETAILS_MARKER_PREFIX + str(user_id))
+    return marker if isinstance(marker, str) else None
+
+
+def wait_for_details_change(timeout: float) -> bool:
+    """Block until a details request changes in this process or ``timeout``.
+
+    Return ``False`` if the wait timed out.
+    """
+    with _details_changed:
+        return _details_changed.wait(timeout)
+
 
 class SearchItemLike(Protocol):
     artid: str
@@ -22,7 +58,7 @@ class SearchItemLike(Protocol):
     pin: str
     name: str
     oem: str | None
-    price: float | None
+    price: Decimal | None
     currency: str | None
     available_quantity: int | None
     warehouse_partner: str | None
@@ -30,18 +66,18 @@ class SearchItemLike(Protocol):
     return_days: int | None
     multiplicity: int | None
     minimum_order: int | None
-    supply_probability: float | None
+    supply_probability: Decimal | None
     delivery_date: str | None
     warranty_date: str | None
     import_flag: str | None
     special_flag: str | None
-    max_retail_price: float | None
-    markup: float | None
+    max_retail_price: Decimal | None
+    markup: Decimal | None
     note: str | None
-    importer_markup: float | None
-    producer_price: float | None
-    markup_rest_rub: float | None
-    markup_rest_percent: float | None
+    importer_markup: Decimal | None
+    producer_price: Decimal | None
+    markup_rest_rub: Decimal | None
+    markup_rest_percent: Decimal | None
     is_analog: bool | None
 
 
@@ -56,6 +92,12 @@ def is_product_fresh(product: Product) -> bool:
     return timezone.now() - product.fetched_at <= _cache_ttl()
 
 
+# Items upserted per round trip; keeps ``artid IN (...)`` below SQLite's limits.
+_UPSERT_BATCH_SIZE = 500
+# Compared by id so merging never loads the related rows.
+_FOREIGN_KEYS = ("user", "search_request")
+
+
 def upsert_product_from_search(
     item: SearchItemLike,
     *,
@@ -63,7 +105,44 @@ def upsert_product_from_search(
     user: Any,
     search_request: Any,
 ) -> Product:
-    defaults = {
+    return upsert_products_from_search(
+        [item], source=source, user=user, search_request=search_request
+    )[0]
+
+
+def upsert_products_from_search(
+    items: Iterable[SearchItemLike],
+    *,
+    source: str = "armtek",
+    user: Any,
+    search_request: Any,
+) -> list[Product]:
+    """Insert or refresh products of a search request with a few set-based queries.
+
+    Existing rows are loaded in one query, new ones are inserted with
+    ``bulk_create`` and only changed rows are written back with ``bulk_update``.
+    A non-empty stored field is never overwritten with a blank value.
+    """
+    rows = [
+        (
+            item.artid,
+            _search_defaults(
+                item, source=source, user=user, search_request=search_request
+            ),
+        )
+        for item in items
+    ]
+    products: list[Product] = []
+    for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+        batch = rows[start : start + _UPSERT_BATCH_SIZE]
+        products.extend(_upsert_batch(batch, search_request=search_request))
+    return products
+
+
+def _search_defaults(
+    item: SearchItemLike, *, source: str, user: Any, search_request: Any
+) -> dict[str, Any]:
+    return {
         "user": user,
         "search_request": search_request,
         "brand": item.brand,
@@ -94,47 +173,106 @@ def upsert_product_from_search(
         "source": source,
         "fetched_at": timezone.now(),
     }
-    product, created = Product.objects.get_or_create(
-        artid=item.artid,
-        search_request=search_request,
-        defaults=defaults,
-    )
-    if not created:
-        changed = False
-        for field, value in defaults.items():
-            if value is None:
-                continue
-            if value == "" and getattr(product, field):
-                continue
-            if getattr(product, field) != value:
-                setattr(product, field, value)
-                changed = True
-        if not is_product_fresh(product):
-            product.fetched_at = timezone.now()
-            changed = True
-        if changed:
-            product.save()
-    ensure_details_request(product)
-    return product
 
 
-def upsert_products_from_search(
-    items: Iterable[SearchItemLike],
-    *,
-    source: str = "armtek",
-    user: Any,
-    search_request: Any,
+def _merge_search_defaults(product: Product, defaults: dict[str, Any]) -> set[str]:
+    """Apply fetched values to a stored product and return the changed fields."""
+    changed: set[str] = set()
+    for field, value in defaults.items():
+        if value is None:
+            continue
+        if field in _FOREIGN_KEYS:
+            current = getattr(product, f"{field}_id")
+            value_key = value.pk
+        else:
+            current = getattr(product, field)
+            value_key = value
+        if value == "" and current:
+            continue
+        if current != value_key:
+            setattr(product, field, value)
+            changed.add(field)
+    return changed
+
+
+@transaction.atomic
+def _upsert_batch(
+    rows: list[tuple[str, dict[str, Any]]], *, search_request: Any
 ) -> list[Product]:
+    by_artid: dict[str, Product] = {
+        product.artid: product
+        for product in Product.objects.filter(
+            search_request=search_request,
+            artid__in={artid for artid, _ in rows},
+        )
+    }
+    created: dict[str, Product] = {}
+    dirty: dict[str, Product] = {}
+    dirty_fields: set[str] = set()
     products: list[Product] = []
-    for item in items:
-        products.append(
-            upsert_product_from_search(
-                item, source=source, user=user, search_request=search_request
-            )
+    for artid, defaults in rows:
+        product = by_artid.get(artid)
+        if product is None:
+            product = Product(artid=artid, **defaults)
+            by_artid[artid] = created[artid] = product
+        elif artid in created:
+            _merge_search_defaults(product, defaults)
+        else:
+            changed = _merge_search_defaults(product, defaults)
+            if changed:
+                dirty[artid] = product
+                dirty_fields |= changed
+        products.append(product)
+
+    if created:
+        # A concurrent search may have inserted the same row meanwhile; keep it
+        # and only refresh its fetch time, which also gives us its primary key.
+        Product.objects.bulk_create(
+            created.values(),
+            update_conflicts=True,
+            unique_fields=["search_request", "artid"],
+            update_fields=["fetched_at"],
+        )
+    if dirty:
+        now = timezone.now()
+        for product in dirty.values():
+            product.updated_at = now
+        Product.objects.bulk_update(
+            dirty.values(), fields=sorted(dirty_fields | {"updated_at"})
         )
+    _ensure_details_requests(list(by_artid.values()))
     return products
 
 
+def _ensure_details_requests(products: list[Product]) -> None:
+    """Bulk variant of ``ensure_details_request``."""
+    product_ids = [product.pk for product in products]
+    existing = dict(
+        ProductDetailsRequest.objects.filter(product_id__in=product_ids).values_list(
+            "product_id", "last_error"
+        )
+    )
+    ProductDetailsRequest.objects.bulk_create(
+        [
+            ProductDetailsRequest(
+                product_id=product_id,
+                request_id=uuid4(),
+                status=DetailsRequestStatus.PENDING,
+                last_error="",
+            )
+            for product_id in product_ids
+            if product_id not in existing
+        ],
+        ignore_conflicts=True,
+    )
+    with_errors = [product_id for product_id, error in existing.items() if error]
+    if with_errors:
+        # When reusing an existing request for a new run, drop stale error text
+        ProductDetailsRequest.objects.filter(product_id__in=with_errors).update(
+            last_error="", updated_at=timezone.now()
+        )
+
+
 def update_product_details(product: Product, *, data: dict[str, Any]) -> ProductDetails:
     details, _ = ProductDetails.objects.get_or_create(product=product)
     for field in ["image_url", "weight", "length", "width", "height", "analog_code"]:
@@ -142,7 +280,10 @@ def update_product_details(product: Product, *, data: dict[str, Any]) -> Product
             setattr(details, field, data[field])
     details.fetched_at = timezone.now()
     details.save()
-    _set_details_request_status(product, DetailsRequestStatus.READY, error=None)
+    # New details are a change even when the request was already ready.
+    _set_details_request_status(
+        product, DetailsRequestStatus.READY, error=None, touch=True
+    )
     return details
 
 
@@ -166,19 +307,29 @@ def ensure_details_request(product: Product) -> ProductDetailsRequest:
 
 @transaction.atomic
 def mark_requests_pending(products: list[Product]) -> list[ProductDetailsRequest]:
-    requests: list[ProductDetailsRequest] = []
-    for product in products:
-        req = ensure_details_request(product)
-        if req.status != DetailsRequestStatus.PENDING or req.last_error:
-            req.status = DetailsRequestStatus.PENDING
-            req.last_error = ""
-            req.save(update_fields=["status", "last_error", "updated_at"])
-        requests.append(req)
-    return requests
+    """Reset details requests of ``products`` to pending with a few bulk queries."""
+    by_product = {product.pk: product for product in products}
+    _ensure_details_requests(list(by_product.values()))
+    requests = ProductDetailsRequest.objects.filter(product_id__in=by_product)
+    requests.exclude(status=DetailsRequestStatus.PENDING).update(
+        status=DetailsRequestStatus.PENDING, last_error="", updated_at=timezone.now()
+    )
+    user_ids = {product.user_id for product in products if product.user_id}
+    transaction.on_commit(lambda: notify_details_changed(user_ids))
+    loaded = {}
+    for req in requests:
+        # Also caches ``product.details_request`` for the caller.
+        req.product = by_product[req.product_id]
+        loaded[req.product_id] = req
+    return [loaded[product.pk] for product in products]
 
 
 def _set_details_request_status(
-    product: Product, status: DetailsRequestStatus, *, error: str | None = None
+    product: Product,
+    status: DetailsRequestStatus,
+    *,
+    error: str | None = None,
+    touch: bool = False,
 ) -> None:
     try:
         req = product.details_request
@@ -191,5 +342,7 @@ def _set_details_request_status(
     if error is not None and error != req.last_error:
         req.last_error = error
         changed = True
-    if changed:
+    if changed or touch:
         req.save(update_fields=["status", "last_error", "updated_at"])
+        user_ids = [product.user_id] if product.user_id else []
+        transaction.on_commit(lambda: notify_details_changed(user_ids))
@@ -1,16 +1,19 @@
 from django.urls import path
 
 from backend.apps.products.views import (
+    ProductDetailsChangesView,
     ProductDetailsIngestView,
     ProductDetailsJobsView,
     ProductDetailsRequestView,
     ProductDetailsStatusView,
     ProductDetailView,
+    ProductExportView,
     ProductListView,
 )
 
 urlpatterns = [
     path("", ProductListView.as_view(), name="product-list"),
+    path("export.<str:format>", ProductExportView.as_view(), name="product-export"),
     path("<int:pk>", ProductDetailView.as_view(), name="product-detail"),
     path(
         "<int:pk>/details", ProductDetailsIngestView.as_view(), name="product-details"
@@ -25,5 +28,10 @@ urlpatterns = [
         ProductDetailsStatusView.as_view(),
         name="product-details-status",
     ),
+    path(
+        "details/changes",
+        ProductDetailsChangesView.as_view(),
+        name="product-details-changes",
+    ),
     path("details/jobs", ProductDetailsJobsView.as_view(), name="product-details-jobs"),
 ]
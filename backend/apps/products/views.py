@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import re
+import time
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation
-from typing import Any, List, cast
+from typing import Any, Dict, List, Tuple, cast
 from urllib.parse import quote
 
 from django.conf import settings
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -14,27 +17,43 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from backend.apps.products.models import DetailsRequestStatus, Product
+from backend.apps.pagination import ChangesCursorPagination, CreatedCursorPagination
+from backend.apps.products.export import export_response
+from backend.apps.products.models import (
+    DetailsRequestStatus,
+    Product,
+    ProductDetailsRequest,
+)
+from backend.apps.products.renderers import CSVRenderer, TableRenderer, XLSXRenderer
+from backend.apps.products.rows import (
+    product_rows,
+    product_values,
+    serialize_products,
+)
 from backend.apps.products.serializers import (
+    PRODUCT_RELATED,
     ProductDetailsInputSerializer,
     ProductDetailsSerializer,
     ProductSerializer,
 )
 from backend.apps.products.services import (
     _set_details_request_status,
+    details_change_marker,
     mark_requests_pending,
     update_product_details,
+    wait_for_details_change,
 )
 
 
 class ProductListView(ListAPIView[Product]):
     permission_classes = [IsAuthenticated]
     serializer_class = ProductSerializer
+    pagination_class = CreatedCursorPagination
 
     def get_queryset(self) -> QuerySet[Product]:
         assert self.request.user.is_authenticated
         user = cast(Any, self.request.user)
-        qs = Product.objects.filter(user=user).order_by("-created_at")
+        qs = Product.objects.filter(user=user).order_by("-created_at", "-id")
         search_request_id_raw = self.request.query_params.get("search_request_id")
         if search_request_id_raw:
             try:
@@ -45,6 +64,27 @@ class ProductListView(ListAPIView[Product]):
                 qs = qs.filter(search_request_id=search_request_id)
         return qs
 
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        # Pages are read as ``values()`` rows rather than model instances.
+        values = product_values(self.filter_queryset(self.get_queryset()), "created_at")
+        page = self.paginate_queryset(values)
+        if page is not None:
+            return self.get_paginated_response(product_rows(page))
+        return Response(product_rows(values))
+
+
+class ProductExportView(ProductListView):
+    """The product list, filtered the same way, as a CSV or XLSX download."""
+
+    renderer_classes = [CSVRenderer, XLSXRenderer]
+
+    def list(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> StreamingHttpResponse:
+        renderer = cast(TableRenderer, request.accepted_renderer)
+        products = self.filter_queryset(self.get_queryset())
+        return export_response(renderer, products, "products")
+
 
 class ProductDetailView(RetrieveAPIView[Product]):
     permission_classes = [IsAuthenticated]
@@ -53,7 +93,7 @@ class ProductDetailView(RetrieveAPIView[Product]):
     def get_queryset(self) -> QuerySet[Product]:
         assert self.request.user.is_authenticated
         user = cast(Any, self.request.user)
-        return Product.objects.filter(user=user)
+        return Product.objects.filter(user=user).select_related(*PRODUCT_RELATED)
 
 
 class ProductDetailsIngestView(APIView):
@@ -120,7 +160,7 @@ class ProductDetailsIngestView(APIView):
             "request_id"
         )
         try:
-            product = Product.objects.get(pk=pk)
+            product = Product.objects.select_related("details_request").get(pk=pk)
         except Product.DoesNotExist:
             return Response(
                 {"detail": "Product not found"}, status=status.HTTP_404_NOT_FOUND
@@ -210,15 +250,118 @@ class ProductDetailsStatusView(APIView):
                 {"detail": "Provide request_ids array"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        requests = list(
-            Product.objects.filter(details_request__request_id__in=tokens)
-            .select_related("details", "details_request")
-            .all()
+        products = Product.objects.filter(details_request__request_id__in=tokens)
+        return Response(serialize_products(products))
+
+
+class ProductDetailsChangesView(APIView):
+    """Long-poll feed of the user's products whose details request changed.
+
+    ``GET`` without ``cursor`` returns the current position; with it the view
+    answers as soon as some details request changed after that position (or
+    after ``timeout`` seconds with no products) and hands out the next cursor.
+    Only the changed products are serialized.
+
+    Changes younger than ``DETAILS_CHANGES_SETTLE_SECONDS`` may still be joined
+    by earlier-stamped ones that commit late, so they are served once more when
+    that window has passed; products can repeat and are newest-wins by id.
+
+    A waiting request does not poll the table: it is woken by changes in this
+    process and, every ``DETAILS_CHANGES_POLL_SECONDS``, reads the user's change
+    marker from the cache, querying only when the marker moved. The table itself
+    is re-read every ``DETAILS_CHANGES_RECHECK_SECONDS`` in case the cache is not
+    shared between processes; that interval bounds the delay of a change made
+    elsewhere in that setup, in exchange for one query per tab per interval.
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_changes = 500
+
+    def get(self, request: Request, *args: object, **kwargs: object) -> Response:
+        assert request.user.is_authenticated
+        user = cast(Any, request.user)
+        feed = ChangesCursorPagination()
+        requests = ProductDetailsRequest.objects.filter(product__user=user)
+        search_request_id = request.query_params.get("search_request_id")
+        if search_request_id and search_request_id.isdigit():
+            requests = requests.filter(
+                product__search_request_id=int(search_request_id)
+            )
+        window = timedelta(seconds=settings.DETAILS_CHANGES_SETTLE_SECONDS)
+        position = feed.decode_cursor(request)
+        if position is None:
+            latest = requests.order_by("-updated_at", "-id").first()
+            served = (
+                feed.position_of(latest)
+                if latest
+                else (datetime.min.replace(tzinfo=timezone.utc), 0)
+            )
+            settled = min(served, (datetime.now(timezone.utc) - window, 0))
+            return Response(
+                {"cursor": feed.encode_cursor((settled, served)), "products": []}
+            )
+
+        settled, served = position
+        deadline = time.monotonic() + self._timeout(request)
+        changes = feed.after(requests.order_by(*feed.ordering), settled)
+
+        def read() -> Tuple[List[Dict[str, Any]], datetime]:
+            # Rows stamped before the cutoff have committed before this query.
+            cutoff = datetime.now(timezone.utc) - window
+            rows = changes.values("id", "updated_at", "product_id")
+            return list(rows[: self.max_changes]), cutoff
+
+        marker = details_change_marker(user.pk)
+        read_at = time.monotonic()
+        changed, cutoff = read()
+        while True:
+            fresh = bool(changed) and feed.position_of(changed[-1]) > served
+            # Served rows left the window: read them again for late commits.
+            due = settled < served and served[0] <= datetime.now(timezone.utc) - window
+            remaining = deadline - time.monotonic()
+            if fresh or due or remaining <= 0:
+                break
+            woken = wait_for_details_change(
+                min(remaining, settings.DETAILS_CHANGES_POLL_SECONDS)
+            )
+            current = details_change_marker(user.pk)
+            recheck = time.monotonic() - read_at >= (
+                settings.DETAILS_CHANGES_RECHECK_SECONDS
+            )
+            if woken or current != marker or recheck:
+                marker, read_at = current, time.monotonic()
+                changed, cutoff = read()
+        if not (fresh or due):
+            return Response({"cursor": feed.encode_cursor(position), "products": []})
+        if due and not fresh:
+            changed, cutoff = read()
+        if changed:
+            served = max(served, feed.position_of(changed[-1]))
+        for row in changed:
+            if row["updated_at"] > cutoff:
+                break
+            settled = feed.position_of(row)
+        else:
+            if len(changed) < self.max_changes and served[0] <= cutoff:
+                settled = served
+        products = Product.objects.filter(
+            pk__in=[row["product_id"] for row in changed]
+        ).order_by("id")
+        return Response(
+            {
+                "cursor": feed.encode_cursor((settled, served)),
+                "products": serialize_products(products) if changed else [],
+            }
         )
-        serialized = []
-        for product in requests:
-            serialized.append(ProductSerializer(product).data)
-        return Response(serialized)
+
+    @staticmethod
+    def _timeout(request: Request) -> float:
+        limit = float(settings.DETAILS_CHANGES_WAIT_SECONDS)
+        try:
+            timeout = float(request.query_params.get("timeout", limit))
+        except ValueError:
+            timeout = limit
+        return max(0.0, min(timeout, limit))
 
 
 class ProductDetailsJobsView(APIView):
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
+
+import httpx
+
+from backend.apps.providers.armtek.client import (
+    build_search_payload,
+    decode_response,
+    log_retry,
+    parse_search_items,
+)
+from backend.apps.providers.armtek.exceptions import (
+    ArmtekCredentialsError,
+    ArmtekError,
+    ArmtekHttpError,
+    ArmtekTransportError,
+)
+from backend.apps.providers.armtek.resilience import CircuitBreaker, RetryPolicy
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from backend.apps.providers.armtek.throttle import ArmtekThrottle
+
+
+class AsyncArmtekClient:
+    """``httpx.AsyncClient`` counterpart of ``ArmtekClient`` with the same parsing."""
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        login: Optional[str],
+        password: Optional[str],
+        timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        client: httpx.AsyncClient | None = None,
+        throttle: ArmtekThrottle | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.login = login
+        self.password = password
+        self.timeout = timeout
+        self._throttle = throttle
+        self._retry = retry
+        self._breaker = breaker
+        self._auth = (login, password) if login and password else None
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def search(
+        self,
+        *,
+        vkorg: str,
+        kunnr_rg: str,
+        pin: str,
+        brand: str | None = None,
+        query_type: int | None = None,
+        program: str | None = None,
+        kunnr_za: str | None = None,
+        incoterms: int | None = None,
+        vbeln: str | None = None,
+        first_non_analog: bool = False,
+        keep_raw: bool = False,
+    ) -> list[ArmtekSearchItem]:
+        if not self.login or not self.password:
+            raise ArmtekCredentialsError("Armtek credentials are not configured")
+
+        payload = build_search_payload(
+            login=self.login,
+            password=self.password,
+            vkorg=vkorg,
+            kunnr_rg=kunnr_rg,
+            pin=pin,
+            brand=brand,
+            query_type=query_type,
+            program=program,
+            kunnr_za=kunnr_za,
+            incoterms=incoterms,
+            vbeln=vbeln,
+        )
+        raw = await self._post("/api/ws_search/search", data=payload, idempotent=True)
+        return parse_search_items(
+            raw,
+            pin=pin,
+            brand=brand,
+            first_non_analog=first_non_analog,
+            keep_raw=keep_raw,
+        )
+
+    async def _post(
+        self, path: str, *, data: Dict[str, Any], idempotent: bool = False
+    ) -> Mapping[str, Any]:
+        attempt = 1
+        while True:
+            try:
+                response = await self._attempt(path, data=data)
+            except ArmtekError as exc:
+                retry = self._retry if idempotent else None
+                if retry is None or not retry.should_retry(exc, attempt=attempt):
+                    raise
+                delay = retry.delay(attempt)
+                log_retry(path, exc, attempt=attempt, delay=delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                return decode_response(response)
+
+    async def _attempt(self, path: str, *, data: Dict[str, Any]) -> httpx.Response:
+        # Every attempt takes its own throttle slot, so backoff sleeps hold none.
+        with self._breaker.guard() if self._breaker else nullcontext():
+            if self._throttle is None:
+                return await self._send(path, data=data)
+            async with self._throttle.async_slot():
+                return await self._send(path, data=data)
+
+    async def _send(self, path: str, *, data: Dict[str, Any]) -> httpx.Response:
+        try:
+            response = await self._client.post(
+                path,
+                data=data,
+                auth=self._auth or httpx.USE_CLIENT_DEFAULT,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            raise ArmtekHttpError(
+                f"Armtek responded with HTTP {exc.response.status_code}",
+                status_code=exc.response.status_code,
+            ) from exc
+        except httpx.RequestError as exc:
+            raise ArmtekTransportError(
+                f"Network error contacting Armtek: {exc}",
+                timeout=isinstance(exc, httpx.TimeoutException),
+            ) from exc
+        return response
+
+    async def __aenter__(self) -> "AsyncArmtekClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: object | None,
+    ) -> None:
+        await self.aclose()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+
+# Bumped whenever the cached entry or the ArmtekSearchItem layout changes.
+KEY_PREFIX = "armtek:search:v3:"
+
+# Entries are stored as (stored_at, items) and kept past the TTL so a stale copy
+# can still be served while the Armtek circuit breaker is open.
+_Entry = Tuple[float, list[ArmtekSearchItem]]
+
+
+def search_cache_key(
+    *,
+    vkorg: str,
+    kunnr_rg: str,
+    program: Optional[str],
+    pin: str,
+    brand: Optional[str],
+) -> str:
+    """Build a cache key shared by every user of the same Armtek account context."""
+    parts = [vkorg, kunnr_rg, program or "", pin.strip().upper()]
+    parts.append((brand or "").strip().upper())
+    digest = hashlib.sha1("|".join(parts).encode(), usedforsecurity=False)
+    return KEY_PREFIX + digest.hexdigest()
+
+
+def get_cached_search(key: str) -> Optional[list[ArmtekSearchItem]]:
+    items = _fresh(_cache().get(key))
+    metrics.increment("search_cache.hit" if items is not None else "search_cache.miss")
+    return items
+
+
+def peek_cached_search(key: str) -> Optional[list[ArmtekSearchItem]]:
+    """Read an entry without touching the hit/miss counters."""
+    return _fresh(_cache().get(key))
+
+
+def get_stale_search(key: str) -> Optional[list[ArmtekSearchItem]]:
+    """Read an entry even if its TTL has passed (fallback while Armtek is down)."""
+    entry: Optional[_Entry] = _cache().get(key)
+    return entry[1] if entry is not None else None
+
+
+def store_search(key: str, items: list[ArmtekSearchItem]) -> None:
+    entry: _Entry = (time.time(), items)
+    _cache().set(key, entry, timeout=_ttl_seconds() + _stale_seconds())
+
+
+def _fresh(entry: Optional[_Entry]) -> Optional[list[ArmtekSearchItem]]:
+    if entry is None:
+        return None
+    stored_at, items = entry
+    if time.time() - stored_at >= _ttl_seconds():
+        return None
+    return items
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "SEARCH_CACHE_TTL_MINUTES", 60)) * 60
+
+
+def _stale_seconds() -> int:
+    return int(getattr(settings, "ARMTEK_STALE_CACHE_MINUTES", 0)) * 60
+
+
+def _cache() -> BaseCache:
+    return caches[getattr(settings, "ARMTEK_SEARCH_CACHE_ALIAS", "default")]
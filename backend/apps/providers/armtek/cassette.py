@@ -0,0 +1,263 @@
+"""Record and replay Armtek HTTP exchanges as JSON cassettes.
+
+``CassetteTransport`` plugs into ``httpx`` as a sync and async transport. In
+``record`` mode it forwards requests to Armtek and appends every exchange to
+the cassette with credentials scrubbed; in ``replay`` mode it answers from the
+cassette without touching the network, optionally sleeping for the recorded
+(or scaled) latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import httpx
+from django.conf import settings
+
+CASSETTE_VERSION = 1
+SCRUBBED = "***"
+# Request fields and response keys never written to a cassette nor matched on.
+DEFAULT_SCRUB_KEYS = frozenset({"LOGIN", "PASSWORD"})
+_KEPT_HEADERS = ("content-type",)
+# No longer true once the body has been read and decoded by httpx.
+_DECODED_BODY_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a request the cassette has no answer for."""
+
+
+class CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        mode: str = "replay",
+        latency_scale: float = 0.0,
+        scrub_keys: FrozenSet[str] = DEFAULT_SCRUB_KEYS,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.scrub_keys = scrub_keys
+        self._transport = transport
+        self._async_transport = async_transport
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        if self.path.exists():
+            for interaction in load_cassette(self.path):
+                self._add(interaction)
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette {self.path} does not exist")
+
+    @property
+    def interactions(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._interactions)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "replay":
+            interaction = self._next_recorded(request)
+            time.sleep(self._delay(interaction))
+            return self._build_response(request, interaction)
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        started = time.perf_counter()
+        response = self._transport.handle_request(request)
+        content = response.read()
+        self._record(request, response, content, time.perf_counter() - started)
+        return self._rebuild(request, response, content)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "replay":
+            interaction = self._next_recorded(request)
+            await asyncio.sleep(self._delay(interaction))
+            return self._build_response(request, interaction)
+        if self._async_transport is None:
+            self._async_transport = httpx.AsyncHTTPTransport()
+        started = time.perf_counter()
+        response = await self._async_transport.handle_async_request(request)
+        content = await response.aread()
+        self._record(request, response, content, time.perf_counter() - started)
+        return self._rebuild(request, response, content)
+
+    def close(self) -> None:
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+
+    async def aclose(self) -> None:
+        transport, self._async_transport = self._async_transport, None
+        if transport is not None:
+            await transport.aclose()
+
+    def _add(self, interaction: Dict[str, Any]) -> None:
+        self._interactions.append(interaction)
+        key = request_key(interaction["request"])
+        self._by_key.setdefault(key, []).append(interaction)
+
+    def _next_recorded(self, request: httpx.Request) -> Dict[str, Any]:
+        key = request_key(self._describe(request))
+        with self._lock:
+            matches = self._by_key.get(key)
+            if not matches:
+                raise CassetteMissError(
+                    f"No recorded Armtek response for {request.method} "
+                    f"{request.url.path} in {self.path}"
+                )
+            # Repeated requests walk through their recordings and wrap around.
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return matches[cursor % len(matches)]
+
+    def _delay(self, interaction: Dict[str, Any]) -> float:
+        if self.latency_scale <= 0:
+            return 0.0
+        return float(interaction.get("elapsed_ms", 0)) / 1000 * self.latency_scale
+
+    def _record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        content: bytes,
+        elapsed: float,
+    ) -> None:
+        body: Dict[str, Any] = {}
+        try:
+            body["json"] = scrub(json.loads(content), self.scrub_keys)
+        except ValueError:
+            body["text"] = content.decode(response.encoding or "utf-8", "replace")
+        interaction = {
+            "request": self._describe(request),
+            "response": {
+                "status": response.status_code,
+                "headers": {
+                    name: response.headers[name]
+                    for name in _KEPT_HEADERS
+                    if name in response.headers
+                },
+                **body,
+            },
+            "elapsed_ms": round(elapsed * 1000, 3),
+        }
+        with self._lock:
+            self._add(interaction)
+            save_cassette(self.path, self._interactions)
+
+    def _describe(self, request: httpx.Request) -> Dict[str, Any]:
+        form: Dict[str, Any] = {}
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith("application/x-www-form-urlencoded"):
+            form = dict(parse_qsl(request.read().decode(), keep_blank_values=True))
+        return {
+            "method": request.method,
+            "path": request.url.path,
+            "params": dict(sorted(request.url.params.items())),
+            "form": scrub(dict(sorted(form.items())), self.scrub_keys),
+        }
+
+    @staticmethod
+    def _build_response(
+        request: httpx.Request, interaction: Dict[str, Any]
+    ) -> httpx.Response:
+        recorded = interaction["response"]
+        if "json" in recorded:
+            # ASCII-only JSON reads the same whatever charset was recorded.
+            content = json.dumps(recorded["json"]).encode()
+        else:
+            content = str(recorded.get("text", "")).encode()
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded.get("headers", {}),
+            content=content,
+            request=request,
+        )
+
+    @staticmethod
+    def _rebuild(
+        request: httpx.Request, response: httpx.Response, content: bytes
+    ) -> httpx.Response:
+        # The original stream is consumed; hand the caller an already read copy.
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _DECODED_BODY_HEADERS
+        ]
+        return httpx.Response(
+            response.status_code, headers=headers, content=content, request=request
+        )
+
+
+def scrub(value: Any, keys: FrozenSet[str]) -> Any:
+    """Replace the values of ``keys`` in nested mappings and lists."""
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED if key.upper() in keys else scrub(item, keys)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(item, keys) for item in value]
+    return value
+
+
+def request_key(description: Dict[str, Any]) -> str:
+    return json.dumps(
+        [
+            description["method"],
+            description["path"],
+            description.get("params", {}),
+            description.get("form", {}),
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+
+
+def load_cassette(path: Path) -> List[Dict[str, Any]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"Unsupported cassette version in {path}")
+    return list(data["interactions"])
+
+
+def save_cassette(path: Path, interactions: List[Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": CASSETTE_VERSION, "interactions": interactions}
+    # Written to a temporary file first so a crash never leaves half a cassette.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=1)
+    os.replace(tmp_name, path)
+
+
+_configured: Optional[Tuple[str, str, float, CassetteTransport]] = None
+_configured_lock = threading.Lock()
+
+
+def get_cassette_transport() -> Optional[CassetteTransport]:
+    """Return the process-wide transport for ``ARMTEK_CASSETTE``, if one is set."""
+    global _configured
+    path = str(getattr(settings, "ARMTEK_CASSETTE", "") or "")
+    if not path:
+        return None
+    mode = str(getattr(settings, "ARMTEK_CASSETTE_MODE", "replay"))
+    scale = float(getattr(settings, "ARMTEK_CASSETTE_LATENCY_SCALE", 0.0))
+    with _configured_lock:
+        if _configured is None or _configured[:3] != (path, mode, scale):
+            transport = CassetteTransport(path, mode=mode, latency_scale=scale)
+            _configured = (path, mode, scale, transport)
+        return _configured[3]
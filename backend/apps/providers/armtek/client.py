@@ -1,16 +1,33 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Mapping, Optional
+import logging
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Mapping, Optional
 
 import httpx
 
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.decoding import (
+    analog_flag,
+    decode_search_entry,
+    loads,
+)
 from backend.apps.providers.armtek.exceptions import (
     ArmtekCredentialsError,
     ArmtekError,
+    ArmtekHttpError,
     ArmtekResponseError,
+    ArmtekTransportError,
 )
 from backend.apps.providers.armtek.types import ArmtekSearchItem
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from backend.apps.providers.armtek.resilience import CircuitBreaker, RetryPolicy
+    from backend.apps.providers.armtek.throttle import ArmtekThrottle
+
+logger = logging.getLogger(__name__)
+
 
 class ArmtekClient:
     def __init__(
@@ -21,20 +38,31 @@ class ArmtekClient:
         password: Optional[str],
         timeout: float = 10.0,
         transport: httpx.BaseTransport | None = None,
+        client: httpx.Client | None = None,
+        throttle: ArmtekThrottle | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.login = login
         self.password = password
-        self._client = httpx.Client(
+        self.timeout = timeout
+        self._throttle = throttle
+        self._retry = retry
+        self._breaker = breaker
+        # Armtek expects HTTP Basic auth in addition to credentials in the body.
+        # It is sent per request so a pooled client can be shared between accounts.
+        self._auth = (login, password) if login and password else None
+        self._owns_client = client is None
+        self._client = client or httpx.Client(
             base_url=self.base_url,
             timeout=timeout,
             transport=transport,
-            # Armtek expects HTTP Basic auth in addition to credentials in the body.
-            auth=(login, password) if login and password else None,
         )
 
     def close(self) -> None:
-        self._client.close()
+        if self._owns_client:
+            self._client.close()
 
     def search(
         self,
@@ -48,96 +76,78 @@ class ArmtekClient:
         kunnr_za: str | None = None,
         incoterms: int | None = None,
         vbeln: str | None = None,
+        first_non_analog: bool = False,
+        keep_raw: bool = False,
     ) -> list[ArmtekSearchItem]:
         if not self.login or not self.password:
             raise ArmtekCredentialsError("Armtek credentials are not configured")
 
-        payload: Dict[str, Any] = {
-            "LOGIN": self.login,
-            "PASSWORD": self.password,
-            "VKORG": vkorg,
-            "KUNNR_RG": kunnr_rg,
-            "PIN": pin,
-        }
-        if brand:
-            payload["BRAND"] = brand
-        if query_type is None and brand is None:
-            payload["QUERY_TYPE"] = 1
-        elif query_type is not None:
-            payload["QUERY_TYPE"] = query_type
-        if program:
-            payload["PROGRAM"] = program
-        if kunnr_za:
-            payload["KUNNR_ZA"] = kunnr_za
-        if incoterms is not None:
-            payload["INCOTERMS"] = incoterms
-        if vbeln:
-            payload["VBELN"] = vbeln
-
-        raw = self._post("/api/ws_search/search", data=payload)
-        resp = unwrap_resp(raw)
-        array = resp.get("ARRAY", [])
-        items: list[ArmtekSearchItem] = []
-        if not isinstance(array, Iterable):
-            raise ArmtekResponseError("RESP.ARRAY must be iterable")
-        for entry in array:
-            if not isinstance(entry, Mapping):
-                raise ArmtekResponseError("RESP.ARRAY entries must be mappings")
-            items.append(
-                ArmtekSearchItem(
-                    pin=str(entry.get("PIN", pin)),
-                    brand=str(entry.get("BRAND", brand or "")),
-                    name=str(entry.get("NAME", "")),
-                    artid=str(entry.get("ARTID", "")),
-                    is_analog=(
-                        bool(_coerce_int(entry.get("ANALOG")))
-                        if entry.get("ANALOG") is not None
-                        else None
-                    ),
-                    price=_coerce_float(entry.get("PRICE")),
-                    currency=_clean_str(entry.get("WAERS")),
-                    warehouse_partner=_clean_str(entry.get("PARNR")),
-                    warehouse_code=_clean_str(entry.get("KEYZAK")),
-                    available_quantity=_coerce_int(entry.get("RVALUE")),
-                    return_days=_coerce_int(entry.get("RETDAYS")),
-                    multiplicity=_coerce_int(entry.get("RDPRF")),
-                    minimum_order=_coerce_int(entry.get("MINBM")),
-                    supply_probability=_coerce_float(
-                        entry.get("VENSEL") or entry.get("VENSL")
-                    ),
-                    delivery_date=_clean_str(entry.get("DLVDT")),
-                    warranty_date=_clean_str(entry.get("WRNTDT")),
-                    import_flag=_clean_str(entry.get("TYPEB")),
-                    special_flag=_clean_str(entry.get("DSPEC")),
-                    max_retail_price=_coerce_float(entry.get("RCOST")),
-                    markup=_coerce_float(entry.get("MRKBY")),
-                    note=_clean_str(entry.get("PNOTE")),
-                    importer_markup=_coerce_float(entry.get("IMP_ADD")),
-                    producer_price=_coerce_float(entry.get("SELLP")),
-                    markup_rest_rub=_coerce_float(entry.get("REST_ADD")),
-                    markup_rest_percent=_coerce_float(entry.get("REST_ADD_P")),
-                    raw=entry,
-                )
-            )
-        return items
+        payload = build_search_payload(
+            login=self.login,
+            password=self.password,
+            vkorg=vkorg,
+            kunnr_rg=kunnr_rg,
+            pin=pin,
+            brand=brand,
+            query_type=query_type,
+            program=program,
+            kunnr_za=kunnr_za,
+            incoterms=incoterms,
+            vbeln=vbeln,
+        )
+        raw = self._post("/api/ws_search/search", data=payload, idempotent=True)
+        return parse_search_items(
+            raw,
+            pin=pin,
+            brand=brand,
+            first_non_analog=first_non_analog,
+            keep_raw=keep_raw,
+        )
+
+    def _post(
+        self, path: str, *, data: Dict[str, Any], idempotent: bool = False
+    ) -> Mapping[str, Any]:
+        attempt = 1
+        while True:
+            try:
+                response = self._attempt(path, data=data)
+            except ArmtekError as exc:
+                retry = self._retry if idempotent else None
+                if retry is None or not retry.should_retry(exc, attempt=attempt):
+                    raise
+                delay = retry.delay(attempt)
+                log_retry(path, exc, attempt=attempt, delay=delay)
+                time.sleep(delay)
+                attempt += 1
+            else:
+                return decode_response(response)
+
+    def _attempt(self, path: str, *, data: Dict[str, Any]) -> httpx.Response:
+        # Every attempt takes its own throttle slot, so backoff sleeps hold none.
+        with self._breaker.guard() if self._breaker else nullcontext():
+            with self._throttle.slot() if self._throttle else nullcontext():
+                return self._send(path, data=data)
 
-    def _post(self, path: str, *, data: Dict[str, Any]) -> Mapping[str, Any]:
+    def _send(self, path: str, *, data: Dict[str, Any]) -> httpx.Response:
         try:
-            response = self._client.post(path, data=data)
+            response = self._client.post(
+                path,
+                data=data,
+                auth=self._auth or httpx.USE_CLIENT_DEFAULT,
+                timeout=self.timeout,
+            )
             response.raise_for_status()
-        except httpx.HTTPStatusError as exc:  # pragma: no cover - http guard
-            raise ArmtekError(
-                f"Armtek responded with HTTP {exc.response.status_code}"
+        except httpx.HTTPStatusError as exc:
+            raise ArmtekHttpError(
+                f"Armtek responded with HTTP {exc.response.status_code}",
+                status_code=exc.response.status_code,
             ) from exc
-        except httpx.RequestError as exc:  # pragma: no cover - network guard
-            raise ArmtekError(f"Network error contacting Armtek: {exc}") from exc
-        try:
-            payload = response.json()
-        except ValueError as exc:  # pragma: no cover - parsing guard
-            raise ArmtekResponseError("Armtek returned non-JSON payload") from exc
-        if not isinstance(payload, Mapping):
-            raise ArmtekResponseError("Armtek response must be a mapping")
-        return payload
+        except httpx.RequestError as exc:
+            raise ArmtekTransportError(
+                f"Network error contacting Armtek: {exc}",
+                timeout=isinstance(exc, httpx.TimeoutException),
+            ) from exc
+        return response
 
     def __enter__(self) -> "ArmtekClient":
         return self
@@ -151,6 +161,97 @@ class ArmtekClient:
         self.close()
 
 
+def log_retry(path: str, exc: ArmtekError, *, attempt: int, delay: float) -> None:
+    metrics.increment("retry.attempt")
+    logger.info(
+        "Retrying Armtek %s in %.2fs after attempt %d failed: %s",
+        path,
+        delay,
+        attempt,
+        exc,
+    )
+
+
+def build_search_payload(
+    *,
+    login: str,
+    password: str,
+    vkorg: str,
+    kunnr_rg: str,
+    pin: str,
+    brand: str | None = None,
+    query_type: int | None = None,
+    program: str | None = None,
+    kunnr_za: str | None = None,
+    incoterms: int | None = None,
+    vbeln: str | None = None,
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "LOGIN": login,
+        "PASSWORD": password,
+        "VKORG": vkorg,
+        "KUNNR_RG": kunnr_rg,
+        "PIN": pin,
+    }
+    if brand:
+        payload["BRAND"] = brand
+    if query_type is None and brand is None:
+        payload["QUERY_TYPE"] = 1
+    elif query_type is not None:
+        payload["QUERY_TYPE"] = query_type
+    if program:
+        payload["PROGRAM"] = program
+    if kunnr_za:
+        payload["KUNNR_ZA"] = kunnr_za
+    if incoterms is not None:
+        payload["INCOTERMS"] = incoterms
+    if vbeln:
+        payload["VBELN"] = vbeln
+    return payload
+
+
+def parse_search_items(
+    raw: Mapping[str, Any],
+    *,
+    pin: str,
+    brand: str | None,
+    first_non_analog: bool = False,
+    keep_raw: bool = False,
+) -> list[ArmtekSearchItem]:
+    """Build search items from a ``ws_search/search`` response.
+
+    With ``first_non_analog`` only the first entry not marked as analog is
+    built and the rest of ``RESP.ARRAY`` is skipped. The original entry is
+    kept in ``raw`` only when ``keep_raw`` is set.
+    """
+    resp = unwrap_resp(raw)
+    array = resp.get("ARRAY", [])
+    items: list[ArmtekSearchItem] = []
+    if not isinstance(array, Iterable):
+        raise ArmtekResponseError("RESP.ARRAY must be iterable")
+    for entry in array:
+        if not isinstance(entry, Mapping):
+            raise ArmtekResponseError("RESP.ARRAY entries must be mappings")
+        if first_non_analog and analog_flag(entry.get("ANALOG")) is True:
+            continue
+        items.append(
+            decode_search_entry(entry, pin=pin, brand=brand, keep_raw=keep_raw)
+        )
+        if first_non_analog:
+            break
+    return items
+
+
+def decode_response(response: httpx.Response) -> Mapping[str, Any]:
+    try:
+        payload = loads(response.content)
+    except ValueError as exc:  # pragma: no cover - parsing guard
+        raise ArmtekResponseError("Armtek returned non-JSON payload") from exc
+    if not isinstance(payload, Mapping):
+        raise ArmtekResponseError("Armtek response must be a mapping")
+    return payload
+
+
 def unwrap_resp(raw: Mapping[str, Any]) -> Mapping[str, Any]:
     if not isinstance(raw, Mapping):
         raise ArmtekResponseError("Armtek response must be a mapping")
@@ -165,28 +266,3 @@ def unwrap_resp(raw: Mapping[str, Any]) -> Mapping[str, Any]:
     if not isinstance(resp, Mapping):
         raise ArmtekResponseError("Armtek RESP must be a mapping")
     return resp
-
-
-def _coerce_float(value: Any) -> Optional[float]:
-    if value is None or value == "":
-        return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def _coerce_int(value: Any) -> Optional[int]:
-    if value is None or value == "":
-        return None
-    try:
-        return int(float(value))
-    except (TypeError, ValueError):
-        return None
-
-
-def _clean_str(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    value_str = str(value).strip()
-    return value_str or None
@@ -0,0 +1,137 @@
+"""Table-driven decoding of Armtek ``ws_search/search`` entries."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+
+Converter = Callable[[Any], Any]
+
+
+def _load_json_backend() -> Callable[[bytes], Any]:
+    # orjson is an optional speed-up; both raise ValueError on malformed input.
+    if importlib.util.find_spec("orjson") is not None:
+        import orjson
+
+        return orjson.loads
+    return json.loads
+
+
+loads = _load_json_backend()
+
+
+# Armtek sends numbers as strings drawn from a small set ("0.00", "1", "14"...);
+# the results are immutable, so parsed values are shared between entries.
+@lru_cache(maxsize=4096)
+def _decimal_from_str(value: str) -> Optional[Decimal]:
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+@lru_cache(maxsize=4096)
+def _int_from_str(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return int(float(value))
+    except (ValueError, OverflowError):
+        return None
+
+
+def to_decimal(value: Any) -> Optional[Decimal]:
+    if value.__class__ is str:
+        return _decimal_from_str(value) if value else None
+    if value is None or isinstance(value, bool):
+        return None
+    # str() keeps the shortest repr of floats decoded by the JSON backend.
+    return _decimal_from_str(str(value))
+
+
+def to_int(value: Any) -> Optional[int]:
+    if value.__class__ is str:
+        return _int_from_str(value) if value else None
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def clean_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value_str = (value if value.__class__ is str else str(value)).strip()
+    return value_str or None
+
+
+def analog_flag(value: Any) -> Optional[bool]:
+    return bool(to_int(value)) if value is not None else None
+
+
+# (ArmtekSearchItem field, Armtek key, converter); every converter maps a
+# missing key (None) to None. pin/brand/name/artid are filled separately.
+SEARCH_FIELDS: Tuple[Tuple[str, str, Converter], ...] = (
+    ("is_analog", "ANALOG", analog_flag),
+    ("price", "PRICE", to_decimal),
+    ("currency", "WAERS", clean_str),
+    ("warehouse_partner", "PARNR", clean_str),
+    ("warehouse_code", "KEYZAK", clean_str),
+    ("available_quantity", "RVALUE", to_int),
+    ("return_days", "RETDAYS", to_int),
+    ("multiplicity", "RDPRF", to_int),
+    ("minimum_order", "MINBM", to_int),
+    ("supply_probability", "VENSEL", to_decimal),
+    ("delivery_date", "DLVDT", clean_str),
+    ("warranty_date", "WRNTDT", clean_str),
+    ("import_flag", "TYPEB", clean_str),
+    ("special_flag", "DSPEC", clean_str),
+    ("max_retail_price", "RCOST", to_decimal),
+    ("markup", "MRKBY", to_decimal),
+    ("note", "PNOTE", clean_str),
+    ("importer_markup", "IMP_ADD", to_decimal),
+    ("producer_price", "SELLP", to_decimal),
+    ("markup_rest_rub", "REST_ADD", to_decimal),
+    ("markup_rest_percent", "REST_ADD_P", to_decimal),
+)
+# Alternative spellings, read only when the primary key gave no value.
+SEARCH_FALLBACKS: Tuple[Tuple[str, str, Converter], ...] = (
+    ("supply_probability", "VENSL", to_decimal),
+)
+
+
+_FALLBACKS: Dict[str, Tuple[str, Converter]] = {
+    field: (key, convert) for field, key, convert in SEARCH_FALLBACKS
+}
+
+
+def decode_search_entry(
+    entry: Mapping[str, Any], *, pin: str, brand: str | None, keep_raw: bool
+) -> ArmtekSearchItem:
+    """Convert one ``RESP.ARRAY`` entry using the ``SEARCH_FIELDS`` table."""
+    get = entry.get
+    fields: Dict[str, Any] = {}
+    for field, key, convert in SEARCH_FIELDS:
+        value = convert(get(key))
+        if value is None and field in _FALLBACKS:
+            fallback_key, fallback = _FALLBACKS[field]
+            value = fallback(get(fallback_key))
+        fields[field] = value
+    return ArmtekSearchItem(
+        pin=str(get("PIN", pin)),
+        brand=str(get("BRAND", brand or "")),
+        name=str(get("NAME", "")),
+        artid=str(get("ARTID", "")),
+        raw=entry if keep_raw else None,
+        **fields,
+    )
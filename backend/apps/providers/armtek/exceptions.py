@@ -15,3 +15,23 @@ class ArmtekResponseError(ArmtekError):
     def __init__(self, message: str, *, status: int | None = None):
         super().__init__(message)
         self.status = status
+
+
+class ArmtekHttpError(ArmtekError):
+    """Raised when Armtek answers with a non-2xx HTTP status."""
+
+    def __init__(self, message: str, *, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ArmtekTransportError(ArmtekError):
+    """Raised when Armtek cannot be reached or does not answer in time."""
+
+    def __init__(self, message: str, *, timeout: bool = False):
+        super().__init__(message)
+        self.timeout = timeout
+
+
+class ArmtekUnavailableError(ArmtekError):
+    """Raised without calling Armtek while its circuit breaker is open."""
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Dict
+
+_counters: Counter[str] = Counter()
+_gauges: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Bump a process-local Armtek counter (cache hits, retries, ...)."""
+    with _lock:
+        _counters[name] += value
+
+
+def set_gauge(name: str, value: float) -> None:
+    """Record the current value of a level, e.g. an adaptive concurrency limit."""
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot() -> Dict[str, float]:
+    with _lock:
+        return {**_counters, **_gauges}
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import atexit
+import importlib.util
+import logging
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+from django.conf import settings
+
+from backend.apps.providers.armtek.cassette import get_cassette_transport
+
+logger = logging.getLogger(__name__)
+
+_clients: dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    """Return the process-wide keep-alive client for an Armtek base URL.
+
+    The client carries no credentials: callers pass ``auth`` per request so one
+    connection pool serves every account. It never stores cookies either, so a
+    ``Set-Cookie`` from one account's response is not sent for another account.
+    """
+    base = base_url.rstrip("/")
+    with _lock:
+        client = _clients.get(base)
+        if client is None or client.is_closed:
+            client = _build_client(base)
+            _clients[base] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """Close pooled connections; registered with ``atexit`` and safe to repeat."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+def _build_client(base_url: str) -> httpx.Client:
+    pool_size = max(1, int(getattr(settings, "ARMTEK_POOL_SIZE", 20)))
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=float(getattr(settings, "ARMTEK_POOL_KEEPALIVE_SECONDS", 30)),
+    )
+    return httpx.Client(
+        base_url=base_url,
+        timeout=float(settings.ARMTEK_TIMEOUT),
+        limits=limits,
+        http2=_http2_enabled(),
+        transport=get_cassette_transport(),
+        cookies=_no_cookies(),
+    )
+
+
+def _no_cookies() -> CookieJar:
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _http2_enabled() -> bool:
+    if not getattr(settings, "ARMTEK_HTTP2", False):
+        return False
+    # httpx only speaks HTTP/2 with the optional ``h2`` package installed.
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("ARMTEK_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+atexit.register(close_http_clients)
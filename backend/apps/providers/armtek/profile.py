@@ -10,6 +10,7 @@ from backend.apps.providers.armtek.exceptions import (
     ArmtekCredentialsError,
     ArmtekError,
 )
+from backend.apps.providers.armtek.pool import get_http_client
 
 
 @dataclass
@@ -48,58 +49,58 @@ def fetch_armtek_profile(
     if not login or not password:
         raise ArmtekCredentialsError("Armtek login and password are required")
 
+    client = get_http_client(base_url)
+    auth = (login, password)
     try:
-        with httpx.Client(
-            base_url=base_url.rstrip("/"),
-            auth=(login, password),
+        vkorg_resp = client.get(
+            "/api/ws_user/getUserVkorgList",
+            params={"format": "json"},
+            auth=auth,
             timeout=timeout,
-        ) as client:
-            vkorg_resp = client.get(
-                "/api/ws_user/getUserVkorgList", params={"format": "json"}
-            )
-            vkorg_data = unwrap_resp(_parse_json_mapping(vkorg_resp))
-            vkorg_array = vkorg_data.get("ARRAY") or []
-            if not isinstance(vkorg_array, list) or not vkorg_array:
-                raise ArmtekError("Armtek did not return VKORG list")
-            vkorg_entry = _pick_default(
-                [_ensure_mapping(item, "VKORG entry") for item in vkorg_array]
-            )
-            vkorg = str(
-                vkorg_entry.get("VKORG") or vkorg_entry.get("vkorg") or ""
-            ).strip()
-            program_raw = (
-                vkorg_entry.get("PROGRAM_NAME") or vkorg_entry.get("PROGRAM") or None
-            )
-            program = str(program_raw).strip() if program_raw else None
-            if not vkorg:
-                raise ArmtekError("Armtek VKORG is missing in response")
-
-            info_resp = client.post(
-                "/api/ws_user/getUserInfo",
-                params={"format": "json"},
-                data={"VKORG": vkorg, "STRUCTURE": "1"},
-            )
-            info_data = unwrap_resp(_parse_json_mapping(info_resp))
-            structure = info_data.get("STRUCTURE")
-            if isinstance(structure, list) and structure:
-                structure = structure[0]
-            structure_map = _ensure_mapping(structure, "RESP.STRUCTURE")
-
-            kunnr_rg = _extract_default_id(structure_map.get("RG_TAB"), "RG_TAB")
-            if not kunnr_rg:
-                raise ArmtekError("Armtek response missing KUNNR_RG")
-            kunnr_rg = str(kunnr_rg)
-            kunnr_za = _extract_default_id(structure_map.get("ZA_TAB"), "ZA_TAB")
-            vbeln = _extract_default_vbeln(structure_map.get("DOGOVOR_TAB"))
-
-            return ArmtekProfile(
-                vkorg=vkorg,
-                kunnr_rg=kunnr_rg,
-                program=program,
-                kunnr_za=kunnr_za,
-                incoterms=None,
-                vbeln=vbeln,
-            )
+        )
+        vkorg_data = unwrap_resp(_parse_json_mapping(vkorg_resp))
+        vkorg_array = vkorg_data.get("ARRAY") or []
+        if not isinstance(vkorg_array, list) or not vkorg_array:
+            raise ArmtekError("Armtek did not return VKORG list")
+        vkorg_entry = _pick_default(
+            [_ensure_mapping(item, "VKORG entry") for item in vkorg_array]
+        )
+        vkorg = str(vkorg_entry.get("VKORG") or vkorg_entry.get("vkorg") or "").strip()
+        program_raw = (
+            vkorg_entry.get("PROGRAM_NAME") or vkorg_entry.get("PROGRAM") or None
+        )
+        program = str(program_raw).strip() if program_raw else None
+        if not vkorg:
+            raise ArmtekError("Armtek VKORG is missing in response")
+
+        info_resp = client.post(
+            "/api/ws_user/getUserInfo",
+            params={"format": "json"},
+            data={"VKORG": vkorg, "STRUCTURE": "1"},
+            auth=auth,
+            timeout=timeout,
+        )
+        info_data = unwrap_resp(_parse_json_mapping(info_resp))
+        structure = info_data.get("STRUCTURE")
+        if isinstance(structure, list) and structure:
+            structure = structure[0]
+        structure_map = _ensure_mapping(structure, "RESP.STRUCTURE")
+
+        kunnr_rg = _extract_default_id(structure_map.get("RG_TAB"), "RG_TAB")
+        if not kunnr_rg:
+            raise ArmtekError("Armtek response missing KUNNR_RG")
+        kunnr_rg = str(kunnr_rg)
+        kunnr_za = _extract_default_id(structure_map.get("ZA_TAB"), "ZA_TAB")
+        vbeln = _extract_default_vbeln(structure_map.get("DOGOVOR_TAB"))
+
+        return ArmtekProfile(
+            vkorg=vkorg,
+            kunnr_rg=kunnr_rg,
+            program=program,
+            kunnr_za=kunnr_za,
+            incoterms=None,
+            vbeln=vbeln,
+        )
     except httpx.TimeoutException as exc:
         raise ArmtekError("Armtek user API timed out") from exc
     except httpx.RequestError as exc:  # pragma: no cover - network guard
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.conf import settings
+
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.exceptions import (
+    ArmtekError,
+    ArmtekHttpError,
+    ArmtekTransportError,
+    ArmtekUnavailableError,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_transient(exc: ArmtekError) -> bool:
+    """Whether an error means Armtek is unavailable rather than the call is wrong."""
+    if isinstance(exc, ArmtekTransportError):
+        return True
+    if isinstance(exc, ArmtekHttpError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+def is_outage(exc: ArmtekError) -> bool:
+    """Whether a failed lookup may fall back to a stale cached result."""
+    return isinstance(exc, ArmtekUnavailableError) or is_transient(exc)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 1
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+
+    @classmethod
+    def from_settings(cls) -> RetryPolicy:
+        return cls(
+            attempts=max(1, int(getattr(settings, "ARMTEK_RETRY_ATTEMPTS", 1))),
+            base_delay=float(getattr(settings, "ARMTEK_RETRY_BASE_DELAY", 0.2)),
+            max_delay=float(getattr(settings, "ARMTEK_RETRY_MAX_DELAY", 2.0)),
+        )
+
+    def should_retry(self, exc: ArmtekError, *, attempt: int) -> bool:
+        return attempt < self.attempts and is_transient(exc)
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt``."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` transient failures in a row.
+
+    While open every call fails fast with ``ArmtekUnavailableError``. After
+    ``reset_timeout`` seconds one probe is let through (half-open): success
+    closes the breaker, another failure opens it again.
+    """
+
+    def __init__(
+        self, *, name: str, failure_threshold: int, reset_timeout: float
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        self._before_call()
+        try:
+            yield
+        except ArmtekError as exc:
+            if is_transient(exc):
+                self._record_failure()
+            else:
+                self._record_success()
+            raise
+        except BaseException:
+            with self._lock:
+                self._probing = False
+            raise
+        else:
+            self._record_success()
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == OPEN and elapsed >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        metrics.increment("breaker.rejected")
+        raise ArmtekUnavailableError(f"Armtek at {self.name} is unavailable")
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        logger.warning(
+            "Armtek circuit breaker for %s: %s -> %s", self.name, self.state, state
+        )
+        self.state = state
+        metrics.increment(f"breaker.{state}")
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(base_url: str) -> Optional[CircuitBreaker]:
+    """Return the process-wide breaker of an Armtek host, or None when disabled."""
+    threshold = int(getattr(settings, "ARMTEK_BREAKER_FAILURE_THRESHOLD", 0))
+    if threshold <= 0:
+        return None
+    with _breakers_lock:
+        breaker = _breakers.get(base_url)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name=base_url,
+                failure_threshold=threshold,
+                reset_timeout=float(
+                    getattr(settings, "ARMTEK_BREAKER_RESET_SECONDS", 30)
+                ),
+            )
+            _breakers[base_url] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
@@ -1,16 +1,32 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+import threading
+from concurrent.futures import Future
+from decimal import Decimal
+from types import TracebackType
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar
 
+import httpx
 from django.conf import settings
 
+from backend.apps.providers.armtek.async_client import AsyncArmtekClient
+from backend.apps.providers.armtek.cache import search_cache_key
+from backend.apps.providers.armtek.cassette import get_cassette_transport
 from backend.apps.providers.armtek.client import ArmtekClient
 from backend.apps.providers.armtek.exceptions import ArmtekCredentialsError
+from backend.apps.providers.armtek.pool import get_http_client
+from backend.apps.providers.armtek.resilience import RetryPolicy, get_breaker
+from backend.apps.providers.armtek.singleflight import (
+    coalesce_search,
+    coalesce_search_async,
+)
+from backend.apps.providers.armtek.throttle import get_throttle
 from backend.apps.providers.armtek.types import ArmtekSearchItem
 from backend.apps.providers.services import ArmtekCredentials
 
 
-class ArmtekSearchService:
+class _ArmtekSearchBase:
     def __init__(
         self,
         credentials: Optional[ArmtekCredentials],
@@ -35,35 +51,42 @@ class ArmtekSearchService:
             else getattr(settings, "ARMTEK_ENABLE_STUB", False)
         )
 
-    def search(self, *, pin: str, brand: str | None = None) -> List[ArmtekSearchItem]:
-        if self.enable_stub:
-            return [self._build_stub_item(pin=pin, brand=brand)]
+    def cache_key(self, *, pin: str, brand: str | None = None) -> Optional[str]:
+        """Key of the shared result cache, or None when results are not cacheable."""
+        if self.enable_stub or self.credentials is None:
+            return None
+        if not self.credentials.vkorg or not self.credentials.kunnr_rg:
+            return None
+        return search_cache_key(
+            vkorg=self.credentials.vkorg,
+            kunnr_rg=self.credentials.kunnr_rg,
+            program=self.program,
+            pin=pin,
+            brand=brand,
+        )
 
+    def _require_credentials(self) -> ArmtekCredentials:
         if self.credentials is None:
             raise ArmtekCredentialsError("Armtek credentials are not configured")
 
         if not self.credentials.vkorg or not self.credentials.kunnr_rg:
             raise ArmtekCredentialsError("Armtek VKORG and KUNNR_RG are required")
+        return self.credentials
 
-        with ArmtekClient(
-            base_url=self.base_url,
-            login=self.credentials.login,
-            password=self.credentials.password,
-            timeout=self.timeout,
-        ) as client:
-            items = client.search(
-                vkorg=self.credentials.vkorg,
-                kunnr_rg=self.credentials.kunnr_rg,
-                pin=pin,
-                brand=brand,
-                query_type=1,  # Only direct matches (exclude analogs) per Armtek API
-                program=self.program,
-                kunnr_za=self.credentials.kunnr_za,
-                incoterms=self.credentials.incoterms,
-                vbeln=self.credentials.vbeln,
-            )
-        main = self._pick_first_non_analog(items)
-        return [main] if main else []
+    def _search_kwargs(
+        self, credentials: ArmtekCredentials, *, pin: str, brand: str | None
+    ) -> Dict[str, Any]:
+        return {
+            "vkorg": credentials.vkorg,
+            "kunnr_rg": credentials.kunnr_rg,
+            "pin": pin,
+            "brand": brand,
+            "query_type": 1,  # Only direct matches (exclude analogs) per Armtek API
+            "program": self.program,
+            "kunnr_za": credentials.kunnr_za,
+            "incoterms": credentials.incoterms,
+            "vbeln": credentials.vbeln,
+        }
 
     def _build_stub_item(self, *, pin: str, brand: str | None) -> ArmtekSearchItem:
         label = brand or "STUB"
@@ -74,7 +97,7 @@ class ArmtekSearchService:
             name=f"{pin} {label} (stub)",
             artid=artid,
             is_analog=False,
-            price=0.0,
+            price=Decimal("0"),
             currency="RUB",
             warehouse_partner="STUB",
             warehouse_code="STB",
@@ -82,27 +105,187 @@ class ArmtekSearchService:
             return_days=7,
             multiplicity=1,
             minimum_order=1,
-            supply_probability=0.99,
+            supply_probability=Decimal("0.99"),
             delivery_date=None,
             warranty_date=None,
             import_flag=None,
             special_flag=None,
-            max_retail_price=0.0,
-            markup=0.0,
+            max_retail_price=Decimal("0"),
+            markup=Decimal("0"),
             note="stub data",
-            importer_markup=0.0,
-            producer_price=0.0,
-            markup_rest_rub=0.0,
-            markup_rest_percent=0.0,
+            importer_markup=Decimal("0"),
+            producer_price=Decimal("0"),
+            markup_rest_rub=Decimal("0"),
+            markup_rest_percent=Decimal("0"),
             raw={"stub": True},
         )
 
-    @staticmethod
-    def _pick_first_non_analog(
-        items: list[ArmtekSearchItem],
-    ) -> ArmtekSearchItem | None:
-        """Return the first item that is not explicitly marked as analog."""
-        for item in items:
-            if item.is_analog is not True:
-                return item
-        return None
+
+class ArmtekSearchService(_ArmtekSearchBase):
+    def search(self, *, pin: str, brand: str | None = None) -> List[ArmtekSearchItem]:
+        if self.enable_stub:
+            return [self._build_stub_item(pin=pin, brand=brand)]
+
+        key = self.cache_key(pin=pin, brand=brand)
+        if key is None:
+            return self._search_remote(pin=pin, brand=brand)
+        # Identical lookups running at the same time share one Armtek call.
+        return coalesce_search(key, lambda: self._search_remote(pin=pin, brand=brand))
+
+    def _search_remote(
+        self, *, pin: str, brand: str | None = None
+    ) -> List[ArmtekSearchItem]:
+        credentials = self._require_credentials()
+        with ArmtekClient(
+            base_url=self.base_url,
+            login=credentials.login,
+            password=credentials.password,
+            timeout=self.timeout,
+            client=get_http_client(self.base_url),
+            throttle=get_throttle(credentials.login),
+            retry=RetryPolicy.from_settings(),
+            breaker=get_breaker(self.base_url),
+        ) as client:
+            return client.search(
+                **self._search_kwargs(credentials, pin=pin, brand=brand),
+                first_non_analog=True,
+            )
+
+
+class AsyncArmtekSearchService(_ArmtekSearchBase):
+    """Event-loop variant of ``ArmtekSearchService`` for large bulk searches."""
+
+    def __init__(
+        self,
+        credentials: Optional[ArmtekCredentials],
+        *,
+        base_url: str | None = None,
+        timeout: float | None = None,
+        enable_stub: bool | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        super().__init__(
+            credentials, base_url=base_url, timeout=timeout, enable_stub=enable_stub
+        )
+        self.transport = transport
+
+    async def search(
+        self, *, pin: str, brand: str | None = None
+    ) -> List[ArmtekSearchItem]:
+        if self.enable_stub:
+            return [self._build_stub_item(pin=pin, brand=brand)]
+        credentials = self._require_credentials()
+        async with self._open_client(credentials) as client:
+            return await self._search_with(client, credentials, pin=pin, brand=brand)
+
+    def _open_client(self, credentials: ArmtekCredentials) -> AsyncArmtekClient:
+        return AsyncArmtekClient(
+            base_url=self.base_url,
+            login=credentials.login,
+            password=credentials.password,
+            timeout=self.timeout,
+            transport=self.transport or get_cassette_transport(),
+            throttle=get_throttle(credentials.login),
+            retry=RetryPolicy.from_settings(),
+            breaker=get_breaker(self.base_url),
+        )
+
+    async def _search_with(
+        self,
+        client: AsyncArmtekClient,
+        credentials: ArmtekCredentials,
+        *,
+        pin: str,
+        brand: str | None,
+    ) -> List[ArmtekSearchItem]:
+        async def fetch() -> List[ArmtekSearchItem]:
+            return await client.search(
+                **self._search_kwargs(credentials, pin=pin, brand=brand),
+                first_non_analog=True,
+            )
+
+        key = self.cache_key(pin=pin, brand=brand)
+        if key is None:
+            return await fetch()
+        # Shares in-flight lookups with threaded and other event-loop callers.
+        return await coalesce_search_async(key, fetch)
+
+    def runner(self, *, concurrency: int) -> AsyncSearchRunner:
+        return AsyncSearchRunner(self, concurrency=concurrency)
+
+
+T = TypeVar("T")
+
+
+class AsyncSearchRunner:
+    """One event loop and one client serving a whole bulk to synchronous code.
+
+    The loop runs in a background thread between ``__enter__`` and ``__exit__``;
+    ``submit`` schedules a lookup on it and returns a ``concurrent.futures``
+    future. At most ``concurrency`` lookups are in flight, and lookups still
+    running on exit are cancelled.
+    """
+
+    def __init__(self, service: AsyncArmtekSearchService, *, concurrency: int):
+        self.service = service
+        self.concurrency = max(1, concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="armtek-async", daemon=True
+        )
+
+    def __enter__(self) -> AsyncSearchRunner:
+        self._thread.start()
+        try:
+            self._call(self._open())
+        except BaseException:
+            self._stop()
+            raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        try:
+            self._call(self._close())
+        finally:
+            self._stop()
+
+    def submit(self, pin: str, brand: str | None) -> Future[List[ArmtekSearchItem]]:
+        return asyncio.run_coroutine_threadsafe(self._search(pin, brand), self._loop)
+
+    async def _open(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client: Optional[AsyncArmtekClient] = None
+        if not self.service.enable_stub:
+            # Missing credentials fail the run before any lookup is scheduled.
+            self._credentials = self.service._require_credentials()
+            self._client = self.service._open_client(self._credentials)
+
+    async def _close(self) -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def _search(self, pin: str, brand: str | None) -> List[ArmtekSearchItem]:
+        if self._client is None:
+            return [self.service._build_stub_item(pin=pin, brand=brand)]
+        async with self._semaphore:
+            return await self.service._search_with(
+                self._client, self._credentials, pin=pin, brand=brand
+            )
+
+    def _call(self, coro: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar, cast
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.cache import peek_cached_search, store_search
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+
+T = TypeVar("T")
+
+LOCK_PREFIX = "armtek:inflight:"
+# How often a process waiting on another process' lookup re-checks the cache.
+_REMOTE_POLL_SECONDS = 0.1
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        # Event-loop followers, woken from whichever thread finishes the call.
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+
+    def outcome(self) -> T:
+        if self.error is not None:
+            raise self.error
+        return self.result  # type: ignore[return-value]
+
+
+class SingleFlight(Generic[T]):
+    """Collapse concurrent calls with the same key into a single execution.
+
+    The first caller runs ``fn``; callers arriving while it is in flight block
+    and receive the same result, or the same exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        while True:
+            call, leader, _ = self._join(key)
+            if leader:
+                break
+            metrics.increment("singleflight.shared")
+            call.done.wait()
+            if not isinstance(call.error, asyncio.CancelledError):
+                return call.outcome()
+            # The leading task was cancelled: take the lookup over.
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            self._finish(key, call)
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """``do`` for event-loop callers; shares calls with threaded callers."""
+        while True:
+            call, leader, waiter = self._join(key, loop=asyncio.get_running_loop())
+            if leader:
+                break
+            metrics.increment("singleflight.shared")
+            await cast(asyncio.Future[None], waiter)
+            if not isinstance(call.error, asyncio.CancelledError):
+                return call.outcome()
+        try:
+            call.result = await fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            self._finish(key, call)
+
+    def _join(
+        self, key: str, loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Tuple[_Call[T], bool, Optional[asyncio.Future[None]]]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                return call, True, None
+            waiter = None
+            if loop is not None:
+                waiter = loop.create_future()
+                call.waiters.append((loop, waiter))
+            return call, False, waiter
+
+    def _finish(self, key: str, call: _Call[T]) -> None:
+        with self._lock:
+            del self._calls[key]
+            waiters, call.waiters = call.waiters, []
+        call.done.set()
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_search_flight: SingleFlight[list[ArmtekSearchItem]] = SingleFlight()
+
+
+def coalesce_search(
+    key: str, fetch: Callable[[], list[ArmtekSearchItem]]
+) -> list[ArmtekSearchItem]:
+    """Run ``fetch`` once for all concurrent lookups sharing ``key``."""
+    if getattr(settings, "ARMTEK_SINGLEFLIGHT_SHARED", False):
+        items = _search_flight.do(key, lambda: _shared_fetch(key, fetch))
+    else:
+        items = _search_flight.do(key, fetch)
+    return list(items)
+
+
+async def coalesce_search_async(
+    key: str, fetch: Callable[[], Awaitable[list[ArmtekSearchItem]]]
+) -> list[ArmtekSearchItem]:
+    """``coalesce_search`` for lookups made on an event loop."""
+    if getattr(settings, "ARMTEK_SINGLEFLIGHT_SHARED", False):
+        items = await _search_flight.do_async(
+            key, lambda: _shared_fetch_async(key, fetch)
+        )
+    else:
+        items = await _search_flight.do_async(key, fetch)
+    return list(items)
+
+
+def _shared_fetch(
+    key: str, fetch: Callable[[], list[ArmtekSearchItem]]
+) -> list[ArmtekSearchItem]:
+    """Cross-process single-flight built on an atomic ``cache.add`` lock.
+
+    The process holding the lock publishes its result to the search cache before
+    releasing it; other processes poll that cache entry while they wait. If the
+    holder fails, the lock disappears and the next waiter performs the lookup.
+    """
+    lock = _CacheLock(key)
+    deadline = time.monotonic() + lock.ttl
+    while not lock.acquire():
+        if time.monotonic() >= deadline:
+            return fetch()
+        metrics.increment("singleflight.remote_wait")
+        time.sleep(_REMOTE_POLL_SECONDS)
+        cached = peek_cached_search(key)
+        if cached is not None:
+            return cached
+    try:
+        items = fetch()
+        store_search(key, items)
+        return items
+    finally:
+        lock.release()
+
+
+async def _shared_fetch_async(
+    key: str, fetch: Callable[[], Awaitable[list[ArmtekSearchItem]]]
+) -> list[ArmtekSearchItem]:
+    """``_shared_fetch`` with the cache calls moved off the event loop."""
+    lock = _CacheLock(key)
+    deadline = time.monotonic() + lock.ttl
+    while not await sync_to_async(lock.acquire)():
+        if time.monotonic() >= deadline:
+            return await fetch()
+        metrics.increment("singleflight.remote_wait")
+        await asyncio.sleep(_REMOTE_POLL_SECONDS)
+        cached = await sync_to_async(peek_cached_search)(key)
+        if cached is not None:
+            return cached
+    try:
+        items = await fetch()
+        await sync_to_async(store_search)(key, items)
+        return items
+    finally:
+        await sync_to_async(lock.release)()
+
+
+class _CacheLock:
+    """Cross-process lock on one lookup: an atomic ``cache.add`` with a TTL."""
+
+    def __init__(self, key: str) -> None:
+        self.cache = caches[getattr(settings, "ARMTEK_SEARCH_CACHE_ALIAS", "default")]
+        self.key = LOCK_PREFIX + key
+        self.token = uuid4().hex
+        self.ttl = int(settings.ARMTEK_TIMEOUT) * 2
+
+    def acquire(self) -> bool:
+        return bool(self.cache.add(self.key, self.token, timeout=self.ttl))
+
+    def release(self) -> None:
+        if self.cache.get(self.key) == self.token:
+            self.cache.delete(self.key)
@@ -0,0 +1,221 @@
+"""Local stand-in for the Armtek web services, for capacity and failure tests.
+
+Serves ``ws_search/search`` and the ``ws_user`` profile calls with Armtek's
+``STATUS``/``RESP`` envelopes over real HTTP, so pooling, timeouts, retries,
+throttling and the circuit breaker are exercised end to end. Latency, 429/5xx
+rates, stalled responses and response sizes come from ``StandinProfile``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+@dataclass(frozen=True)
+class StandinProfile:
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    distribution: str = "uniform"
+    error_rate: float = 0.0  # share of HTTP 503 answers
+    throttle_rate: float = 0.0  # share of HTTP 429 answers
+    stall_rate: float = 0.0  # share of answers held for stall_seconds
+    stall_seconds: float = 30.0
+    offers: Tuple[int, int] = (1, 20)  # RESP.ARRAY size range per search
+    analog_share: float = 0.2
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.distribution!r}")
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], profile: StandinProfile) -> None:
+        super().__init__(address, StandinHandler)
+        self.profile = profile
+        self.counters: Dict[str, int] = {}
+        self._rng = random.Random(profile.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def latency(self) -> float:
+        profile = self.profile
+        with self._lock:
+            if profile.distribution == "fixed" or not profile.jitter_ms:
+                value = profile.latency_ms
+            elif profile.distribution == "uniform":
+                value = self._rng.uniform(
+                    profile.latency_ms - profile.jitter_ms,
+                    profile.latency_ms + profile.jitter_ms,
+                )
+            else:
+                # Median latency_ms; jitter_ms sets the spread of the long tail.
+                sigma = profile.jitter_ms / max(profile.latency_ms, 1.0)
+                value = self._rng.lognormvariate(
+                    math.log(max(profile.latency_ms, 1.0)), sigma
+                )
+        return max(value, 0.0) / 1000
+
+    def offer_count(self, pin: str) -> int:
+        low, high = self.profile.offers
+        # The same article always gets the same number of offers.
+        return random.Random(pin).randint(low, max(low, high))
+
+    def count(self, outcome: str) -> None:
+        with self._lock:
+            self.counters[outcome] = self.counters.get(outcome, 0) + 1
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server: StandinServer
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real service
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch()
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        form = dict(parse_qsl(self.rfile.read(length).decode(), keep_blank_values=True))
+        path = urlsplit(self.path).path
+        routes = {
+            ("POST", "/api/ws_search/search"): self._search,
+            ("GET", "/api/ws_user/getUserVkorgList"): self._vkorg_list,
+            ("POST", "/api/ws_user/getUserInfo"): self._user_info,
+        }
+        route = routes.get((self.command, path))
+        if route is None:
+            self.server.count("not_found")
+            self._reply(404, {"STATUS": 404, "MESSAGES": [], "RESP": None})
+            return
+        if not self.headers.get("Authorization") and not form.get("LOGIN"):
+            self.server.count("unauthorized")
+            self._reply(401, {"STATUS": 401, "MESSAGES": ["Unauthorized"]})
+            return
+
+        server, profile = self.server, self.server.profile
+        time.sleep(server.latency())
+        roll = server.roll()
+        if roll < profile.throttle_rate:
+            server.count("throttled")
+            self._reply(429, {"STATUS": 429, "MESSAGES": ["Too many requests"]})
+            return
+        if roll < profile.throttle_rate + profile.error_rate:
+            server.count("error")
+            self._reply(503, {"STATUS": 503, "MESSAGES": ["Service unavailable"]})
+            return
+        if roll < profile.throttle_rate + profile.error_rate + profile.stall_rate:
+            server.count("stalled")
+            time.sleep(profile.stall_seconds)
+        server.count("ok")
+        self._reply(200, {"STATUS": 200, "MESSAGES": [], "RESP": route(form)})
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):  # client gave up (timeout)
+            self.close_connection = True
+
+    def _search(self, form: Dict[str, str]) -> Dict[str, Any]:
+        pin = form.get("PIN", "").strip().upper()
+        brand = form.get("BRAND", "").strip().upper() or "ARMTEK"
+        count = self.server.offer_count(pin)
+        analogs = int(count * self.server.profile.analog_share)
+        return {
+            "ARRAY": [
+                search_offer(pin, brand, index, analog=index < analogs)
+                for index in range(count)
+            ]
+        }
+
+    def _vkorg_list(self, form: Dict[str, str]) -> List[Dict[str, Any]]:
+        return [{"VKORG": "4000", "PROGRAM_NAME": "LP", "DEFAULT": "1"}]
+
+    def _user_info(self, form: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "STRUCTURE": {
+                "KUNAG": "1000",
+                "RG_TAB": [{"KUNNR": "1000", "DEFAULT": "1"}],
+                "ZA_TAB": [{"KUNNR": "2000", "DEFAULT": "1"}],
+                "DOGOVOR_TAB": [{"VBELN": "3000", "DEFAULT": "1"}],
+            }
+        }
+
+
+def search_offer(pin: str, brand: str, index: int, *, analog: bool) -> Dict[str, Any]:
+    """One warehouse offer shaped like a ``ws_search/search`` array entry."""
+    return {
+        "PIN": pin if not analog else f"{pin}-A{index}",
+        "BRAND": brand,
+        "NAME": f"{brand} {pin} (offer {index})",
+        "ARTID": f"{zlib.crc32(f'{pin}_{brand}'.encode()) % 10_000_000}{index:03d}",
+        "PARNR": f"{40000 + index % 50}",
+        "KEYZAK": f"MOV{index % 9:04d}",
+        "RVALUE": str(index % 120 + 1),
+        "RETDAYS": "14",
+        "RDPRF": "1",
+        "MINBM": "1",
+        "VENSL": "95.50",
+        "PRICE": f"{250 + index * 7 % 300}.40",
+        "WAERS": "RUB",
+        "DLVDT": "20260105120000",
+        "WRNTDT": "",
+        "ANALOG": "1" if analog else "",
+        "TYPEB": "0",
+        "DSPEC": "",
+        "RCOST": "0.00",
+        "MRKBY": "12.5",
+        "PNOTE": "",
+        "IMP_ADD": "0.00",
+        "SELLP": "0.00",
+        "REST_ADD": "0.00",
+        "REST_ADD_P": "0.00",
+    }
+
+
+def start_standin(
+    profile: StandinProfile | None = None, *, host: str = "127.0.0.1", port: int = 0
+) -> StandinServer:
+    """Serve in a background thread; stop with ``shutdown()``/``server_close()``."""
+    server = StandinServer((host, port), profile or StandinProfile())
+    thread = threading.Thread(
+        target=server.serve_forever, name="armtek-standin", daemon=True
+    )
+    thread.start()
+    return server
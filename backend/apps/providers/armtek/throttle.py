@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Optional, Protocol, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.exceptions import (
+    ArmtekHttpError,
+    ArmtekTransportError,
+)
+from backend.apps.providers.models import ArmtekRateBucket
+
+logger = logging.getLogger(__name__)
+
+# Minimum spacing between two multiplicative decreases, so one burst of failures
+# from requests that were already in flight counts as a single congestion signal.
+_BACKOFF_COOLDOWN_SECONDS = 1.0
+
+
+class TokenBucket(Protocol):
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+
+
+class LocalTokenBucket:
+    """In-process bucket; every worker process gets its own budget."""
+
+    def __init__(self, *, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._refilled_at
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate) - 1
+            self._refilled_at = now
+            return max(0.0, -self._tokens / self.rate)
+
+
+class DatabaseTokenBucket:
+    """Bucket stored in ``ArmtekRateBucket`` and shared by all processes.
+
+    Tokens may go negative: a caller reserves its token in one short transaction
+    and then sleeps for the deficit, so waiting never holds a row lock.
+    """
+
+    def __init__(self, *, login: str, rate: float, burst: int) -> None:
+        self.login = login
+        self.rate = rate
+        self.burst = float(burst)
+
+    def reserve(self) -> float:
+        now = timezone.now()
+        with transaction.atomic():
+            buckets = ArmtekRateBucket.objects.select_for_update()
+            bucket, _created = buckets.get_or_create(
+                login=self.login,
+                defaults={"tokens": self.burst, "refilled_at": now},
+            )
+            tokens = self._refill(bucket.tokens, bucket.refilled_at, now) - 1
+            bucket.tokens = tokens
+            bucket.refilled_at = now
+            bucket.save(update_fields=["tokens", "refilled_at"])
+        return max(0.0, -tokens / self.rate)
+
+    def _refill(self, tokens: float, refilled_at: datetime, now: datetime) -> float:
+        elapsed = max(0.0, (now - refilled_at).total_seconds())
+        return min(self.burst, tokens + elapsed * self.rate)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on concurrent Armtek requests for one login.
+
+    Every successful call raises the limit by ``1 / limit`` (about +1 per window
+    of ``limit`` calls); a timeout, 429 or 5xx halves it. Threads and event-loop
+    tasks share the same limit: tasks wait on a future that a release wakes up.
+    """
+
+    def __init__(self, *, name: str, maximum: int, minimum: int = 1) -> None:
+        self.name = name
+        self.maximum = float(max(minimum, maximum))
+        self.minimum = float(minimum)
+        self.limit = self.maximum
+        self._in_flight = 0
+        self._last_backoff = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters: List[
+            Tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]
+        ] = []
+        metrics.set_gauge(f"throttle.{name}.limit", self.limit)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._in_flight < int(self.limit):
+                    self._in_flight += 1
+                    return
+                waiter: asyncio.Future[None] = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, *, overloaded: bool = False, succeeded: bool = True) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if overloaded:
+                self._back_off()
+            elif succeeded:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            metrics.set_gauge(f"throttle.{self.name}.limit", self.limit)
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def _back_off(self) -> None:
+        now = time.monotonic()
+        if now - self._last_backoff < _BACKOFF_COOLDOWN_SECONDS:
+            return
+        self._last_backoff = now
+        previous = self.limit
+        self.limit = max(self.minimum, self.limit / 2)
+        metrics.increment(f"throttle.{self.name}.backoff")
+        logger.warning(
+            "Armtek overloaded for %s: concurrency %.1f -> %.1f",
+            self.name,
+            previous,
+            self.limit,
+        )
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ArmtekThrottle:
+    """Rate limit plus adaptive concurrency applied around each Armtek request."""
+
+    def __init__(
+        self, *, concurrency: AdaptiveConcurrency, bucket: Optional[TokenBucket]
+    ) -> None:
+        self.concurrency = concurrency
+        self.bucket = bucket
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self.concurrency.acquire()
+        try:
+            if self.bucket is not None:
+                delay = self.bucket.reserve()
+                if delay > 0:
+                    metrics.increment("throttle.rate_limited")
+                    time.sleep(delay)
+            yield
+        except BaseException as exc:
+            self._release(exc)
+            raise
+        else:
+            self.concurrency.release()
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """``slot`` for event-loop callers: waits without blocking the loop."""
+        await self.concurrency.acquire_async()
+        try:
+            if self.bucket is not None:
+                # The database bucket runs a short transaction; keep it off the loop.
+                delay = await sync_to_async(self.bucket.reserve)()
+                if delay > 0:
+                    metrics.increment("throttle.rate_limited")
+                    await asyncio.sleep(delay)
+            yield
+        except BaseException as exc:
+            self._release(exc)
+            raise
+        else:
+            self.concurrency.release()
+
+    def _release(self, exc: BaseException) -> None:
+        if isinstance(exc, ArmtekHttpError):
+            self.concurrency.release(
+                overloaded=exc.status_code == 429 or exc.status_code >= 500
+            )
+        elif isinstance(exc, ArmtekTransportError):
+            self.concurrency.release(overloaded=True)
+        else:
+            self.concurrency.release(succeeded=False)
+
+
+_throttles: dict[str, ArmtekThrottle] = {}
+_throttles_lock = threading.Lock()
+
+
+def get_throttle(login: str) -> ArmtekThrottle:
+    """Return the process-wide throttle of an Armtek login."""
+    with _throttles_lock:
+        throttle = _throttles.get(login)
+        if throttle is None:
+            throttle = ArmtekThrottle(
+                concurrency=AdaptiveConcurrency(
+                    name=login,
+                    maximum=int(getattr(settings, "ARMTEK_MAX_CONCURRENCY", 4)),
+                ),
+                bucket=_build_bucket(login),
+            )
+            _throttles[login] = throttle
+        return throttle
+
+
+def reset_throttles() -> None:
+    with _throttles_lock:
+        _throttles.clear()
+
+
+def _build_bucket(login: str) -> Optional[TokenBucket]:
+    rate = float(getattr(settings, "ARMTEK_RATE_LIMIT_PER_SECOND", 0))
+    if rate <= 0:
+        return None
+    burst = max(1, int(getattr(settings, "ARMTEK_RATE_LIMIT_BURST", 10)))
+    if getattr(settings, "ARMTEK_RATE_LIMIT_BACKEND", "database") == "local":
+        return LocalTokenBucket(rate=rate, burst=burst)
+    return DatabaseTokenBucket(login=login, rate=rate, burst=burst)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from decimal import Decimal
 from typing import Any, Mapping, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ArmtekSearchItem:
     pin: str
     brand: str
@@ -12,7 +13,7 @@ class ArmtekSearchItem:
     artid: str
     oem: Optional[str] = None
     is_analog: Optional[bool] = None
-    price: Optional[float] = None
+    price: Optional[Decimal] = None
     currency: Optional[str] = None
     warehouse_partner: Optional[str] = None  # PARNR
     warehouse_code: Optional[str] = None  # KEYZAK
@@ -20,19 +21,19 @@ class ArmtekSearchItem:
     return_days: Optional[int] = None  # RETDAYS
     multiplicity: Optional[int] = None  # RDPRF
     minimum_order: Optional[int] = None  # MINBM
-    supply_probability: Optional[float] = None  # VENSEL
+    supply_probability: Optional[Decimal] = None  # VENSEL
     delivery_date: Optional[str] = None  # DLVDT
     warranty_date: Optional[str] = None  # WRNTDT
     import_flag: Optional[str] = None  # TYPEB
     special_flag: Optional[str] = None  # DSPEC
-    max_retail_price: Optional[float] = None  # RCOST
-    markup: Optional[float] = None  # MRKBY
+    max_retail_price: Optional[Decimal] = None  # RCOST
+    markup: Optional[Decimal] = None  # MRKBY
     note: Optional[str] = None  # PNOTE
-    importer_markup: Optional[float] = None  # IMP_ADD
-    producer_price: Optional[float] = None  # SELLP
-    markup_rest_rub: Optional[float] = None  # REST_ADD
-    markup_rest_percent: Optional[float] = None  # REST_ADD_P
-    raw: Optional[Mapping[str, Any]] = None
+    importer_markup: Optional[Decimal] = None  # IMP_ADD
+    producer_price: Optional[Decimal] = None  # SELLP
+    markup_rest_rub: Optional[Decimal] = None  # REST_ADD
+    markup_rest_percent: Optional[Decimal] = None  # REST_ADD_P
+    raw: Optional[Mapping[str, Any]] = None  # only with keep_raw=True
 
 
 @dataclass
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from backend.apps.providers.armtek.standin import (
+    LATENCY_DISTRIBUTIONS,
+    StandinProfile,
+    StandinServer,
+)
+
+
+class Command(BaseCommand):
+    help = "Serve a local Armtek stand-in with configurable latency and faults."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency-ms", type=float, default=50.0)
+        parser.add_argument(
+            "--jitter-ms",
+            type=float,
+            default=0.0,
+            help="Spread around --latency-ms (uniform: +/-, lognormal: tail).",
+        )
+        parser.add_argument(
+            "--distribution", choices=LATENCY_DISTRIBUTIONS, default="uniform"
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Share of HTTP 503."
+        )
+        parser.add_argument(
+            "--throttle-rate", type=float, default=0.0, help="Share of HTTP 429."
+        )
+        parser.add_argument(
+            "--stall-rate",
+            type=float,
+            default=0.0,
+            help="Share of answers held for --stall-seconds (client timeouts).",
+        )
+        parser.add_argument("--stall-seconds", type=float, default=30.0)
+        parser.add_argument(
+            "--offers",
+            default="1:20",
+            help="Offers per search as N or MIN:MAX.",
+        )
+        parser.add_argument("--analog-share", type=float, default=0.2)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        low, _, high = str(options["offers"]).partition(":")
+        try:
+            offers = (int(low), int(high or low))
+        except ValueError as exc:
+            raise CommandError("--offers must be N or MIN:MAX") from exc
+        profile = StandinProfile(
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            distribution=options["distribution"],
+            error_rate=options["error_rate"],
+            throttle_rate=options["throttle_rate"],
+            stall_rate=options["stall_rate"],
+            stall_seconds=options["stall_seconds"],
+            offers=offers,
+            analog_share=options["analog_share"],
+            seed=options["seed"],
+        )
+        server = StandinServer((options["host"], options["port"]), profile)
+        self.stdout.write(
+            f"Armtek stand-in on {server.base_url} "
+            f"(set ARMTEK_BASE_URL={server.base_url}, ARMTEK_ENABLE_STUB=0)"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Requests served: {server.counters}")
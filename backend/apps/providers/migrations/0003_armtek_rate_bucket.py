@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "providers",
+            "0002_provideraccount_incoterms_provideraccount_kunnr_rg_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArmtekRateBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("login", models.CharField(max_length=255, unique=True)),
+                ("tokens", models.FloatField()),
+                ("refilled_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -74,3 +74,14 @@ class ProviderAccount(models.Model):
 
     def set_password(self, raw_password: str) -> None:
         self.encrypted_password = encrypt_secret(raw_password)
+
+
+class ArmtekRateBucket(models.Model):
+    """Token bucket shared by every process that calls Armtek with one login."""
+
+    login = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField()
+    refilled_at = models.DateTimeField()
+
+    def __str__(self) -> str:  # pragma: no cover - display helper
+        return f"Rate bucket for {self.login}"
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
@@ -29,6 +33,87 @@ class ArmtekCredentials:
     vbeln: Optional[str]
 
 
+class _CredentialsCache:
+    """LRU of resolved credentials per user, bounded by size and TTL.
+
+    Entries remember the account ``updated_at`` they were built from. Writes in
+    this process invalidate them explicitly; the TTL bounds how long a change
+    made by another process can go unnoticed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[Any, Tuple[float, datetime, ArmtekCredentials]] = (
+            OrderedDict()
+        )
+        self._generations: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_pk: Any) -> Optional[ArmtekCredentials]:
+        with self._lock:
+            entry = self._entries.get(user_pk)
+            if entry is None:
+                return None
+            expires_at, _updated_at, credentials = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_pk]
+                return None
+            self._entries.move_to_end(user_pk)
+            return credentials
+
+    def generation(self, user_pk: Any) -> int:
+        with self._lock:
+            return self._generations.get(user_pk, 0)
+
+    def put(
+        self,
+        user_pk: Any,
+        updated_at: datetime,
+        credentials: ArmtekCredentials,
+        *,
+        generation: int,
+    ) -> None:
+        ttl = float(getattr(settings, "ARMTEK_CREDENTIALS_CACHE_SECONDS", 60))
+        size = int(getattr(settings, "ARMTEK_CREDENTIALS_CACHE_SIZE", 256))
+        if ttl <= 0 or size <= 0:
+            return
+        with self._lock:
+            # The account was changed while it was being read: keep the miss.
+            if self._generations.get(user_pk, 0) != generation:
+                return
+            current = self._entries.get(user_pk)
+            if current is not None and current[1] > updated_at:
+                return
+            self._entries[user_pk] = (time.monotonic() + ttl, updated_at, credentials)
+            self._entries.move_to_end(user_pk)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_pk: Any) -> None:
+        with self._lock:
+            self._entries.pop(user_pk, None)
+            self._generations[user_pk] = self._generations.get(user_pk, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+_credentials_cache = _CredentialsCache()
+
+
+def invalidate_armtek_credentials(user: Any) -> None:
+    """Drop cached credentials of ``user`` now and once the transaction commits."""
+    user_pk = getattr(user, "pk", user)
+    _credentials_cache.invalidate(user_pk)
+    # A concurrent resolve may still read the old row until the write commits.
+    transaction.on_commit(lambda: _credentials_cache.invalidate(user_pk))
+
+
+def clear_credentials_cache() -> None:
+    _credentials_cache.clear()
+
+
 @transaction.atomic
 def save_provider_account(
     *,
@@ -70,6 +155,7 @@ def save_provider_account(
             "updated_at",
         ]
     )
+    invalidate_armtek_credentials(user)
     return account
 
 
@@ -98,9 +184,15 @@ def update_armtek_account_context(account: ProviderAccount) -> ArmtekProfile:
             "updated_at",
         ]
     )
+    invalidate_armtek_credentials(account.user_id)
     return profile
 
 
+def delete_provider_account(*, user: Any, provider_name: str) -> None:
+    ProviderAccount.objects.filter(user=user, provider_name=provider_name).delete()
+    invalidate_armtek_credentials(user)
+
+
 def get_provider_account(*, user: Any, provider_name: str) -> Optional[ProviderAccount]:
     try:
         return ProviderAccount.objects.get(user=user, provider_name=provider_name)
@@ -114,11 +206,15 @@ def resolve_armtek_credentials(
     if user is None:
         return None
 
+    cached = _credentials_cache.get(user.pk)
+    if cached is not None:
+        return cached
+    generation = _credentials_cache.generation(user.pk)
     account = get_provider_account(user=user, provider_name=ProviderName.ARMTEK)
     if account is None or not account.password:
         return None
 
-    return ArmtekCredentials(
+    credentials = ArmtekCredentials(
         login=account.login,
         password=account.password,
         pin=account.pin,
@@ -129,3 +225,7 @@ def resolve_armtek_credentials(
         incoterms=account.incoterms,
         vbeln=account.vbeln,
     )
+    _credentials_cache.put(
+        user.pk, account.updated_at, credentials, generation=generation
+    )
+    return credentials
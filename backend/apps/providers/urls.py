@@ -2,6 +2,7 @@ from django.urls import path
 
 from backend.apps.providers.views import (
     ArmtekCredentialsView,
+    ArmtekMetricsView,
     ArmtekSearchProxyView,
     ProviderAccountListView,
 )
@@ -12,4 +13,5 @@ urlpatterns = [
     path(
         "armtek/credentials", ArmtekCredentialsView.as_view(), name="armtek-credentials"
     ),
+    path("armtek/metrics", ArmtekMetricsView.as_view(), name="armtek-metrics"),
 ]
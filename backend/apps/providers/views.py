@@ -3,12 +3,13 @@ from __future__ import annotations
 from typing import Any, cast
 
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from backend.apps.products.serializers import ProductSerializer
+from backend.apps.providers.armtek import metrics
 from backend.apps.providers.armtek.exceptions import (
     ArmtekCredentialsError,
     ArmtekError,
@@ -19,6 +20,7 @@ from backend.apps.providers.serializers import (
     ProviderAccountSerializer,
 )
 from backend.apps.providers.services import (
+    delete_provider_account,
     resolve_armtek_credentials,
     save_provider_account,
     update_armtek_account_context,
@@ -111,5 +113,13 @@ class ArmtekCredentialsView(APIView):
     def delete(self, request: Request, *args: object, **kwargs: object) -> Response:
         assert request.user.is_authenticated
         user = cast(Any, request.user)
-        user.provider_accounts.filter(provider_name="armtek").delete()
+        delete_provider_account(user=user, provider_name="armtek")
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ArmtekMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request, *args: object, **kwargs: object) -> Response:
+        # Counters are per process: each worker reports its own numbers.
+        return Response(metrics.snapshot())
@@ -20,6 +20,9 @@ class SearchRequestAdmin(SearchRequestAdminBase):
         "source",
         "status",
         "total_items",
+        "processed_queries",
+        "failed_queries",
+        "total_queries",
         "created_at",
     )
     list_filter = ("status", "source", "created_at")
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from backend.apps.providers.armtek.pool import close_http_clients
+from backend.apps.search.services import (
+    claim_next_search_request,
+    requeue_stale_searches,
+    run_queued_search,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Process bulk searches queued with mode=async."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            self._run(once=options["once"], poll_interval=options["poll_interval"])
+        finally:
+            close_http_clients()
+
+    def _run(self, *, once: bool, poll_interval: float) -> None:
+        while True:
+            close_old_connections()
+            requeued = requeue_stale_searches()
+            if requeued:
+                logger.warning("Requeued %s stale search request(s)", requeued)
+            search_request = claim_next_search_request()
+            if search_request is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            self.stdout.write(f"Processing search request {search_request.pk}")
+            try:
+                run_queued_search(search_request)
+            except Exception:  # the failure is already stored on the request
+                logger.exception("Search request %s failed", search_request.pk)
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="searchrequest",
+            name="last_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="searchrequest",
+            name="processed_queries",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="searchrequest",
+            name="total_queries",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0002_search_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="searchrequest",
+            name="failed_queries",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="searchrequest",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("in_progress", "In progress"),
+                    ("done", "Done"),
+                    ("partial", "Partially done"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=32,
+            ),
+        ),
+        migrations.CreateModel(
+            name="SearchQueryItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveIntegerField()),
+                ("query", models.TextField()),
+                ("pin", models.CharField(max_length=128)),
+                ("brand", models.CharField(max_length=128)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("total_items", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("duration_ms", models.PositiveIntegerField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "search_request",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="search.searchrequest",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["position"],
+                "indexes": [
+                    models.Index(
+                        fields=["search_request", "status"],
+                        name="search_sear_search__299b9e_idx",
+                    )
+                ],
+                "unique_together": {("search_request", "position")},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0003_search_query_items"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="searchrequest",
+            name="duplicate_queries",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0004_search_duplicate_queries"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="searchrequest",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="search_sear_user_id_383a82_idx",
+            ),
+        ),
+    ]
@@ -10,6 +10,15 @@ class SearchStatus(models.TextChoices):
     PENDING = "pending", "Pending"
     IN_PROGRESS = "in_progress", "In progress"
     DONE = "done", "Done"
+    PARTIAL = "partial", "Partially done"
+    FAILED = "failed", "Failed"
+
+
+class QueryItemStatus(models.TextChoices):
+    """Outcome of one query of a search request."""
+
+    PENDING = "pending", "Pending"
+    DONE = "done", "Done"
     FAILED = "failed", "Failed"
 
 
@@ -29,6 +38,11 @@ class SearchRequest(models.Model):
         max_length=32, choices=SearchStatus.choices, default=SearchStatus.PENDING
     )
     total_items = models.PositiveIntegerField(default=0)
+    total_queries = models.PositiveIntegerField(default=0)
+    processed_queries = models.PositiveIntegerField(default=0)
+    failed_queries = models.PositiveIntegerField(default=0)
+    duplicate_queries = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -36,6 +50,44 @@ class SearchRequest(models.Model):
         """Sort newest first for UX."""
 
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination of a user's history, newest first.
+            models.Index(fields=["user", "created_at", "id"]),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover - display helper
         return f"Search {self.id} ({self.source})"
+
+
+class SearchQueryItem(models.Model):
+    """Ledger entry for one query of a search request."""
+
+    search_request = models.ForeignKey(
+        SearchRequest, on_delete=models.CASCADE, related_name="items"
+    )
+    position = models.PositiveIntegerField()
+    query = models.TextField()
+    pin = models.CharField(max_length=128)
+    brand = models.CharField(max_length=128)
+    status = models.CharField(
+        max_length=16,
+        choices=QueryItemStatus.choices,
+        default=QueryItemStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    total_items = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Queries keep the order they were submitted in."""
+
+        ordering = ["position"]
+        unique_together = ("search_request", "position")
+        indexes = [models.Index(fields=["search_request", "status"])]
+
+    def __str__(self) -> str:  # pragma: no cover - display helper
+        return f"{self.query} ({self.status})"
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Mapping, Tuple
+
+from django.conf import settings
+
+
+def normalize_lookup(pin: str, brand: str) -> Tuple[str, str]:
+    """Return the PIN and brand sent to Armtek for a parsed query line.
+
+    Case and surrounding whitespace are dropped; the brand is mapped through
+    ``SEARCH_BRAND_ALIASES`` so spelling variants hit the same Armtek brand.
+    """
+    return pin.strip().upper(), _canonical_brand(brand)
+
+
+def lookup_key(pin: str, brand: str) -> Tuple[str, str]:
+    """Identity of a lookup: lines with equal keys share one Armtek call.
+
+    Punctuation is ignored as well, so ``ABC-123_Bosch`` and ``abc123_BOSCH``
+    collapse into one lookup.
+    """
+    normalized_pin, normalized_brand = normalize_lookup(pin, brand)
+    return _compact(normalized_pin), _compact(normalized_brand)
+
+
+def _canonical_brand(brand: str) -> str:
+    cleaned = " ".join(brand.upper().split())
+    return _brand_aliases().get(_compact(cleaned), cleaned)
+
+
+def _brand_aliases() -> Mapping[str, str]:
+    aliases: Mapping[str, str] = getattr(settings, "SEARCH_BRAND_ALIASES", {})
+    return {_compact(alias): brand.upper() for alias, brand in aliases.items()}
+
+
+def _compact(value: str) -> str:
+    return "".join(char for char in value.upper() if char.isalnum())
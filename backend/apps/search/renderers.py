@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Mapping, Optional
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamRenderer(BaseRenderer):
+    """Renderer of streamed search events; plain responses become one event."""
+
+    charset = "utf-8"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        # Used for error responses raised before streaming starts (400, 401, ...)
+        payload = data if isinstance(data, Mapping) else {"detail": data}
+        return self.render_event("error", payload)
+
+    def render_event(self, event: str, data: Mapping[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    @staticmethod
+    def _dumps(payload: Any) -> str:
+        return json.dumps(payload, cls=JSONEncoder, ensure_ascii=False)
+
+
+class NDJSONRenderer(StreamRenderer):
+    """One JSON object per line, the event name stored under ``"event"``."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render_event(self, event: str, data: Mapping[str, Any]) -> bytes:
+        return (self._dumps({"event": event, **data}) + "\n").encode()
+
+
+class EventStreamRenderer(StreamRenderer):
+    """Server-Sent Events: ``event:`` and a single JSON ``data:`` line."""
+
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render_event(self, event: str, data: Mapping[str, Any]) -> bytes:
+        return f"event: {event}\ndata: {self._dumps(data)}\n\n".encode()
@@ -4,7 +4,7 @@ from typing import Any, cast
 
 from rest_framework import serializers
 
-from backend.apps.search.models import SearchRequest
+from backend.apps.search.models import SearchQueryItem, SearchRequest
 from backend.apps.search.parsers import split_bulk_input, split_pin_and_brand
 
 
@@ -33,6 +33,7 @@ class BulkSearchSerializer(serializers.Serializer[dict[str, Any]]):
     )
     bulk_text = cast(Any, serializers.CharField(required=False, allow_blank=True))
     source = cast(Any, serializers.CharField(default="armtek"))
+    mode = cast(Any, serializers.ChoiceField(choices=["sync", "async"], default="sync"))
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         list_queries = attrs.get("queries") or []
@@ -68,6 +69,36 @@ class SearchRequestSerializer(serializers.ModelSerializer[SearchRequest]):
             "query_string",
             "status",
             "total_items",
+            "total_queries",
+            "processed_queries",
+            "failed_queries",
+            "duplicate_queries",
+            "last_error",
             "created_at",
             "updated_at",
         ]
+
+
+class ResumeSearchSerializer(serializers.Serializer[dict[str, Any]]):
+    """Resume payload."""
+
+    mode = cast(Any, serializers.ChoiceField(choices=["sync", "async"], default="sync"))
+
+
+class SearchQueryItemSerializer(serializers.ModelSerializer[SearchQueryItem]):
+    """Per-query ledger entry."""
+
+    class Meta:
+        """Search query item serialization config."""
+
+        model = SearchQueryItem
+        fields = [
+            "position",
+            "query",
+            "status",
+            "attempts",
+            "total_items",
+            "last_error",
+            "duration_ms",
+            "finished_at",
+        ]
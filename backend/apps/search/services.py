@@ -1,42 +1,97 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Tuple
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Sum
+from django.utils import timezone
 
 from backend.apps.products.models import Product
 from backend.apps.products.services import upsert_products_from_search
-from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.cache import (
+    get_cached_search,
+    get_stale_search,
+    store_search,
+)
+from backend.apps.providers.armtek.exceptions import (
+    ArmtekCredentialsError,
+    ArmtekError,
+)
+from backend.apps.providers.armtek.resilience import is_outage
+from backend.apps.providers.armtek.services import (
+    ArmtekSearchService,
+    AsyncArmtekSearchService,
+)
+from backend.apps.providers.armtek.types import ArmtekSearchItem
 from backend.apps.providers.services import resolve_armtek_credentials
-from backend.apps.search.models import SearchRequest, SearchStatus
+from backend.apps.search.models import (
+    QueryItemStatus,
+    SearchQueryItem,
+    SearchRequest,
+    SearchStatus,
+)
+from backend.apps.search.normalization import lookup_key, normalize_lookup
 from backend.apps.search.parsers import split_pin_and_brand
 
+# How many pending requests a worker inspects per claim attempt.
+_CLAIM_BATCH = 10
+# Lookups scheduled on the event loop ahead of the one being consumed in asyncio
+# fan-out mode; bounds pending work while earlier results are being persisted.
+_ASYNC_WINDOW = 100
+# Fetched lookups are written in short transactions of at most this many lookups
+# (or whatever arrived within the interval); each one commits the products
+# together with the ledger and progress counters, so they never disagree.
+_PERSIST_BATCH = 50
+_PERSIST_INTERVAL_SECONDS = 5.0
+_LEDGER_FIELDS = [
+    "status",
+    "attempts",
+    "total_items",
+    "last_error",
+    "duration_ms",
+    "finished_at",
+    "updated_at",
+]
+
+
+@dataclass
+class _Outcome:
+    """Result of one lookup: the items found or the Armtek error it ended with."""
+
+    items: list[ArmtekSearchItem] = field(default_factory=list)
+    error: Optional[ArmtekError] = None
+    duration_ms: Optional[int] = None
+
 
-@transaction.atomic
 def perform_single_search(
     query: str,
     *,
     user: Any,
     source: str = "armtek",
 ) -> Tuple[SearchRequest, list[Product]]:
-    search_request = SearchRequest.objects.create(
-        user=user,
-        source=source,
-        query_string=query,
-        status=SearchStatus.IN_PROGRESS,
+    search_request = _create_search_request(
+        [query], user=user, source=source, status=SearchStatus.IN_PROGRESS
     )
-    try:
-        products = _run_search_flow(
-            [query], user=user, source=source, search_request=search_request
-        )
-    except Exception:
-        search_request.status = SearchStatus.FAILED
-        search_request.save(update_fields=["status", "updated_at"])
-        raise
-
-    search_request.total_items = len(products)
-    search_request.status = SearchStatus.DONE
-    search_request.save(update_fields=["total_items", "status", "updated_at"])
+    products = _execute_search(search_request, _unfinished_items(search_request))
     return search_request, products
 
 
@@ -46,54 +101,488 @@ def perform_bulk_search(
     user: Any,
     source: str = "armtek",
 ) -> Tuple[SearchRequest, list[Product]]:
-    normalized = [q for q in queries if q]
-    query_string = "\n".join(normalized)
-    search_request = SearchRequest.objects.create(
-        user=user,
-        source=source,
-        query_string=query_string,
-        status=SearchStatus.IN_PROGRESS,
+    search_request = _create_search_request(
+        queries, user=user, source=source, status=SearchStatus.IN_PROGRESS
     )
-    try:
-        products = _run_search_flow(
-            normalized, user=user, source=source, search_request=search_request
+    products = _execute_search(search_request, _unfinished_items(search_request))
+    return search_request, products
+
+
+def stream_bulk_search(
+    queries: Iterable[str],
+    *,
+    user: Any,
+    source: str = "armtek",
+) -> Tuple[SearchRequest, Iterator[Tuple[SearchQueryItem, list[Product]]]]:
+    """Create a bulk request and return a lazy iterator over its finished queries.
+
+    Nothing is fetched until the iterator is consumed. Every query is committed
+    on its own before it is yielded, so a client can render rows as they come.
+    """
+    search_request = _create_search_request(
+        queries, user=user, source=source, status=SearchStatus.IN_PROGRESS
+    )
+    items = _unfinished_items(search_request)
+    return search_request, _iter_search(search_request, items, persist_batch=1)
+
+
+def enqueue_bulk_search(
+    queries: Iterable[str],
+    *,
+    user: Any,
+    source: str = "armtek",
+) -> SearchRequest:
+    """Store a bulk search for ``run_search_worker`` and return immediately."""
+    return _create_search_request(
+        queries, user=user, source=source, status=SearchStatus.PENDING
+    )
+
+
+def claim_next_search_request() -> Optional[SearchRequest]:
+    """Atomically move the oldest pending request to IN_PROGRESS and return it.
+
+    The conditional UPDATE makes the claim safe when several workers poll the same
+    queue: only one of them sees a non-zero row count for a given request.
+    """
+    candidates = (
+        SearchRequest.objects.filter(status=SearchStatus.PENDING)
+        .order_by("created_at", "id")
+        .values_list("id", flat=True)[:_CLAIM_BATCH]
+    )
+    for pk in candidates:
+        claimed = SearchRequest.objects.filter(
+            pk=pk, status=SearchStatus.PENDING
+        ).update(status=SearchStatus.IN_PROGRESS, updated_at=timezone.now())
+        if claimed:
+            return SearchRequest.objects.select_related("user").get(pk=pk)
+    return None
+
+
+def requeue_stale_searches() -> int:
+    """Hand IN_PROGRESS requests whose process died back to the worker queue.
+
+    A request is stale once it has not reported progress for
+    ``SEARCH_STALE_AFTER_MINUTES``. The worker then runs only the queries the
+    ledger does not mark as done.
+    """
+    minutes = int(getattr(settings, "SEARCH_STALE_AFTER_MINUTES", 15))
+    now = timezone.now()
+    return SearchRequest.objects.filter(
+        status=SearchStatus.IN_PROGRESS,
+        updated_at__lt=now - timedelta(minutes=minutes),
+    ).update(status=SearchStatus.PENDING, updated_at=now)
+
+
+def reopen_search(search_request: SearchRequest, *, queue: bool) -> bool:
+    """Make a PARTIAL or FAILED request runnable again for its unfinished queries.
+
+    With ``queue`` it goes back to PENDING for the worker, otherwise it is moved
+    to IN_PROGRESS for ``run_queued_search`` in the caller. Returns False when
+    the request is running, queued or already done.
+    """
+    status = SearchStatus.PENDING if queue else SearchStatus.IN_PROGRESS
+    reopened = SearchRequest.objects.filter(
+        pk=search_request.pk,
+        status__in=[SearchStatus.PARTIAL, SearchStatus.FAILED],
+    ).update(status=status, updated_at=timezone.now())
+    if reopened:
+        search_request.status = status
+    return bool(reopened)
+
+
+def run_queued_search(search_request: SearchRequest) -> list[Product]:
+    """Run the queries of a claimed request that are not done yet."""
+    return _execute_search(search_request, _unfinished_items(search_request))
+
+
+def _create_search_request(
+    queries: Iterable[str], *, user: Any, source: str, status: SearchStatus
+) -> SearchRequest:
+    normalized = [q for q in queries if q]
+    with transaction.atomic():
+        search_request = SearchRequest.objects.create(
+            user=user,
+            source=source,
+            query_string="\n".join(normalized),
+            status=status,
+            total_queries=len(normalized),
+        )
+        items = _create_items(search_request, normalized)
+        unique = len({lookup_key(item.pin, item.brand) for item in items})
+        if unique < len(items):
+            search_request.duplicate_queries = len(items) - unique
+            search_request.save(update_fields=["duplicate_queries"])
+    return search_request
+
+
+def _create_items(
+    search_request: SearchRequest, queries: list[str]
+) -> list[SearchQueryItem]:
+    items = []
+    for position, query in enumerate(queries):
+        pin, brand = normalize_lookup(*split_pin_and_brand(query))
+        items.append(
+            SearchQueryItem(
+                search_request=search_request,
+                position=position,
+                query=query,
+                pin=pin,
+                brand=brand,
+            )
+        )
+    return SearchQueryItem.objects.bulk_create(items)
+
+
+def _unfinished_items(search_request: SearchRequest) -> list[SearchQueryItem]:
+    if not search_request.items.exists():
+        # Requests stored before the ledger existed only have the query string.
+        queries = [q for q in search_request.query_string.splitlines() if q]
+        _create_items(search_request, queries)
+    return list(search_request.items.exclude(status=QueryItemStatus.DONE))
+
+
+def _execute_search(
+    search_request: SearchRequest, items: list[SearchQueryItem]
+) -> List[Product]:
+    products: list[Product] = []
+    for _item, found in _iter_search(search_request, items):
+        products.extend(found)
+    return products
+
+
+def _iter_search(
+    search_request: SearchRequest,
+    items: list[SearchQueryItem],
+    *,
+    persist_batch: Optional[int] = None,
+) -> Iterator[Tuple[SearchQueryItem, list[Product]]]:
+    """Run ledger items and yield (item, products) as each one is committed.
+
+    Failed queries do not stop the run: the request ends up DONE, PARTIAL when
+    some queries failed, or FAILED (re-raising the first error) when nothing
+    succeeded. If the consumer stops early the request stays IN_PROGRESS and is
+    picked up again by ``requeue_stale_searches``.
+    """
+    done = search_request.items.filter(status=QueryItemStatus.DONE)
+    processed = done.count()
+    total_items = done.aggregate(total=Sum("total_items"))["total"] or 0
+    failed = 0
+    first_error: Optional[ArmtekError] = None
+
+    def record_progress(batch: list[SearchQueryItem], found: int) -> None:
+        nonlocal processed, total_items, failed
+        processed += len(batch)
+        total_items += found
+        for item in batch:
+            if item.status == QueryItemStatus.FAILED:
+                failed += 1
+        search_request.processed_queries = processed
+        search_request.failed_queries = failed
+        search_request.total_items = total_items
+        search_request.save(
+            update_fields=[
+                "processed_queries",
+                "failed_queries",
+                "total_items",
+                "updated_at",
+            ]
         )
-    except Exception:
+
+    try:
+        for item, outcome, products in _iter_search_flow(
+            items,
+            user=search_request.user,
+            source=search_request.source,
+            search_request=search_request,
+            on_progress=record_progress,
+            persist_batch=persist_batch or _PERSIST_BATCH,
+        ):
+            if first_error is None and outcome.error is not None:
+                first_error = outcome.error
+            yield item, products
+    except Exception as exc:
         search_request.status = SearchStatus.FAILED
-        search_request.save(update_fields=["status", "updated_at"])
+        search_request.last_error = str(exc)
+        search_request.save(update_fields=["status", "last_error", "updated_at"])
         raise
 
-    search_request.total_items = len(products)
-    search_request.status = SearchStatus.DONE
-    search_request.save(update_fields=["total_items", "status", "updated_at"])
-    return search_request, products
+    if first_error is None:
+        search_request.status = SearchStatus.DONE
+        search_request.last_error = ""
+    elif processed > failed:
+        search_request.status = SearchStatus.PARTIAL
+        search_request.last_error = (
+            f"{failed} of {processed} queries failed: {first_error}"
+        )
+    else:
+        search_request.status = SearchStatus.FAILED
+        search_request.last_error = str(first_error)
+    search_request.save(update_fields=["status", "last_error", "updated_at"])
+    if search_request.status == SearchStatus.FAILED and first_error is not None:
+        raise first_error
 
 
-def _run_search_flow(
-    queries: Iterable[str],
+def _iter_search_flow(
+    items: list[SearchQueryItem],
     *,
     user: Any,
     source: str,
     search_request: SearchRequest,
-) -> List[Product]:
+    on_progress: Callable[[list[SearchQueryItem], int], None],
+    persist_batch: int = _PERSIST_BATCH,
+) -> Iterator[Tuple[SearchQueryItem, _Outcome, list[Product]]]:
     if source != "armtek":
-        return []
+        return
 
     credentials = resolve_armtek_credentials(user)
     service = ArmtekSearchService(credentials)
-    products: list[Product] = []
-    for query in queries:
-        pin, brand = split_pin_and_brand(query)
-        items = service.search(pin=pin, brand=brand)
-        products.extend(
-            upsert_products_from_search(
-                items,
+    # Lines that differ only in case, punctuation or brand alias share a lookup.
+    keys = [lookup_key(item.pin, item.brand) for item in items]
+    lookups: dict[Tuple[str, str], Tuple[str, str]] = {}
+    for key, item in zip(keys, items, strict=True):
+        lookups.setdefault(key, (item.pin, item.brand))
+    if len(lookups) < len(items):
+        metrics.increment("search.lookups_saved", len(items) - len(lookups))
+    pending: list[Tuple[SearchQueryItem, _Outcome]] = []
+    persisted_at = time.monotonic()
+
+    def persist() -> list[Tuple[SearchQueryItem, _Outcome, list[Product]]]:
+        now = timezone.now()
+        for item, outcome in pending:
+            item.attempts += 1
+            item.duration_ms = outcome.duration_ms
+            item.finished_at = item.updated_at = now
+            if outcome.error is None:
+                item.status = QueryItemStatus.DONE
+                item.total_items = len(outcome.items)
+                item.last_error = ""
+            else:
+                item.status = QueryItemStatus.FAILED
+                item.total_items = 0
+                item.last_error = str(outcome.error)
+        batch = [item for item, _outcome in pending]
+        with transaction.atomic():
+            products = upsert_products_from_search(
+                [found for _item, outcome in pending for found in outcome.items],
                 source=source,
                 user=user,
                 search_request=search_request,
             )
-        )
-    return products
+            SearchQueryItem.objects.bulk_update(batch, fields=_LEDGER_FIELDS)
+            on_progress(batch, len(products))
+        committed = []
+        offset = 0
+        for item, outcome in pending:
+            size = len(outcome.items)
+            committed.append((item, outcome, products[offset : offset + size]))
+            offset += size
+        pending.clear()
+        return committed
+
+    # Network calls happen outside of any transaction; only the writes are atomic.
+    # Unique lookups arrive in first-occurrence order, so walking the lines in
+    # order only ever needs the next one; repeats reuse the outcome kept aside.
+    fetched = _fetch_in_order(service, list(lookups.values()))
+    remaining = Counter(keys)
+    shared: dict[Tuple[str, str], _Outcome] = {}
+    try:
+        for item, key in zip(items, keys, strict=True):
+            outcome = shared.get(key)
+            if outcome is None:
+                outcome = next(fetched)
+            else:
+                outcome = _Outcome(outcome.items, error=outcome.error)
+            remaining[key] -= 1
+            if remaining[key]:
+                shared[key] = outcome
+            else:
+                shared.pop(key, None)
+            pending.append((item, outcome))
+            due = time.monotonic() - persisted_at >= _PERSIST_INTERVAL_SECONDS
+            if len(pending) >= persist_batch or due:
+                yield from persist()
+                persisted_at = time.monotonic()
+        if pending:
+            yield from persist()
+    finally:
+        fetched.close()
+
+
+def _max_concurrency() -> int:
+    return max(1, int(settings.ARMTEK_MAX_CONCURRENCY))
+
+
+class _WorkerConnections:
+    """Database connections of executor threads, closed once the pool is done.
+
+    Rate-limit and cache backends may open a connection in a worker thread. The
+    executor initializer shares each worker's connections with the owning
+    thread, which closes them after shutdown instead of after every lookup.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wrappers: list[BaseDatabaseWrapper] = []
+
+    def register(self) -> None:
+        wrappers = connections.all()
+        for wrapper in wrappers:
+            wrapper.inc_thread_sharing()
+        with self._lock:
+            self._wrappers.extend(wrappers)
+
+    def close(self) -> None:
+        with self._lock:
+            wrappers, self._wrappers = self._wrappers, []
+        for wrapper in wrappers:
+            try:
+                wrapper.close()
+            finally:
+                wrapper.dec_thread_sharing()
+
+
+def _fetch_in_order(
+    service: ArmtekSearchService,
+    lookups: list[Tuple[str, str]],
+) -> Generator[_Outcome, None, None]:
+    """Yield Armtek outcomes in input order while fetching them concurrently.
+
+    Only the network calls run in worker threads; results are handed back to the
+    calling thread, which keeps all product writes on its own connection. The
+    per-login limit on parallel requests is enforced by the Armtek throttle.
+    A failed lookup yields its error; missing credentials abort the whole run.
+    """
+    if getattr(settings, "ARMTEK_FANOUT_BACKEND", "threads") == "asyncio":
+        yield from _fetch_in_order_async(service, lookups)
+        return
+
+    workers = min(_max_concurrency(), len(lookups))
+    if workers <= 1:
+        for pin, brand in lookups:
+            yield _timed_lookup(service, pin=pin, brand=brand)
+        return
+
+    def fetch(lookup: Tuple[str, str]) -> _Outcome:
+        pin, brand = lookup
+        return _timed_lookup(service, pin=pin, brand=brand)
+
+    worker_connections = _WorkerConnections()
+    executor = ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix="armtek-search",
+        initializer=worker_connections.register,
+    )
+    try:
+        yield from executor.map(fetch, lookups)
+    finally:
+        # Drop queued lookups when the flow fails or the consumer stops early.
+        executor.shutdown(wait=True, cancel_futures=True)
+        worker_connections.close()
+
+
+def _fetch_in_order_async(
+    service: ArmtekSearchService,
+    lookups: list[Tuple[str, str]],
+) -> Iterator[_Outcome]:
+    async_service = AsyncArmtekSearchService(
+        service.credentials,
+        base_url=service.base_url,
+        timeout=service.timeout,
+        enable_stub=service.enable_stub,
+    )
+    # The whole bulk shares one event loop and one client (and its connections).
+    with async_service.runner(concurrency=_max_concurrency()) as runner:
+        scheduled: Deque[Tuple[Optional[str], _Outcome | Future[Any]]] = deque()
+        for pin, brand in lookups:
+            key = _cache_key(service, pin=pin, brand=brand)
+            cached = get_cached_search(key) if key else None
+            scheduled.append(
+                (
+                    key,
+                    (
+                        _Outcome(cached)
+                        if cached is not None
+                        else runner.submit(pin, brand)
+                    ),
+                )
+            )
+            if len(scheduled) >= _ASYNC_WINDOW:
+                yield _settle(*scheduled.popleft())
+        while scheduled:
+            yield _settle(*scheduled.popleft())
+
+
+def _settle(key: Optional[str], pending: _Outcome | Future[Any]) -> _Outcome:
+    if isinstance(pending, _Outcome):
+        return pending
+    # Per-lookup timings are not tracked here: lookups overlap on one loop.
+    try:
+        items = pending.result()
+    except ArmtekCredentialsError:
+        raise
+    except ArmtekError as exc:
+        return _stale_or_failed(key, exc)
+    if key is not None:
+        store_search(key, items)
+    return _Outcome(items)
+
+
+def _timed_lookup(service: ArmtekSearchService, *, pin: str, brand: str) -> _Outcome:
+    started = time.monotonic()
+    try:
+        items = _lookup(service, pin=pin, brand=brand)
+    except ArmtekCredentialsError:
+        raise
+    except ArmtekError as exc:
+        return _Outcome(error=exc, duration_ms=_elapsed_ms(started))
+    return _Outcome(items, duration_ms=_elapsed_ms(started))
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+def _lookup(
+    service: ArmtekSearchService,
+    *,
+    pin: str,
+    brand: str,
+) -> list[ArmtekSearchItem]:
+    """Serve a lookup from the shared result cache or fetch it from Armtek."""
+    key = _cache_key(service, pin=pin, brand=brand)
+    if key is not None:
+        cached = get_cached_search(key)
+        if cached is not None:
+            return cached
+    try:
+        items = service.search(pin=pin, brand=brand)
+    except ArmtekError as exc:
+        return _serve_stale(key, exc)
+    if key is not None:
+        store_search(key, items)
+    return items
+
+
+def _stale_or_failed(key: Optional[str], exc: ArmtekError) -> _Outcome:
+    try:
+        return _Outcome(_serve_stale(key, exc))
+    except ArmtekError:
+        return _Outcome(error=exc)
+
+
+def _serve_stale(key: Optional[str], exc: ArmtekError) -> list[ArmtekSearchItem]:
+    """Fall back to an expired cache entry when Armtek is down, else re-raise."""
+    stale = get_stale_search(key) if key is not None and is_outage(exc) else None
+    if stale is None:
+        raise exc
+    metrics.increment("search_cache.stale")
+    return stale
+
+
+def _cache_key(service: ArmtekSearchService, *, pin: str, brand: str) -> Optional[str]:
+    if not getattr(settings, "ARMTEK_SEARCH_CACHE_ENABLED", True):
+        return None
+    return service.cache_key(pin=pin, brand=brand)
 
 
 def parse_bulk_payload(data: dict[str, Any]) -> List[str]:
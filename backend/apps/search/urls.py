@@ -1,9 +1,25 @@
 from django.urls import path
 
-from backend.apps.search.views import BulkSearchView, SearchDetailView, SearchView
+from backend.apps.search.views import (
+    BulkSearchStreamView,
+    BulkSearchView,
+    SearchDetailView,
+    SearchExportView,
+    SearchQueriesView,
+    SearchResumeView,
+    SearchView,
+)
 
 urlpatterns = [
     path("", SearchView.as_view(), name="search"),
     path("bulk", BulkSearchView.as_view(), name="search-bulk"),
+    path("bulk/stream", BulkSearchStreamView.as_view(), name="search-bulk-stream"),
     path("<int:pk>", SearchDetailView.as_view(), name="search-detail"),
+    path(
+        "<int:pk>/export.<str:format>",
+        SearchExportView.as_view(),
+        name="search-export",
+    ),
+    path("<int:pk>/queries", SearchQueriesView.as_view(), name="search-queries"),
+    path("<int:pk>/resume", SearchResumeView.as_view(), name="search-resume"),
 ]
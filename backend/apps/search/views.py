@@ -1,29 +1,54 @@
 from __future__ import annotations
 
-from typing import Any, cast
+from typing import Any, Iterator, Mapping, Tuple, cast
 
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from backend.apps.pagination import (
+    CreatedCursorPagination,
+    InsertionCursorPagination,
+)
+from backend.apps.products.export import export_response
 from backend.apps.products.models import Product
-from backend.apps.products.serializers import ProductSerializer
+from backend.apps.products.renderers import CSVRenderer, TableRenderer, XLSXRenderer
+from backend.apps.products.rows import (
+    iter_product_rows,
+    product_rows,
+    product_values,
+    serialize_product_list,
+)
 from backend.apps.providers.armtek.exceptions import (
     ArmtekCredentialsError,
     ArmtekError,
 )
-from backend.apps.search.models import SearchRequest
+from backend.apps.search.models import SearchQueryItem, SearchRequest
+from backend.apps.search.renderers import (
+    EventStreamRenderer,
+    NDJSONRenderer,
+    StreamRenderer,
+)
 from backend.apps.search.serializers import (
     BulkSearchSerializer,
+    ResumeSearchSerializer,
     SearchInputSerializer,
+    SearchQueryItemSerializer,
     SearchRequestSerializer,
 )
 from backend.apps.search.services import (
+    enqueue_bulk_search,
     parse_bulk_payload,
     perform_bulk_search,
     perform_single_search,
+    reopen_search,
+    run_queued_search,
+    stream_bulk_search,
 )
 
 
@@ -33,8 +58,13 @@ class SearchView(APIView):
     def get(self, request: Request, *args: object, **kwargs: object) -> Response:
         assert request.user.is_authenticated
         user = cast(Any, request.user)
-        history = SearchRequest.objects.filter(user=user)
-        return Response(SearchRequestSerializer(history, many=True).data)
+        paginator = CreatedCursorPagination()
+        page = paginator.paginate_queryset(
+            SearchRequest.objects.filter(user=user), request, view=self
+        )
+        return paginator.get_paginated_response(
+            SearchRequestSerializer(page, many=True).data
+        )
 
     def post(self, request: Request, *args: object, **kwargs: object) -> Response:
         assert request.user.is_authenticated
@@ -55,7 +85,7 @@ class SearchView(APIView):
         return Response(
             {
                 "request": SearchRequestSerializer(search_request).data,
-                "products": ProductSerializer(products, many=True).data,
+                "products": serialize_product_list(products),
             },
             status=status.HTTP_201_CREATED,
         )
@@ -70,11 +100,18 @@ class BulkSearchView(APIView):
         serializer = BulkSearchSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         queries = parse_bulk_payload(serializer.validated_data)
+        source = serializer.validated_data.get("source", "armtek")
+        if serializer.validated_data.get("mode") == "async":
+            queued = enqueue_bulk_search(queries, user=user, source=source)
+            return Response(
+                {"request": SearchRequestSerializer(queued).data},
+                status=status.HTTP_202_ACCEPTED,
+            )
         try:
             search_request, products = perform_bulk_search(
                 queries,
                 user=user,
-                source=serializer.validated_data.get("source", "armtek"),
+                source=source,
             )
         except ArmtekCredentialsError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
@@ -84,18 +121,90 @@ class BulkSearchView(APIView):
         return Response(
             {
                 "request": SearchRequestSerializer(search_request).data,
-                "products": ProductSerializer(products, many=True).data,
+                "products": serialize_product_list(products),
             },
             status=status.HTTP_201_CREATED,
         )
 
 
+class BulkSearchStreamView(APIView):
+    """Bulk search that streams each query's products as soon as they are stored.
+
+    Emits NDJSON by default or Server-Sent Events for ``Accept: text/event-stream``:
+    one ``query`` event per query in input order, then ``summary`` (or ``error``).
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, EventStreamRenderer]
+
+    def post(
+        self, request: Request, *args: object, **kwargs: object
+    ) -> StreamingHttpResponse:
+        assert request.user.is_authenticated
+        user = cast(Any, request.user)
+        serializer = BulkSearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queries = parse_bulk_payload(serializer.validated_data)
+        search_request, results = stream_bulk_search(
+            queries,
+            user=user,
+            source=serializer.validated_data.get("source", "armtek"),
+        )
+        renderer = cast(StreamRenderer, request.accepted_renderer)
+        response = StreamingHttpResponse(
+            (
+                renderer.render_event(event, data)
+                for event, data in self._events(search_request, results)
+            ),
+            content_type=f"{renderer.media_type}; charset=utf-8",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # let nginx pass events through
+        return response
+
+    @staticmethod
+    def _events(
+        search_request: SearchRequest,
+        results: Iterator[Tuple[SearchQueryItem, list[Product]]],
+    ) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        try:
+            for item, products in results:
+                yield "query", {
+                    "index": item.position,
+                    "query": item.query,
+                    "status": item.status,
+                    "error": item.last_error,
+                    "products": serialize_product_list(products),
+                }
+        except ArmtekError as exc:
+            yield "error", {
+                "detail": str(exc),
+                "request": SearchRequestSerializer(search_request).data,
+            }
+            return
+        yield "summary", {"request": SearchRequestSerializer(search_request).data}
+
+
 class SearchDetailView(APIView):
+    """A search request with its products and their total ``count``.
+
+    JSON responses carry one page of products in insertion order, with ``next``
+    linking the following page. ``Accept: application/x-ndjson`` or
+    ``text/event-stream`` streams every product instead: a ``request`` event,
+    ``products`` batches, then ``summary``.
+    """
+
     permission_classes = [IsAuthenticated]
+    renderer_classes = [
+        JSONRenderer,
+        BrowsableAPIRenderer,
+        NDJSONRenderer,
+        EventStreamRenderer,
+    ]
 
     def get(
         self, request: Request, pk: int, *args: object, **kwargs: object
-    ) -> Response:
+    ) -> Response | StreamingHttpResponse:
         assert request.user.is_authenticated
         user = cast(Any, request.user)
         try:
@@ -107,9 +216,139 @@ class SearchDetailView(APIView):
             )
 
         products = Product.objects.filter(search_request=search_request)
+        # Pages and streams both read products by id, i.e. in insertion order, so
+        # a running async job shows rows in query order.
+        if isinstance(request.accepted_renderer, StreamRenderer):
+            return self._stream(request.accepted_renderer, search_request, products)
+        paginator = InsertionCursorPagination()
+        page = paginator.paginate_queryset(product_values(products), request, view=self)
+        return Response(
+            {
+                "request": SearchRequestSerializer(search_request).data,
+                "count": products.count(),
+                "next": paginator.get_next_link(),
+                "products": product_rows(page),
+            }
+        )
+
+    def _stream(
+        self,
+        renderer: StreamRenderer,
+        search_request: SearchRequest,
+        products: QuerySet[Product],
+    ) -> StreamingHttpResponse:
+        response = StreamingHttpResponse(
+            (
+                renderer.render_event(event, data)
+                for event, data in self._events(search_request, products)
+            ),
+            content_type=f"{renderer.media_type}; charset=utf-8",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def _events(
+        search_request: SearchRequest, products: QuerySet[Product]
+    ) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        yield "request", {
+            "request": SearchRequestSerializer(search_request).data,
+            "count": products.count(),
+        }
+        sent = 0
+        for rows in iter_product_rows(products):
+            sent += len(rows)
+            yield "products", {"products": rows}
+        yield "summary", {"count": sent}
+
+
+class SearchExportView(APIView):
+    """Products of a search request as a CSV or XLSX download, in query order."""
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [CSVRenderer, XLSXRenderer]
+
+    def get(
+        self, request: Request, pk: int, *args: object, **kwargs: object
+    ) -> Response | StreamingHttpResponse:
+        assert request.user.is_authenticated
+        user = cast(Any, request.user)
+        try:
+            search_request = SearchRequest.objects.get(pk=pk, user=user)
+        except SearchRequest.DoesNotExist:
+            return Response(
+                {"detail": "Search request not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return export_response(
+            cast(TableRenderer, request.accepted_renderer),
+            Product.objects.filter(search_request=search_request),
+            f"search-{search_request.pk}",
+        )
+
+
+class SearchQueriesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(
+        self, request: Request, pk: int, *args: object, **kwargs: object
+    ) -> Response:
+        assert request.user.is_authenticated
+        user = cast(Any, request.user)
+        if not SearchRequest.objects.filter(pk=pk, user=user).exists():
+            return Response(
+                {"detail": "Search request not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        items = SearchQueryItem.objects.filter(search_request_id=pk)
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            items = items.filter(status=status_filter)
+        return Response(SearchQueryItemSerializer(items, many=True).data)
+
+
+class SearchResumeView(APIView):
+    """Re-run only the failed or unfinished queries of a search request."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(
+        self, request: Request, pk: int, *args: object, **kwargs: object
+    ) -> Response:
+        assert request.user.is_authenticated
+        user = cast(Any, request.user)
+        serializer = ResumeSearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            search_request = SearchRequest.objects.get(pk=pk, user=user)
+        except SearchRequest.DoesNotExist:
+            return Response(
+                {"detail": "Search request not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        queue = serializer.validated_data["mode"] == "async"
+        if not reopen_search(search_request, queue=queue):
+            return Response(
+                {"detail": "Only partial or failed searches can be resumed"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if queue:
+            return Response(
+                {"request": SearchRequestSerializer(search_request).data},
+                status=status.HTTP_202_ACCEPTED,
+            )
+        try:
+            products = run_queued_search(search_request)
+        except ArmtekCredentialsError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except ArmtekError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY)
+
         return Response(
             {
                 "request": SearchRequestSerializer(search_request).data,
-                "products": ProductSerializer(products, many=True).data,
+                "products": serialize_product_list(products),
             }
         )
@@ -83,6 +83,10 @@ DATABASES = {
     )
 }
 
+# Local memory by default; point CACHE_URL at redis/memcached/db to share the
+# Armtek search cache between worker processes.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": (
@@ -140,3 +144,21 @@ CSRF_TRUSTED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS", default=[])
 PROVIDER_SECRET_KEY = env("PROVIDER_SECRET_KEY")
 
 SEARCH_CACHE_TTL_MINUTES = env.int("SEARCH_CACHE_TTL_MINUTES", default=60)
+# In-progress searches without progress for this long are handed back to the worker
+SEARCH_STALE_AFTER_MINUTES = env.int("SEARCH_STALE_AFTER_MINUTES", default=15)
+# Brand spellings treated as one Armtek brand in bulk searches, e.g.
+# SEARCH_BRAND_ALIASES="MB=MERCEDES-BENZ,VW=VAG"
+SEARCH_BRAND_ALIASES = env.dict("SEARCH_BRAND_ALIASES", default={})
+# Longest wait of a details changes long-poll before it returns empty, how often
+# a waiting request reads the user's change marker from the cache, and how often
+# it re-reads the database anyway (for caches not shared between processes)
+DETAILS_CHANGES_WAIT_SECONDS = env.int("DETAILS_CHANGES_WAIT_SECONDS", default=25)
+DETAILS_CHANGES_POLL_SECONDS = env.float("DETAILS_CHANGES_POLL_SECONDS", default=1.0)
+DETAILS_CHANGES_RECHECK_SECONDS = env.float(
+    "DETAILS_CHANGES_RECHECK_SECONDS", default=10.0
+)
+# Longest time between stamping a details change and committing it; changes this
+# recent are served again once it has passed, in case an earlier one was late
+DETAILS_CHANGES_SETTLE_SECONDS = env.float(
+    "DETAILS_CHANGES_SETTLE_SECONDS", default=10.0
+)
@@ -17,3 +17,46 @@ ARMTEK_ENABLE_STUB = env.bool("ARMTEK_ENABLE_STUB", default=False)
 ARMTEK_HTML_BASE_URL = env(
     "ARMTEK_HTML_BASE_URL", default="https://etp.armtek.ru/artinfo/index"
 )
+# Upper bound of parallel Armtek lookups per account (1 disables the fan-out)
+ARMTEK_MAX_CONCURRENCY = env.int("ARMTEK_MAX_CONCURRENCY", default=4)
+# How bulk lookups are fanned out: "threads" or "asyncio" (one event loop)
+ARMTEK_FANOUT_BACKEND = env("ARMTEK_FANOUT_BACKEND", default="threads")
+# Cross-request cache of Armtek search results (TTL: SEARCH_CACHE_TTL_MINUTES)
+ARMTEK_SEARCH_CACHE_ENABLED = env.bool("ARMTEK_SEARCH_CACHE_ENABLED", default=True)
+ARMTEK_SEARCH_CACHE_ALIAS = env("ARMTEK_SEARCH_CACHE_ALIAS", default="default")
+# Coalesce identical in-flight lookups across processes via a cache.add() lock
+# (needs a shared CACHE_URL: redis, memcached or the database cache table)
+ARMTEK_SINGLEFLIGHT_SHARED = env.bool("ARMTEK_SINGLEFLIGHT_SHARED", default=False)
+# Shared keep-alive connection pool used for every Armtek call in a process
+ARMTEK_POOL_SIZE = env.int("ARMTEK_POOL_SIZE", default=20)
+ARMTEK_POOL_KEEPALIVE_SECONDS = env.int("ARMTEK_POOL_KEEPALIVE_SECONDS", default=30)
+ARMTEK_HTTP2 = env.bool("ARMTEK_HTTP2", default=False)
+# Token bucket per Armtek login (0 disables); "database" shares it between
+# processes, "local" keeps it in memory of each process
+ARMTEK_RATE_LIMIT_PER_SECOND = env.float("ARMTEK_RATE_LIMIT_PER_SECOND", default=0)
+ARMTEK_RATE_LIMIT_BURST = env.int("ARMTEK_RATE_LIMIT_BURST", default=10)
+ARMTEK_RATE_LIMIT_BACKEND = env("ARMTEK_RATE_LIMIT_BACKEND", default="database")
+# Retries of idempotent search calls on timeouts, 429 and 5xx (exponential
+# backoff with full jitter, in seconds); 1 attempt disables retries
+ARMTEK_RETRY_ATTEMPTS = env.int("ARMTEK_RETRY_ATTEMPTS", default=3)
+ARMTEK_RETRY_BASE_DELAY = env.float("ARMTEK_RETRY_BASE_DELAY", default=0.2)
+ARMTEK_RETRY_MAX_DELAY = env.float("ARMTEK_RETRY_MAX_DELAY", default=2.0)
+# Circuit breaker per Armtek base URL: opens after N failed calls in a row and
+# lets one probe through after the reset timeout (0 failures disables it)
+ARMTEK_BREAKER_FAILURE_THRESHOLD = env.int(
+    "ARMTEK_BREAKER_FAILURE_THRESHOLD", default=5
+)
+ARMTEK_BREAKER_RESET_SECONDS = env.float("ARMTEK_BREAKER_RESET_SECONDS", default=30)
+# How long expired search results stay cached to be served while the breaker is open
+ARMTEK_STALE_CACHE_MINUTES = env.int("ARMTEK_STALE_CACHE_MINUTES", default=24 * 60)
+# In-process cache of decrypted Armtek credentials per user (seconds, entries);
+# writes in the same process invalidate it, 0 disables it
+ARMTEK_CREDENTIALS_CACHE_SECONDS = env.int(
+    "ARMTEK_CREDENTIALS_CACHE_SECONDS", default=60
+)
+ARMTEK_CREDENTIALS_CACHE_SIZE = env.int("ARMTEK_CREDENTIALS_CACHE_SIZE", default=256)
+# Record/replay Armtek exchanges to a JSON cassette instead of (record: in
+# addition to) the network; replay latency = recorded latency * scale (0: none)
+ARMTEK_CASSETTE = env("ARMTEK_CASSETTE", default="")
+ARMTEK_CASSETTE_MODE = env("ARMTEK_CASSETTE_MODE", default="replay")
+ARMTEK_CASSETTE_LATENCY_SCALE = env.float("ARMTEK_CASSETTE_LATENCY_SCALE", default=0.0)
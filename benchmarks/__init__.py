@@ -0,0 +1 @@
+"""Micro-benchmarks of backend hot paths (``python -m benchmarks.<name>``)."""
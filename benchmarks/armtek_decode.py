@@ -0,0 +1,125 @@
+"""Decoding of ``ws_search/search`` bodies: bytes to search items.
+
+``keywords`` is the field-by-field decoder the client used before the
+``SEARCH_FIELDS`` table, kept here as the baseline::
+
+    python -m benchmarks.armtek_decode --sizes 10 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from functools import partial
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+from benchmarks.harness import measure, print_rows
+from benchmarks.payloads import search_response
+
+from backend.apps.providers.armtek import decoding
+from backend.apps.providers.armtek.client import parse_search_items, unwrap_resp
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+
+
+def _float(value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _str(value: Any) -> Any:
+    if value is None:
+        return None
+    value_str = str(value).strip()
+    return value_str or None
+
+
+def keyword_decode(body: bytes) -> List[ArmtekSearchItem]:
+    array = unwrap_resp(json.loads(body))["ARRAY"]
+    clean, to_int = _str, _int
+    return [
+        ArmtekSearchItem(
+            pin=str(entry.get("PIN", "")),
+            brand=str(entry.get("BRAND", "")),
+            name=str(entry.get("NAME", "")),
+            artid=str(entry.get("ARTID", "")),
+            is_analog=(
+                bool(to_int(entry.get("ANALOG")))
+                if entry.get("ANALOG") is not None
+                else None
+            ),
+            price=_float(entry.get("PRICE")),
+            currency=clean(entry.get("WAERS")),
+            warehouse_partner=clean(entry.get("PARNR")),
+            warehouse_code=clean(entry.get("KEYZAK")),
+            available_quantity=to_int(entry.get("RVALUE")),
+            return_days=to_int(entry.get("RETDAYS")),
+            multiplicity=to_int(entry.get("RDPRF")),
+            minimum_order=to_int(entry.get("MINBM")),
+            supply_probability=_float(entry.get("VENSEL") or entry.get("VENSL")),
+            delivery_date=clean(entry.get("DLVDT")),
+            warranty_date=clean(entry.get("WRNTDT")),
+            import_flag=clean(entry.get("TYPEB")),
+            special_flag=clean(entry.get("DSPEC")),
+            max_retail_price=_float(entry.get("RCOST")),
+            markup=_float(entry.get("MRKBY")),
+            note=clean(entry.get("PNOTE")),
+            importer_markup=_float(entry.get("IMP_ADD")),
+            producer_price=_float(entry.get("SELLP")),
+            markup_rest_rub=_float(entry.get("REST_ADD")),
+            markup_rest_percent=_float(entry.get("REST_ADD_P")),
+        )
+        for entry in array
+    ]
+
+
+def table_decode(
+    body: bytes, *, loads: Callable[[bytes], Any]
+) -> List[ArmtekSearchItem]:
+    payload: Mapping[str, Any] = loads(body)
+    return parse_search_items(payload, pin="", brand=None)
+
+
+def variants() -> Dict[str, Callable[[bytes], List[ArmtekSearchItem]]]:
+    found: Dict[str, Callable[[bytes], List[ArmtekSearchItem]]] = {
+        "keywords+json": keyword_decode,
+        "table+json": partial(table_decode, loads=json.loads),
+    }
+    if decoding.loads is not json.loads:
+        found["table+orjson"] = partial(table_decode, loads=decoding.loads)
+    return found
+
+
+def run(sizes: Sequence[int], *, repeat: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for size in sizes:
+        body = json.dumps(search_response(size)).encode()
+        for name, decode in variants().items():
+            result = measure(partial(decode, body), repeat=repeat)
+            rows.append({"size": size, "decoder": name, **result})
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Armtek search response decoding")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args(argv)
+    rows = run(args.sizes, repeat=args.repeat)
+    print_rows(rows, ["size", "decoder", "us", "peak_kib"])
+
+
+if __name__ == "__main__":
+    main()
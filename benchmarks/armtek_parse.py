@@ -0,0 +1,47 @@
+"""Time and allocations of parsing ``ws_search/search`` responses.
+
+Compares the parse modes of ``parse_search_items`` on synthetic responses::
+
+    python -m benchmarks.armtek_parse --sizes 10 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+from functools import partial
+from typing import Any, Dict, List, Mapping, Sequence
+
+from benchmarks.harness import measure, print_rows
+from benchmarks.payloads import search_response
+
+from backend.apps.providers.armtek.client import parse_search_items
+
+MODES: Dict[str, Dict[str, bool]] = {
+    "all+raw": {"keep_raw": True},
+    "all": {},
+    "first_non_analog": {"first_non_analog": True},
+}
+
+
+def run(sizes: Sequence[int], *, repeat: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for size in sizes:
+        payload: Mapping[str, Any] = search_response(size)
+        for mode, options in MODES.items():
+            parse = partial(
+                parse_search_items, payload, pin="OC90", brand="KNECHT", **options
+            )
+            rows.append({"size": size, "mode": mode, **measure(parse, repeat=repeat)})
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Armtek search response parsing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+    print_rows(run(args.sizes, repeat=args.repeat), ["size", "mode", "us", "peak_kib"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Sequence
+
+
+def measure(
+    func: Callable[[], Any], *, repeat: int, rounds: int = 5
+) -> Dict[str, float]:
+    """Best time per call over ``rounds`` and peak traced memory of one call.
+
+    The minimum is the least noisy estimate on a shared machine; ``timeit``
+    also keeps the garbage collector out of the timed loops.
+    """
+    func()
+    timer = timeit.Timer(func)
+    best = min(timer.repeat(repeat=rounds, number=max(1, repeat // rounds)))
+    tracemalloc.start()
+    try:
+        result = func()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"us": best / max(1, repeat // rounds) * 1e6, "peak_kib": peak / 1024}
+
+
+def print_rows(rows: List[Dict[str, Any]], columns: Sequence[str]) -> None:
+    print(" ".join(f"{column:>18}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            cells.append(
+                f"{value:>18.1f}" if isinstance(value, float) else f"{value!s:>18}"
+            )
+        print(" ".join(cells))
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+
+def search_entry(
+    index: int, *, pin: str = "OC90", analog: bool = False
+) -> Dict[str, Any]:
+    """One ``RESP.ARRAY`` entry shaped like a real Armtek warehouse offer."""
+    return {
+        "PIN": pin,
+        "BRAND": "KNECHT",
+        "NAME": f"Oil filter {pin} offer {index}",
+        "ARTID": f"{1000000 + index}",
+        "PARNR": f"{40000 + index % 50}",
+        "KEYZAK": f"MOV{index % 9:04d}",
+        "RVALUE": str(index % 120 + 1),
+        "RETDAYS": "14",
+        "RDPRF": "1",
+        "MINBM": "1",
+        "VENSL": "95.50",
+        "PRICE": f"{250 + index % 300}.40",
+        "WAERS": "RUB",
+        "DLVDT": "20260105120000",
+        "WRNTDT": "",
+        "ANALOG": "1" if analog else "",
+        "TYPEB": "0",
+        "DSPEC": "",
+        "RCOST": "0.00",
+        "MRKBY": "12.5",
+        "PNOTE": "",
+        "IMP_ADD": "0.00",
+        "SELLP": "0.00",
+        "REST_ADD": "0.00",
+        "REST_ADD_P": "0.00",
+    }
+
+
+def search_response(size: int, *, analog_share: float = 0.1) -> Dict[str, Any]:
+    """A ``ws_search/search`` envelope with ``size`` offers.
+
+    The first ``analog_share`` of the offers are analogs, as when Armtek lists
+    cross-references before the requested article.
+    """
+    analogs = int(size * analog_share)
+    array: List[Dict[str, Any]] = [
+        search_entry(index, analog=index < analogs) for index in range(size)
+    ]
+    return {"STATUS": 200, "MESSAGES": [], "RESP": {"ARRAY": array}}
@@ -0,0 +1,340 @@
+"""Benchmark suite of the search, upsert, serialization and details ingest paths.
+
+Every case runs against a throwaway test database; bulk searches go over real
+HTTP to the local Armtek stand-in with zero latency, so the numbers are the
+backend's own cost. Results are stored as named baselines and compared::
+
+    python -m benchmarks.suite --save main
+    python -m benchmarks.suite --compare main --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.harness import measure, print_rows
+from benchmarks.payloads import search_response
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+SEARCH_SIZES = (10, 100, 1000)
+UPSERT_SIZE = 500
+SERIALIZE_SIZES = (20, 500, 5000)
+INGEST_BATCH = 50
+EXPORT_SIZE = 5000
+BENCH_SETTINGS: Dict[str, Any] = {
+    "ARMTEK_ENABLE_STUB": False,
+    "ARMTEK_SEARCH_CACHE_ENABLED": False,
+    "ARMTEK_CASSETTE": "",
+    "ARMTEK_RATE_LIMIT_PER_SECOND": 0,
+    "ARMTEK_RETRY_ATTEMPTS": 1,
+}
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    func: Callable[[], Any]
+    repeat: int
+    rounds: int = 5
+
+
+@contextmanager
+def bench_environment() -> Iterator[Any]:
+    """Django on a fresh test database, Armtek pointed at a local stand-in."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.elizabeth.settings.dev")
+    import django
+
+    django.setup()
+    from django.db import connection
+    from django.test.utils import (
+        override_settings,
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    from backend.apps.accounts.models import User
+    from backend.apps.providers.armtek.pool import close_http_clients
+    from backend.apps.providers.armtek.standin import StandinProfile, start_standin
+    from backend.apps.providers.services import save_provider_account
+
+    # Request logging of httpx and the stand-in would dominate the timings.
+    logging.disable(logging.INFO)
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    server = start_standin(StandinProfile(latency_ms=0, offers=(5, 30), seed=1))
+    try:
+        with override_settings(ARMTEK_BASE_URL=server.base_url, **BENCH_SETTINGS):
+            user = User.objects.create_user(
+                email="bench@example.com",
+                password="Sup3rStrongP@ssw0rd!",
+                phone_number="+79000009999",
+            )
+            save_provider_account(
+                user=user,
+                provider_name="armtek",
+                login="login",
+                password="secret",
+                vkorg="4000",
+                kunnr_rg="100",
+            )
+            yield user
+    finally:
+        close_http_clients()
+        server.shutdown()
+        server.server_close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        logging.disable(logging.NOTSET)
+
+
+def search_cases(user: Any) -> Iterator[Case]:
+    from backend.apps.search.services import perform_bulk_search
+
+    def bulk(queries: List[str]) -> None:
+        perform_bulk_search(queries, user=user)
+
+    for size in SEARCH_SIZES:
+        queries = [f"OC{index:05d}_KNECHT" for index in range(size)]
+        yield Case(
+            f"search.bulk[{size}]",
+            partial(bulk, queries),
+            repeat=max(3, 300 // size),
+            rounds=3,
+        )
+
+
+def upsert_cases(user: Any) -> Iterator[Case]:
+    from backend.apps.products.services import upsert_products_from_search
+    from backend.apps.providers.armtek.client import parse_search_items
+    from backend.apps.search.models import SearchRequest
+
+    items = parse_search_items(search_response(UPSERT_SIZE), pin="", brand=None)
+
+    def fresh() -> None:
+        search_request = SearchRequest.objects.create(user=user, source="armtek")
+        upsert_products_from_search(items, user=user, search_request=search_request)
+
+    existing_request = SearchRequest.objects.create(user=user, source="armtek")
+    existing = partial(
+        upsert_products_from_search,
+        items,
+        user=user,
+        search_request=existing_request,
+    )
+    existing()
+    yield Case(f"upsert.fresh[{UPSERT_SIZE}]", fresh, repeat=10)
+    yield Case(f"upsert.existing[{UPSERT_SIZE}]", existing, repeat=10)
+
+
+def _products_request(user: Any, size: int) -> Any:
+    from backend.apps.products.services import upsert_products_from_search
+    from backend.apps.providers.armtek.client import parse_search_items
+    from backend.apps.search.models import SearchRequest
+
+    search_request = SearchRequest.objects.create(user=user, source="armtek")
+    items = parse_search_items(search_response(size), pin="", brand=None)
+    upsert_products_from_search(items, user=user, search_request=search_request)
+    return search_request
+
+
+def serialize_cases(user: Any) -> Iterator[Case]:
+    from backend.apps.products.models import Product
+    from backend.apps.products.rows import serialize_products
+    from backend.apps.products.serializers import ProductSerializer
+
+    search_request = _products_request(user, max(SERIALIZE_SIZES))
+    # Same query as the search detail view, limited to ``size`` rows.
+    products = Product.objects.filter(search_request=search_request).order_by("id")
+
+    def serialize(size: int) -> Any:
+        return ProductSerializer(products[:size], many=True).data
+
+    def rows(size: int) -> Any:
+        return serialize_products(products[:size])
+
+    for size in SERIALIZE_SIZES:
+        for name, func in (("products", serialize), ("rows", rows)):
+            yield Case(
+                f"serialize.{name}[{size}]",
+                partial(func, size),
+                repeat=max(3, 2000 // size),
+                rounds=3,
+            )
+
+
+def export_cases(user: Any) -> Iterator[Case]:
+    from backend.apps.products.export import EXPORT_HEADER, export_rows
+    from backend.apps.products.models import Product
+    from backend.apps.products.renderers import CSVRenderer, XLSXRenderer
+
+    search_request = _products_request(user, EXPORT_SIZE)
+    products = Product.objects.filter(search_request=search_request)
+
+    def export(renderer: Any) -> int:
+        # Consumed chunk by chunk, as the streaming response is.
+        chunks = renderer.stream(EXPORT_HEADER, export_rows(products))
+        return sum(len(chunk) for chunk in chunks)
+
+    for renderer in (CSVRenderer(), XLSXRenderer()):
+        yield Case(
+            f"export.{renderer.format}[{EXPORT_SIZE}]",
+            partial(export, renderer),
+            repeat=1,
+            rounds=3,
+        )
+
+
+def ingest_cases(user: Any) -> Iterator[Case]:
+    from django.test import Client
+
+    from backend.apps.products.models import Product
+
+    search_request = _products_request(user, INGEST_BATCH)
+    targets = [
+        (product.pk, str(product.details_request.request_id))
+        for product in Product.objects.filter(search_request=search_request)
+        .select_related("details_request")
+        .order_by("id")
+    ]
+    client = Client()
+    payload = {"weight": "0,45 кг", "length": "120", "width": "80", "height": "60"}
+
+    def ingest() -> None:
+        for pk, token in targets:
+            response = client.post(
+                f"/api/v1/products/{pk}/details",
+                payload,
+                content_type="application/json",
+                HTTP_X_DETAILS_TOKEN=token,
+            )
+            if response.status_code >= 300:
+                raise RuntimeError(f"details ingest failed: {response.status_code}")
+
+    yield Case(f"ingest.details[{INGEST_BATCH}]", ingest, repeat=10)
+
+
+GROUPS: Dict[str, Callable[[Any], Iterator[Case]]] = {
+    "search": search_cases,
+    "upsert": upsert_cases,
+    "serialize": serialize_cases,
+    "ingest": ingest_cases,
+    "export": export_cases,
+}
+
+
+def run(
+    groups: Sequence[str], *, match: Optional[str] = None
+) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with bench_environment() as user:
+        for group in groups:
+            for case in GROUPS[group](user):
+                if match and match not in case.name:
+                    continue
+                results[case.name] = measure(
+                    case.func, repeat=case.repeat, rounds=case.rounds
+                )
+                print(f"{case.name:<28} {results[case.name]['us'] / 1000:>10.2f} ms")
+    return results
+
+
+def baseline_path(name: str) -> Path:
+    return BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, results: Dict[str, Dict[str, float]]) -> Path:
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cases": results,
+    }
+    path.write_text(json.dumps(payload, indent=1, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def load_baseline(name: str) -> Dict[str, Dict[str, float]]:
+    data = json.loads(baseline_path(name).read_text(encoding="utf-8"))
+    cases: Dict[str, Dict[str, float]] = data["cases"]
+    return cases
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    *,
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    """One report row per case; ``verdict`` flags changes beyond ``threshold``."""
+    rows: List[Dict[str, Any]] = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append(
+                {
+                    "case": name,
+                    "base_ms": "-",
+                    "now_ms": result["us"] / 1000,
+                    "change_%": "-",
+                    "verdict": "new",
+                }
+            )
+            continue
+        change = result["us"] / before["us"] - 1
+        verdict = "ok"
+        if change > threshold:
+            verdict = "REGRESSION"
+        elif change < -threshold:
+            verdict = "faster"
+        rows.append(
+            {
+                "case": name,
+                "base_ms": before["us"] / 1000,
+                "now_ms": result["us"] / 1000,
+                "change_%": change * 100,
+                "verdict": verdict,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", nargs="+", choices=list(GROUPS), default=GROUPS)
+    parser.add_argument("-k", dest="match", help="only cases containing this text")
+    parser.add_argument("--save", metavar="NAME", help="store results as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="compare with a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="relative slowdown reported as a regression (default: 0.15)",
+    )
+    args = parser.parse_args(argv)
+    baseline = load_baseline(args.compare) if args.compare else None
+    results = run(list(args.groups), match=args.match)
+    if args.save:
+        print(f"Baseline saved to {save_baseline(args.save, results)}")
+    if baseline is None:
+        return 0
+    rows = compare(baseline, results, threshold=args.threshold)
+    print()
+    print_rows(rows, ["case", "base_ms", "now_ms", "change_%", "verdict"])
+    return 1 if any(row["verdict"] == "REGRESSION" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 import api from './client';
 
+// Cursor of a keyset-paginated `next` link, or null on the last page.
+export const cursorFrom = (next) => (next ? new URL(next, window.location.origin).searchParams.get('cursor') : null);
+
 export const AuthApi = {
   login: (payload) => api.post('/auth/login', payload),
   register: (payload) => api.post('/auth/register', payload),
@@ -9,13 +12,19 @@ export const AuthApi = {
 
 export const SearchApi = {
   bulk: (payload) => api.post('/search/bulk', payload),
-  list: () => api.get('/search/'),
-  detail: (id) => api.get(`/search/${id}`),
+  list: (cursor = null) => api.get('/search/', { params: { cursor: cursor || undefined } }),
+  detail: (id, cursor = null) => api.get(`/search/${id}`, { params: { cursor: cursor || undefined } }),
+  export: (id, type) => api.get(`/search/${id}/export.${type}`, { responseType: 'blob' }),
 };
 
 export const ProductApi = {
   requestDetails: (productIds) => api.post('/products/details/request', { product_ids: productIds }),
   pollStatus: (requestIds) => api.post('/products/details/status', { request_ids: requestIds }),
+  // Long-poll: resolves when details of some product changed after `cursor`.
+  changes: (cursor = null, searchRequestId = null) =>
+    api.get('/products/details/changes', {
+      params: { cursor: cursor || undefined, search_request_id: searchRequestId || undefined },
+    }),
   jobs: (limit = 50, searchRequestId = null) =>
     api.get('/products/details/jobs', { params: { limit, search_request_id: searchRequestId || undefined } }),
 };
@@ -61,6 +61,19 @@ export async function mockBackend(page) {
     })
   );
 
+  await page.route('**/api/v1/products/details/changes**', (route) =>
+    route.fulfill({
+      status: 200,
+      contentType: 'application/json',
+      body: JSON.stringify({
+        cursor: 'cursor-1',
+        products: [
+          { id: 10, artid: 'A001', brand: 'Bosch', name: 'Filter', source: 'Armtek', details_status: 'ready', request_id: 'job-1' }
+        ]
+      })
+    })
+  );
+
   await page.route('**/api/v1/providers/armtek/credentials', (route) => {
     if (route.request().method() === 'GET') {
       return route.fulfill({ status: 200, body: JSON.stringify({ login: 'armtek-user' }) });
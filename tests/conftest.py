@@ -1,10 +1,97 @@
 import os
+from contextlib import contextmanager
 
 import django
 import pytest
 
+PASSWORD = "Sup3rStrongP@ssw0rd!"
+
 
 @pytest.fixture(scope="session", autouse=True)
 def django_setup():
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.elizabeth.settings.dev")
     django.setup()
+
+
+@pytest.fixture(autouse=True)
+def clear_credentials_cache():
+    from backend.apps.providers.services import clear_credentials_cache
+
+    clear_credentials_cache()
+    yield
+    clear_credentials_cache()
+
+
+def _save_armtek_account(user, *, kunnr_rg="100"):
+    from backend.apps.providers.services import save_provider_account
+
+    save_provider_account(
+        user=user,
+        provider_name="armtek",
+        login="login",
+        password="secret",
+        vkorg="4000",
+        kunnr_rg=kunnr_rg,
+    )
+
+
+@pytest.fixture
+def auth_headers():
+    """Register and log in through the API; return the bearer header."""
+    from backend.apps.accounts.models import User
+
+    def make(client, email, phone, *, armtek=False):
+        creds = {
+            "email": email,
+            "password": PASSWORD,
+            "phone_number": phone,
+            "country": "RU",
+        }
+        client.post("/api/v1/auth/register", creds, content_type="application/json")
+        login = client.post(
+            "/api/v1/auth/login", creds, content_type="application/json"
+        )
+        if armtek:
+            _save_armtek_account(User.objects.get(email=email))
+        return {"HTTP_AUTHORIZATION": f"Bearer {login.json()['tokens']['access']}"}
+
+    return make
+
+
+@pytest.fixture
+def armtek_user(db):
+    """Create a user with a linked Armtek account."""
+    from backend.apps.accounts.models import User
+
+    def make(email, phone, *, kunnr_rg="100"):
+        user = User.objects.create_user(
+            email=email, password=PASSWORD, phone_number=phone
+        )
+        _save_armtek_account(user, kunnr_rg=kunnr_rg)
+        return user
+
+    return make
+
+
+@pytest.fixture
+def query_budget():
+    """Fail a block that runs more SQL queries than ``limit``, listing them all."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    @contextmanager
+    def budget(limit, label=""):
+        with CaptureQueriesContext(connection) as captured:
+            yield captured
+        if len(captured) > limit:
+            queries = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(captured.captured_queries, 1)
+            )
+            pytest.fail(
+                f"{label or 'block'} ran {len(captured)} queries, "
+                f"budget is {limit}:\n{queries}",
+                pytrace=False,
+            )
+
+    return budget
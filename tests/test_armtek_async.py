@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from backend.apps.accounts.models import User
+from backend.apps.providers.armtek.async_client import AsyncArmtekClient
+from backend.apps.providers.armtek.exceptions import (
+    ArmtekCredentialsError,
+    ArmtekHttpError,
+)
+from backend.apps.providers.armtek.services import AsyncArmtekSearchService
+from backend.apps.providers.armtek.singleflight import SingleFlight
+from backend.apps.providers.services import ArmtekCredentials
+from backend.apps.search.services import perform_bulk_search
+
+
+def _credentials():
+    return ArmtekCredentials(
+        login="login",
+        password="secret",
+        pin=None,
+        vkorg="4000",
+        kunnr_rg="100",
+        program=None,
+        kunnr_za=None,
+        incoterms=None,
+        vbeln=None,
+    )
+
+
+def _search_handler(state):
+    async def handler(request):
+        form = parse_qs(request.content.decode())
+        pin = form["PIN"][0]
+        state["calls"].append(pin)
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01 * (5 - int(pin) % 5))
+        state["active"] -= 1
+        return httpx.Response(
+            200,
+            json={
+                "STATUS": 200,
+                "RESP": [
+                    {"PIN": pin, "BRAND": "KYB", "ARTID": f"A{pin}", "ANALOG": "1"},
+                    {"PIN": pin, "BRAND": "KYB", "ARTID": f"M{pin}", "PRICE": "9.5"},
+                ],
+            },
+        )
+
+    return handler
+
+
+def _state():
+    return {"calls": [], "active": 0, "peak": 0}
+
+
+def test_async_client_parses_like_sync_client():
+    transport = httpx.MockTransport(_search_handler(_state()))
+
+    async def run():
+        async with AsyncArmtekClient(
+            base_url="https://armtek.example",
+            login="login",
+            password="secret",
+            transport=transport,
+        ) as client:
+            return await client.search(vkorg="4000", kunnr_rg="1", pin="7", brand="KYB")
+
+    items = asyncio.run(run())
+
+    assert [item.artid for item in items] == ["A7", "M7"]
+    assert items[0].is_analog is True
+    assert items[1].price == 9.5
+
+
+def test_runner_keeps_order_and_bounds_concurrency():
+    state = _state()
+    service = AsyncArmtekSearchService(
+        _credentials(),
+        enable_stub=False,
+        transport=httpx.MockTransport(_search_handler(state)),
+    )
+
+    with service.runner(concurrency=4) as runner:
+        futures = [runner.submit(str(i), "KYB") for i in range(1, 11)]
+        results = [future.result() for future in futures]
+
+    assert [items[0].artid for items in results] == [f"M{i}" for i in range(1, 11)]
+    assert sorted(state["calls"], key=int) == [str(i) for i in range(1, 11)]
+    assert 1 < state["peak"] <= 4
+
+
+@pytest.mark.django_db
+def test_bulk_flow_with_asyncio_fanout(settings):
+    settings.ARMTEK_ENABLE_STUB = True
+    settings.ARMTEK_FANOUT_BACKEND = "asyncio"
+    user = User.objects.create_user(
+        email="async@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000040",
+    )
+
+    _, products = perform_bulk_search(["1_KYB", "2_MANN", "3_KYB"], user=user)
+
+    assert [(p.pin, p.brand) for p in products] == [
+        ("1", "KYB"),
+        ("2", "MANN"),
+        ("3", "KYB"),
+    ]
+
+
+def test_runner_returns_each_error_on_its_own_future():
+    async def handler(request):
+        pin = parse_qs(request.content.decode())["PIN"][0]
+        if pin == "2":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"STATUS": 200, "RESP": [{"ARTID": pin}]})
+
+    service = AsyncArmtekSearchService(
+        _credentials(), enable_stub=False, transport=httpx.MockTransport(handler)
+    )
+
+    with service.runner(concurrency=2) as runner:
+        futures = [runner.submit(pin, "KYB") for pin in ("1", "2", "3")]
+        errors = [future.exception() for future in futures]
+        results = [futures[0].result(), futures[2].result()]
+
+    assert [items[0].artid for items in results] == ["1", "3"]
+    assert errors[0] is None and errors[2] is None
+    assert isinstance(errors[1], ArmtekHttpError)
+
+
+@pytest.fixture
+def async_fanout(settings, monkeypatch):
+    settings.ARMTEK_ENABLE_STUB = False
+    settings.ARMTEK_FANOUT_BACKEND = "asyncio"
+    settings.ARMTEK_SEARCH_CACHE_ENABLED = False
+    settings.ARMTEK_MAX_CONCURRENCY = 4
+    state = _state()
+    state["clients"] = 0
+
+    def open_client(self, credentials):
+        state["clients"] += 1
+        return AsyncArmtekClient(
+            base_url="https://armtek.example",
+            login=credentials.login,
+            password=credentials.password,
+            transport=httpx.MockTransport(_search_handler(state)),
+        )
+
+    monkeypatch.setattr(AsyncArmtekSearchService, "_open_client", open_client)
+    monkeypatch.setattr("backend.apps.search.services._ASYNC_WINDOW", 3)
+    return state
+
+
+@pytest.mark.django_db
+def test_asyncio_bulk_runs_on_one_client(async_fanout, armtek_user):
+    user = armtek_user("async-one@example.com", "+79000000041")
+
+    _, products = perform_bulk_search([f"{i}_KYB" for i in range(1, 11)], user=user)
+
+    assert [p.artid for p in products] == [f"M{i}" for i in range(1, 11)]
+    assert async_fanout["clients"] == 1
+    assert 1 < async_fanout["peak"] <= 4
+
+
+@pytest.mark.django_db
+def test_asyncio_bulk_reraises_credentials_errors(
+    async_fanout, monkeypatch, armtek_user
+):
+    user = armtek_user("async-creds@example.com", "+79000000042")
+
+    async def rejected(self, **kwargs):
+        raise ArmtekCredentialsError("Armtek credentials are not configured")
+
+    monkeypatch.setattr(AsyncArmtekClient, "search", rejected)
+
+    with pytest.raises(ArmtekCredentialsError):
+        perform_bulk_search(["1_KYB", "2_KYB"], user=user)
+
+
+def test_async_lookups_join_a_threaded_lookup_in_flight():
+    flight = SingleFlight()
+    started = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append("thread")
+        started.set()
+        time.sleep(0.05)
+        return ["shared"]
+
+    async def never():
+        calls.append("task")
+        return ["own"]
+
+    leader = threading.Thread(target=flight.do, args=("key", slow))
+    leader.start()
+    started.wait()
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("key", never) for _ in range(3)))
+
+    results = asyncio.run(run())
+    leader.join()
+
+    assert results == [["shared"]] * 3
+    assert calls == ["thread"]
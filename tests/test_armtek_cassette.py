@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from backend.apps.providers.armtek import cassette as cassette_module
+from backend.apps.providers.armtek.async_client import AsyncArmtekClient
+from backend.apps.providers.armtek.cassette import CassetteMissError, CassetteTransport
+from backend.apps.providers.armtek.client import ArmtekClient
+from backend.apps.providers.armtek.pool import close_http_clients
+from backend.apps.providers.armtek.profile import fetch_armtek_profile
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.services import ArmtekCredentials
+
+BASE_URL = "https://armtek.example"
+
+
+def _armtek(request):
+    if request.url.path == "/api/ws_user/getUserVkorgList":
+        return httpx.Response(200, json={"STATUS": 200, "RESP": [{"VKORG": "4000"}]})
+    if request.url.path == "/api/ws_user/getUserInfo":
+        structure = {"RG_TAB": [{"KUNNR": "100", "DEFAULT": "1"}]}
+        return httpx.Response(
+            200, json={"STATUS": 200, "RESP": {"STRUCTURE": structure}}
+        )
+    form = dict(httpx.QueryParams(request.content.decode()))
+    entry = {"PIN": form["PIN"], "BRAND": "KYB", "ARTID": "A1", "PRICE": "10.5"}
+    return httpx.Response(
+        200, json={"STATUS": 200, "RESP": [{**entry, "LOGIN": form["LOGIN"]}]}
+    )
+
+
+def _credentials(login):
+    return ArmtekCredentials(
+        login=login,
+        password=login,
+        pin=None,
+        vkorg="4000",
+        kunnr_rg="100",
+        program=None,
+        kunnr_za=None,
+        incoterms=None,
+        vbeln=None,
+    )
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    path = tmp_path / "armtek.json"
+    transport = CassetteTransport(
+        path, mode="record", transport=httpx.MockTransport(_armtek)
+    )
+    client = httpx.Client(base_url=BASE_URL, transport=transport)
+    with ArmtekClient(
+        base_url=BASE_URL, login="real-login", password="s3cret", client=client
+    ) as armtek:
+        service = ArmtekSearchService(_credentials("real-login"), enable_stub=False)
+        armtek.search(
+            **service._search_kwargs(service.credentials, pin="333", brand="KYB")
+        )
+    client.get("/api/ws_user/getUserVkorgList", params={"format": "json"})
+    client.post(
+        "/api/ws_user/getUserInfo",
+        params={"format": "json"},
+        data={"VKORG": "4000", "STRUCTURE": "1"},
+    )
+    # Pretend the search took 200 ms to check replayed latency.
+    data = json.loads(path.read_text())
+    data["interactions"][0]["elapsed_ms"] = 200
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_recorded_cassette_scrubs_credentials(recorded):
+    text = recorded.read_text()
+    interactions = json.loads(text)["interactions"]
+
+    assert "real-login" not in text and "s3cret" not in text
+    assert [i["request"]["path"] for i in interactions] == [
+        "/api/ws_search/search",
+        "/api/ws_user/getUserVkorgList",
+        "/api/ws_user/getUserInfo",
+    ]
+    assert interactions[0]["request"]["form"]["LOGIN"] == "***"
+    assert interactions[0]["response"]["json"]["RESP"][0]["LOGIN"] == "***"
+
+
+def test_services_replay_from_configured_cassette(recorded, settings, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(cassette_module.time, "sleep", sleeps.append)
+    settings.ARMTEK_CASSETTE = str(recorded)
+    settings.ARMTEK_CASSETTE_LATENCY_SCALE = 0.5
+    settings.ARMTEK_BASE_URL = BASE_URL
+    settings.ARMTEK_SEARCH_CACHE_ENABLED = False
+    close_http_clients()
+    try:
+        items = ArmtekSearchService(_credentials("other"), enable_stub=False).search(
+            pin="333", brand="KYB"
+        )
+        profile = fetch_armtek_profile(
+            base_url=BASE_URL, timeout=1, login="other", password="other"
+        )
+    finally:
+        close_http_clients()
+
+    assert [(item.artid, str(item.price)) for item in items] == [("A1", "10.5")]
+    assert (profile.vkorg, profile.kunnr_rg) == ("4000", "100")
+    assert sleeps[0] == pytest.approx(0.1)
+
+
+def test_async_replay_and_unknown_request(recorded):
+    transport = CassetteTransport(recorded)
+    service = ArmtekSearchService(_credentials("l"), enable_stub=False)
+
+    async def search(pin):
+        async with AsyncArmtekClient(
+            base_url=BASE_URL, login="l", password="p", transport=transport
+        ) as client:
+            return await client.search(
+                **service._search_kwargs(service.credentials, pin=pin, brand="KYB")
+            )
+
+    assert asyncio.run(search("333"))[0].artid == "A1"
+    with pytest.raises(CassetteMissError):
+        asyncio.run(search("999"))
@@ -0,0 +1,65 @@
+import pickle
+from decimal import Decimal
+
+import pytest
+from benchmarks.payloads import search_response
+
+from backend.apps.providers.armtek.client import parse_search_items
+from backend.apps.providers.armtek.exceptions import ArmtekResponseError
+
+
+def test_first_non_analog_builds_only_the_main_item():
+    payload = search_response(200, analog_share=0.1)
+    payload["RESP"]["ARRAY"].append("not a mapping")
+
+    items = parse_search_items(
+        payload, pin="OC90", brand="KNECHT", first_non_analog=True
+    )
+
+    assert [item.artid for item in items] == ["1000020"]
+    assert items[0].is_analog is False
+    assert items[0].price == Decimal("270.40")
+    assert items[0].raw is None
+    with pytest.raises(ArmtekResponseError):
+        parse_search_items(payload, pin="OC90", brand="KNECHT")
+
+
+def test_raw_payload_is_opt_in_and_items_are_slotted():
+    payload = search_response(3, analog_share=1)
+
+    assert (
+        parse_search_items(payload, pin="OC90", brand=None, first_non_analog=True) == []
+    )
+    items = parse_search_items(payload, pin="OC90", brand=None, keep_raw=True)
+
+    assert items[0].raw is payload["RESP"]["ARRAY"][0]
+    assert not hasattr(items[0], "__dict__")
+    assert pickle.loads(pickle.dumps(items[0])) == items[0]
+
+
+def test_table_decoder_produces_decimals_and_reads_fallback_keys():
+    entry = {
+        "PIN": "7",
+        "ARTID": 42,
+        "PRICE": " 1299.90 ",
+        "RCOST": 9.5,
+        "MRKBY": "NaN",
+        "VENSL": "87.5",
+        "RVALUE": "12.0",
+        "RETDAYS": "",
+        "ANALOG": "0",
+        "WAERS": " RUB ",
+        "PNOTE": "   ",
+        "UNKNOWN": "x",
+    }
+    payload = {"STATUS": 200, "RESP": [entry]}
+
+    (item,) = parse_search_items(payload, pin="7", brand="KYB")
+
+    assert (item.artid, item.brand, item.name) == ("42", "KYB", "")
+    assert item.price == Decimal("1299.90")
+    assert item.max_retail_price == Decimal("9.5")
+    assert item.markup is None
+    assert item.supply_probability == Decimal("87.5")
+    assert (item.available_quantity, item.return_days) == (12, None)
+    assert (item.is_analog, item.currency, item.note) == (False, "RUB", None)
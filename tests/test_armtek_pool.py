@@ -0,0 +1,82 @@
+import base64
+
+import httpx
+
+from backend.apps.providers.armtek.client import ArmtekClient
+from backend.apps.providers.armtek.pool import close_http_clients, get_http_client
+
+
+def _ok_handler(seen):
+    def handler(request):
+        seen.append(request.headers.get("Authorization"))
+        return httpx.Response(200, json={"STATUS": 200, "RESP": []})
+
+    return handler
+
+
+def _basic(login, password):
+    token = base64.b64encode(f"{login}:{password}".encode()).decode()
+    return f"Basic {token}"
+
+
+def test_pooled_client_is_reused_per_base_url_and_closed_on_shutdown():
+    close_http_clients()
+    first = get_http_client("https://armtek.example/")
+    assert get_http_client("https://armtek.example") is first
+    assert get_http_client("https://other.example") is not first
+
+    close_http_clients()
+    assert first.is_closed
+    assert get_http_client("https://armtek.example") is not first
+    close_http_clients()
+
+
+def test_shared_client_sends_auth_per_credentials_and_stays_open():
+    seen = []
+    shared = httpx.Client(
+        base_url="https://armtek.example",
+        transport=httpx.MockTransport(_ok_handler(seen)),
+    )
+    for login in ("alice", "bob"):
+        with ArmtekClient(
+            base_url="https://armtek.example",
+            login=login,
+            password="pw",
+            client=shared,
+        ) as client:
+            client.search(vkorg="4000", kunnr_rg="1", pin="1", brand="KYB")
+
+    assert seen == [_basic("alice", "pw"), _basic("bob", "pw")]
+    assert not shared.is_closed
+    shared.close()
+
+
+def test_pooled_client_does_not_carry_cookies_between_accounts(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("Cookie"))
+        return httpx.Response(
+            200,
+            json={"STATUS": 200, "RESP": []},
+            headers={"Set-Cookie": "session=alice; Path=/"},
+        )
+
+    monkeypatch.setattr(
+        "backend.apps.providers.armtek.pool.get_cassette_transport",
+        lambda: httpx.MockTransport(handler),
+    )
+    close_http_clients()
+    shared = get_http_client("https://armtek.example")
+    for login in ("alice", "bob"):
+        with ArmtekClient(
+            base_url="https://armtek.example",
+            login=login,
+            password="pw",
+            client=shared,
+        ) as client:
+            client.search(vkorg="4000", kunnr_rg="1", pin="1", brand="KYB")
+
+    assert seen == [None, None]
+    assert not shared.cookies
+    close_http_clients()
@@ -0,0 +1,151 @@
+import time
+
+import httpx
+import pytest
+from django.core.cache import cache
+
+from backend.apps.accounts.models import User
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek import services as armtek_services
+from backend.apps.providers.armtek.client import ArmtekClient
+from backend.apps.providers.armtek.exceptions import (
+    ArmtekHttpError,
+    ArmtekUnavailableError,
+)
+from backend.apps.providers.armtek.resilience import (
+    CLOSED,
+    OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+    reset_breakers,
+)
+from backend.apps.providers.services import save_provider_account
+from backend.apps.search.services import perform_bulk_search
+
+NO_WAIT = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+OK = {"STATUS": 200, "RESP": [{"PIN": "1", "BRAND": "KYB", "ARTID": "A1"}]}
+
+
+def _client(statuses, calls, **kwargs):
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], json=OK)
+
+    return ArmtekClient(
+        base_url="https://armtek.example",
+        login="login",
+        password="secret",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+def _search(client):
+    return client.search(vkorg="4000", kunnr_rg="1", pin="1", brand="KYB")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    metrics.reset()
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+def test_transient_errors_are_retried_with_backoff():
+    calls = []
+
+    items = _search(_client([503, 429, 200], calls, retry=NO_WAIT))
+
+    assert [item.artid for item in items] == ["A1"]
+    assert len(calls) == 3
+    assert metrics.snapshot()["retry.attempt"] == 2
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    with pytest.raises(ArmtekHttpError):
+        _search(_client([400, 200], calls, retry=NO_WAIT))
+
+    assert len(calls) == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=1.0)
+
+    delays = [policy.delay(attempt) for attempt in (1, 2, 3, 4) for _ in range(20)]
+
+    assert all(0 <= delay <= 1.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_breaker_fails_fast_while_open_and_closes_after_probe():
+    breaker = CircuitBreaker(name="test", failure_threshold=2, reset_timeout=0.05)
+    calls = []
+    client = _client([500, 500, 200], calls, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(ArmtekHttpError):
+            _search(client)
+    assert breaker.state == OPEN
+
+    with pytest.raises(ArmtekUnavailableError):
+        _search(client)
+    assert len(calls) == 2
+
+    time.sleep(0.06)
+    _search(client)
+    assert breaker.state == CLOSED
+    snapshot = metrics.snapshot()
+    assert snapshot["breaker.open"] == 1
+    assert snapshot["breaker.half_open"] == 1
+    assert snapshot["breaker.closed"] == 1
+    assert snapshot["breaker.rejected"] == 1
+
+
+@pytest.mark.django_db
+def test_stale_results_are_served_while_armtek_is_down(settings, monkeypatch):
+    settings.ARMTEK_ENABLE_STUB = False
+    settings.ARMTEK_BASE_URL = "https://stale.armtek.example"
+    settings.ARMTEK_RETRY_ATTEMPTS = 1
+    settings.ARMTEK_BREAKER_FAILURE_THRESHOLD = 1
+    settings.SEARCH_CACHE_TTL_MINUTES = 0  # every stored entry is already stale
+    cache.clear()
+    state = {"down": False, "calls": 0}
+
+    def handler(request):
+        state["calls"] += 1
+        if state["down"]:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200, json=OK)
+
+    shared = httpx.Client(
+        base_url=settings.ARMTEK_BASE_URL, transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(armtek_services, "get_http_client", lambda base_url: shared)
+    user = User.objects.create_user(
+        email="stale@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000050",
+    )
+    save_provider_account(
+        user=user,
+        provider_name="armtek",
+        login="login",
+        password="secret",
+        vkorg="4000",
+        kunnr_rg="100",
+    )
+
+    perform_bulk_search(["1_KYB"], user=user)
+    state["down"] = True
+    _, tripped = perform_bulk_search(["1_KYB"], user=user)
+    _, failed_fast = perform_bulk_search(["1_KYB"], user=user)
+
+    assert [p.artid for p in tripped] == [p.artid for p in failed_fast] == ["A1"]
+    assert state["calls"] == 2
+    assert metrics.snapshot()["search_cache.stale"] == 2
+    with pytest.raises(ArmtekUnavailableError):
+        # Fast-failed lookups without a cached copy still fail the search.
+        perform_bulk_search(["2_KYB"], user=user)
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from backend.apps.providers.armtek.cache import store_search
+from backend.apps.providers.armtek.exceptions import ArmtekError
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.armtek.singleflight import LOCK_PREFIX
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.providers.services import ArmtekCredentials
+
+
+def _service():
+    credentials = ArmtekCredentials(
+        login="login",
+        password="secret",
+        pin=None,
+        vkorg="4000",
+        kunnr_rg="100",
+        program=None,
+        kunnr_za=None,
+        incoterms=None,
+        vbeln=None,
+    )
+    return ArmtekSearchService(credentials, enable_stub=False)
+
+
+def _run_concurrently(fn, count=5):
+    results, errors = [], []
+    barrier = threading.Barrier(count)
+
+    def target():
+        barrier.wait()
+        try:
+            results.append(fn())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_identical_lookups_share_one_call(monkeypatch):
+    calls = []
+
+    def slow_remote(self, *, pin, brand=None):
+        calls.append(pin)
+        time.sleep(0.1)
+        return [ArmtekSearchItem(pin=pin, brand=brand, name="n", artid="A1")]
+
+    monkeypatch.setattr(ArmtekSearchService, "_search_remote", slow_remote)
+    service = _service()
+
+    results, errors = _run_concurrently(lambda: service.search(pin="1", brand="KYB"))
+
+    assert calls == ["1"]
+    assert not errors
+    assert [r[0].artid for r in results] == ["A1"] * 5
+
+
+def test_concurrent_lookups_share_the_error(monkeypatch):
+    calls = []
+
+    def failing_remote(self, *, pin, brand=None):
+        calls.append(pin)
+        time.sleep(0.1)
+        raise ArmtekError("boom")
+
+    monkeypatch.setattr(ArmtekSearchService, "_search_remote", failing_remote)
+    service = _service()
+
+    results, errors = _run_concurrently(lambda: service.search(pin="2", brand="KYB"))
+
+    assert calls == ["2"]
+    assert not results
+    assert len(errors) == 5
+    assert all(str(exc) == "boom" for exc in errors)
+
+
+def test_shared_mode_waits_for_other_process_result(settings, monkeypatch):
+    settings.ARMTEK_SINGLEFLIGHT_SHARED = True
+    cache.clear()
+    service = _service()
+    key = service.cache_key(pin="3", brand="KYB")
+    # Another worker process holds the lock and publishes its result shortly.
+    cache.add(LOCK_PREFIX + key, "other-process", timeout=30)
+    published = [ArmtekSearchItem(pin="3", brand="KYB", name="n", artid="REMOTE")]
+    threading.Timer(0.2, store_search, args=(key, published)).start()
+    monkeypatch.setattr(
+        ArmtekSearchService,
+        "_search_remote",
+        lambda self, **kwargs: pytest.fail("lookup must not be repeated"),
+    )
+
+    items = service.search(pin="3", brand="KYB")
+
+    assert [item.artid for item in items] == ["REMOTE"]
@@ -0,0 +1,65 @@
+import pytest
+
+from backend.apps.providers.armtek.client import ArmtekClient
+from backend.apps.providers.armtek.exceptions import (
+    ArmtekHttpError,
+    ArmtekTransportError,
+)
+from backend.apps.providers.armtek.pool import close_http_clients
+from backend.apps.providers.armtek.profile import fetch_armtek_profile
+from backend.apps.providers.armtek.standin import StandinProfile, start_standin
+
+
+@pytest.fixture
+def standin(request):
+    server = start_standin(request.param)
+    yield server
+    server.shutdown()
+    server.server_close()
+    close_http_clients()
+
+
+@pytest.mark.parametrize(
+    "standin",
+    [StandinProfile(latency_ms=1, offers=(40, 40), analog_share=0.25)],
+    indirect=True,
+)
+def test_standin_serves_search_and_profile_envelopes(standin):
+    with ArmtekClient(
+        base_url=standin.base_url, login="login", password="secret"
+    ) as client:
+        items = client.search(vkorg="4000", kunnr_rg="1000", pin="oc90", brand="kn")
+        (main,) = client.search(
+            vkorg="4000", kunnr_rg="1000", pin="oc90", first_non_analog=True
+        )
+    profile = fetch_armtek_profile(
+        base_url=standin.base_url, timeout=5, login="login", password="secret"
+    )
+
+    assert len(items) == 40
+    assert sum(item.is_analog is True for item in items) == 10
+    assert (main.pin, main.is_analog) == ("OC90", False)
+    assert (profile.vkorg, profile.kunnr_rg, profile.vbeln) == ("4000", "1000", "3000")
+    assert standin.counters == {"ok": 4}
+
+
+@pytest.mark.parametrize(
+    "standin",
+    [StandinProfile(latency_ms=0, throttle_rate=0.5, stall_rate=0.5, seed=1)],
+    indirect=True,
+)
+def test_standin_injects_throttling_and_stalls(standin):
+    outcomes = set()
+    with ArmtekClient(
+        base_url=standin.base_url, login="login", password="secret", timeout=0.2
+    ) as client:
+        for _ in range(8):
+            try:
+                client.search(vkorg="4000", kunnr_rg="1000", pin="1")
+            except ArmtekHttpError as exc:
+                outcomes.add(exc.status_code)
+            except ArmtekTransportError as exc:
+                outcomes.add("timeout" if exc.timeout else "transport")
+
+    assert outcomes == {429, "timeout"}
+    assert standin.counters["throttled"] + standin.counters["stalled"] == 8
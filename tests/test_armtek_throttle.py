@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.async_client import AsyncArmtekClient
+from backend.apps.providers.armtek.client import ArmtekClient
+from backend.apps.providers.armtek.exceptions import ArmtekHttpError
+from backend.apps.providers.armtek.services import AsyncArmtekSearchService
+from backend.apps.providers.armtek.throttle import (
+    AdaptiveConcurrency,
+    ArmtekThrottle,
+    DatabaseTokenBucket,
+    LocalTokenBucket,
+    reset_throttles,
+)
+from backend.apps.providers.services import ArmtekCredentials
+
+
+def _client(status_code, throttle):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(status_code, json={"STATUS": 200, "RESP": []})
+    )
+    return ArmtekClient(
+        base_url="https://armtek.example",
+        login="login",
+        password="secret",
+        transport=transport,
+        throttle=throttle,
+    )
+
+
+def test_concurrency_halves_on_overload_and_grows_on_success():
+    metrics.reset()
+    controller = AdaptiveConcurrency(name="aimd", maximum=8)
+    throttle = ArmtekThrottle(concurrency=controller, bucket=None)
+
+    with pytest.raises(ArmtekHttpError) as excinfo:
+        _client(503, throttle).search(vkorg="1", kunnr_rg="1", pin="1", brand="B")
+    assert excinfo.value.status_code == 503
+    assert controller.limit == 4
+    assert metrics.snapshot()["throttle.aimd.backoff"] == 1
+
+    for _ in range(4):
+        _client(200, throttle).search(vkorg="1", kunnr_rg="1", pin="1", brand="B")
+    assert 4.9 < controller.limit < 5
+    assert metrics.snapshot()["throttle.aimd.limit"] == controller.limit
+
+
+def test_client_errors_do_not_shrink_the_limit():
+    controller = AdaptiveConcurrency(name="aimd-4xx", maximum=4)
+    throttle = ArmtekThrottle(concurrency=controller, bucket=None)
+
+    with pytest.raises(ArmtekHttpError):
+        _client(400, throttle).search(vkorg="1", kunnr_rg="1", pin="1", brand="B")
+
+    assert controller.limit == 4
+
+
+def test_local_bucket_allows_burst_then_spaces_calls():
+    bucket = LocalTokenBucket(rate=2, burst=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.4 < bucket.reserve() <= 0.5
+
+
+@pytest.mark.django_db
+def test_database_bucket_is_shared_between_instances():
+    first = DatabaseTokenBucket(login="shared", rate=1, burst=2)
+    second = DatabaseTokenBucket(login="shared", rate=1, burst=2)
+
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert 0.9 < first.reserve() <= 1
+
+
+def _async_client(status_code, throttle):
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(status_code, json={"STATUS": 200, "RESP": []})
+
+    return AsyncArmtekClient(
+        base_url="https://armtek.example",
+        login="login",
+        password="secret",
+        transport=httpx.MockTransport(handler),
+        throttle=throttle,
+    )
+
+
+def test_async_client_shares_the_aimd_limit():
+    controller = AdaptiveConcurrency(name="aimd-async", maximum=2)
+    throttle = ArmtekThrottle(concurrency=controller, bucket=None)
+    state = {"active": 0, "peak": 0}
+
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return httpx.Response(200, json={"STATUS": 200, "RESP": []})
+
+    async def run():
+        async with AsyncArmtekClient(
+            base_url="https://armtek.example",
+            login="login",
+            password="secret",
+            transport=httpx.MockTransport(handler),
+            throttle=throttle,
+        ) as client:
+            await asyncio.gather(
+                *(client.search(vkorg="1", kunnr_rg="1", pin=str(i)) for i in range(6))
+            )
+        with pytest.raises(ArmtekHttpError):
+            await _async_client(503, throttle).search(vkorg="1", kunnr_rg="1", pin="1")
+
+    asyncio.run(run())
+
+    assert state["peak"] == 2
+    assert controller.limit == 1
+
+
+def test_thread_release_wakes_waiting_task():
+    controller = AdaptiveConcurrency(name="aimd-mixed", maximum=1)
+    controller.acquire()
+
+    async def run():
+        waiting = asyncio.ensure_future(controller.acquire_async())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        threading.Timer(0.01, controller.release).start()
+        await asyncio.wait_for(waiting, timeout=2)
+
+    asyncio.run(run())
+    controller.release()
+
+
+def test_rate_limit_applies_to_asyncio_fanout(settings):
+    settings.ARMTEK_RATE_LIMIT_PER_SECOND = 20
+    settings.ARMTEK_RATE_LIMIT_BURST = 1
+    settings.ARMTEK_RATE_LIMIT_BACKEND = "local"
+    settings.ARMTEK_MAX_CONCURRENCY = 8
+    reset_throttles()
+    metrics.reset()
+    sent = []
+
+    async def handler(request):
+        sent.append(time.monotonic())
+        return httpx.Response(200, json={"STATUS": 200, "RESP": []})
+
+    service = AsyncArmtekSearchService(
+        ArmtekCredentials(
+            login="async-rate",
+            password="secret",
+            pin=None,
+            vkorg="4000",
+            kunnr_rg="100",
+            program=None,
+            kunnr_za=None,
+            incoterms=None,
+            vbeln=None,
+        ),
+        enable_stub=False,
+        transport=httpx.MockTransport(handler),
+    )
+    try:
+        with service.runner(concurrency=8) as runner:
+            futures = [runner.submit(str(i), "KYB") for i in range(5)]
+            for future in futures:
+                future.result()
+    finally:
+        reset_throttles()
+
+    # One token up front, then one every 50 ms.
+    assert sent[-1] - sent[0] >= 0.19
+    assert metrics.snapshot()["throttle.rate_limited"] == 4
@@ -0,0 +1,30 @@
+import pytest
+from benchmarks.suite import compare, load_baseline, save_baseline
+
+
+def test_compare_flags_slowdowns_beyond_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr("benchmarks.suite.BASELINE_DIR", tmp_path)
+    save_baseline(
+        "main",
+        {
+            "search.bulk[10]": {"us": 1000.0, "peak_kib": 1.0},
+            "upsert.fresh[500]": {"us": 1000.0, "peak_kib": 1.0},
+            "ingest.details[50]": {"us": 1000.0, "peak_kib": 1.0},
+        },
+    )
+    current = {
+        "search.bulk[10]": {"us": 1100.0, "peak_kib": 1.0},
+        "upsert.fresh[500]": {"us": 1300.0, "peak_kib": 1.0},
+        "ingest.details[50]": {"us": 500.0, "peak_kib": 1.0},
+        "serialize.products[20]": {"us": 10.0, "peak_kib": 1.0},
+    }
+
+    rows = compare(load_baseline("main"), current, threshold=0.15)
+
+    assert {row["case"]: row["verdict"] for row in rows} == {
+        "search.bulk[10]": "ok",
+        "upsert.fresh[500]": "REGRESSION",
+        "ingest.details[50]": "faster",
+        "serialize.products[20]": "new",
+    }
+    assert rows[1]["change_%"] == pytest.approx(30.0)
@@ -0,0 +1,170 @@
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.utils import timezone
+
+from backend.apps.accounts.models import User
+from backend.apps.products.models import (
+    DetailsRequestStatus,
+    Product,
+    ProductDetailsRequest,
+)
+from backend.apps.products.services import (
+    _set_details_request_status,
+    details_change_marker,
+    mark_requests_pending,
+    notify_details_changed,
+    update_product_details,
+    wait_for_details_change,
+)
+from backend.apps.search.models import SearchRequest
+
+URL = "/api/v1/products/details/changes"
+
+
+@pytest.fixture
+def feed(db, auth_headers, settings):
+    settings.DETAILS_CHANGES_SETTLE_SECONDS = 0
+    client = Client()
+    headers = auth_headers(client, "changes@example.com", "+79000000600")
+    user = User.objects.get(email="changes@example.com")
+    searches = [SearchRequest.objects.create(user=user) for _ in range(2)]
+    products = [
+        Product.objects.create(
+            user=user, search_request=search, artid=f"A{i}", name="n", pin="P"
+        )
+        for i, search in enumerate(searches * 2)
+    ]
+    mark_requests_pending(products)
+
+    def changes(cursor, **params):
+        params = {"cursor": cursor, "timeout": 0, **params}
+        return client.get(URL, params, **headers).json()
+
+    head = client.get(URL, **headers).json()
+    return changes, head, products, searches
+
+
+def test_feed_returns_only_changed_products_and_advances(feed):
+    changes, head, products, _ = feed
+    assert head["products"] == []
+
+    update_product_details(products[2], data={"weight": Decimal("1.5")})
+    _set_details_request_status(products[0], DetailsRequestStatus.FAILED, error="x")
+
+    first = changes(head["cursor"])
+    assert [row["id"] for row in first["products"]] == [products[0].pk, products[2].pk]
+    by_id = {row["id"]: row for row in first["products"]}
+    assert by_id[products[2].pk]["details"]["weight"] == "1.500"
+    assert by_id[products[0].pk]["details_status"] == "failed"
+
+    quiet = changes(first["cursor"])
+    assert quiet == {"cursor": first["cursor"], "products": []}
+
+    # Re-ingested details are a change even though the status stays ready.
+    update_product_details(products[2], data={"weight": Decimal("2")})
+    again = changes(first["cursor"])
+    assert [row["id"] for row in again["products"]] == [products[2].pk]
+
+
+def test_feed_is_scoped_to_user_and_search(feed):
+    changes, head, products, searches = feed
+    other = User.objects.create_user(
+        email="stranger@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000601",
+    )
+    foreign = Product.objects.create(user=other, artid="F", name="n", pin="P")
+    update_product_details(foreign, data={})
+    for product in products:
+        update_product_details(product, data={})
+
+    scoped = changes(head["cursor"], search_request_id=searches[1].pk)
+
+    assert [row["id"] for row in scoped["products"]] == [
+        products[1].pk,
+        products[3].pk,
+    ]
+    assert len(changes(head["cursor"])["products"]) == 4
+
+
+def test_feed_serves_late_commits_again_after_the_settle_window(feed, settings):
+    changes, _, products, _ = feed
+    settings.DETAILS_CHANGES_SETTLE_SECONDS = 60
+    head = changes("")
+    update_product_details(products[1], data={})
+
+    first = changes(head["cursor"])
+    assert products[1].pk in [row["id"] for row in first["products"]]
+
+    # A change stamped before the served one commits only afterwards.
+    served_at = ProductDetailsRequest.objects.get(product=products[1]).updated_at
+    ProductDetailsRequest.objects.filter(product=products[3]).update(
+        updated_at=served_at - timedelta(milliseconds=1)
+    )
+    assert changes(first["cursor"]) == {"cursor": first["cursor"], "products": []}
+
+    settings.DETAILS_CHANGES_SETTLE_SECONDS = 0  # the window has passed
+    late = changes(first["cursor"])
+    assert products[3].pk in [row["id"] for row in late["products"]]
+    assert changes(late["cursor"]) == {"cursor": late["cursor"], "products": []}
+
+
+def test_waiting_reads_the_table_only_when_the_marker_moves(
+    feed, settings, monkeypatch, query_budget
+):
+    changes, head, products, _ = feed
+    settings.DETAILS_CHANGES_POLL_SECONDS = 0.01
+    settings.DETAILS_CHANGES_RECHECK_SECONDS = 60
+    waits = []
+
+    def wait(timeout):
+        waits.append(timeout)
+        if len(waits) == 5:
+            # Another process changes a request: only its cache marker moves here.
+            ProductDetailsRequest.objects.filter(product=products[2]).update(
+                status=DetailsRequestStatus.READY, updated_at=timezone.now()
+            )
+            cache.set(f"products:details-changed:{products[2].user_id}", "elsewhere")
+        time.sleep(timeout)
+        return False
+
+    monkeypatch.setattr("backend.apps.products.views.wait_for_details_change", wait)
+
+    with query_budget(5, "details changes wait") as captured:
+        changed = changes(head["cursor"], timeout=5)
+
+    assert [row["id"] for row in changed["products"]] == [products[2].pk]
+    assert len(waits) == 5
+    # User, first read, the simulated update, the read after the marker moved
+    # and the changed products: none while the marker stood still.
+    assert len(captured) == 5
+
+
+def test_status_changes_wake_waiters_after_commit(
+    feed, django_capture_on_commit_callbacks
+):
+    _, _, products, _ = feed
+    marker = details_change_marker(products[1].user_id)
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        _set_details_request_status(products[1], DetailsRequestStatus.READY)
+        _set_details_request_status(products[1], DetailsRequestStatus.READY)
+    assert len(callbacks) == 1
+    assert details_change_marker(products[1].user_id) not in (None, marker)
+
+    timer = threading.Timer(0.05, notify_details_changed)
+    started = time.monotonic()
+    timer.start()
+    wait_for_details_change(5)
+    timer.join()
+    assert time.monotonic() - started < 5
+
+
+def test_invalid_cursor_is_rejected(feed):
+    changes, *_ = feed
+    assert "detail" in changes("bm9wZQ")
@@ -0,0 +1,150 @@
+import csv
+import io
+import zipfile
+from decimal import Decimal
+from xml.etree import ElementTree
+
+import pytest
+from django.test import Client
+from xlsxwriter.utility import xl_col_to_name
+
+from backend.apps.accounts.models import User
+from backend.apps.products.export import EXPORT_HEADER
+from backend.apps.products.models import Product, ProductDetails
+from backend.apps.search.models import SearchRequest
+
+NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+@pytest.fixture
+def search(db, auth_headers):
+    client = Client()
+    headers = auth_headers(client, "export@example.com", "+79000000500")
+    user = User.objects.get(email="export@example.com")
+    search_request = SearchRequest.objects.create(user=user, query_string="P")
+    other = SearchRequest.objects.create(user=user, query_string="Q")
+    products = [
+        Product.objects.create(
+            user=user,
+            search_request=search_request,
+            artid=f"A{i}",
+            brand="KYB",
+            pin="P",
+            name=f"Амортизатор {i}, & <co>",
+            price=Decimal("270.4") if i else None,
+            is_analog=bool(i),
+        )
+        for i in range(3)
+    ]
+    Product.objects.create(user=user, search_request=other, artid="B", name="n")
+    ProductDetails.objects.create(product=products[1], weight=Decimal("1.5"))
+    return client, headers, search_request
+
+
+def _content(response):
+    assert response.streaming
+    return b"".join(response.streaming_content)
+
+
+def test_search_exports_csv(search):
+    client, headers, search_request = search
+
+    response = client.get(f"/api/v1/search/{search_request.pk}/export.csv", **headers)
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert response["Content-Disposition"] == (
+        f'attachment; filename="search-{search_request.pk}.csv"'
+    )
+    rows = list(csv.reader(io.StringIO(_content(response).decode("utf-8-sig"))))
+    assert rows[0] == EXPORT_HEADER
+    assert [row[0] for row in rows[1:]] == ["A0", "A1", "A2"]
+    column = dict(zip(EXPORT_HEADER, rows[2], strict=True))
+    assert column["Наименование"] == "Амортизатор 1, & <co>"
+    assert column["Цена"] == "270.4000"
+    assert column["Аналог"] == "да"
+    assert column["Вес, кг"] == "1.500"
+    assert dict(zip(EXPORT_HEADER, rows[1], strict=True))["Цена"] == ""
+
+
+def _sheet_rows(content):
+    archive = zipfile.ZipFile(io.BytesIO(content))
+    assert archive.testzip() is None
+    sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    columns = {
+        xl_col_to_name(index): title for index, title in enumerate(EXPORT_HEADER)
+    }
+    rows = []
+    for row in sheet.findall("x:sheetData/x:row", NS):
+        cells = {}
+        for cell in row.findall("x:c", NS):
+            title = columns[cell.get("r").rstrip("0123456789")]
+            cells[title] = cell
+        rows.append(cells)
+    return rows
+
+
+def test_search_exports_xlsx(search):
+    client, headers, search_request = search
+
+    response = client.get(f"/api/v1/search/{search_request.pk}/export.xlsx", **headers)
+
+    assert response.status_code == 200
+    rows = _sheet_rows(_content(response))
+    assert len(rows) == 4
+    cells = rows[2]
+    assert cells["Артикул"].get("t") == "inlineStr"
+    assert cells["Артикул"].findtext("x:is/x:t", namespaces=NS) == "A1"
+    assert cells["Цена"].get("t") is None
+    assert Decimal(cells["Цена"].findtext("x:v", namespaces=NS)) == Decimal("270.4")
+    name = cells["Наименование"].findtext("x:is/x:t", namespaces=NS)
+    assert name == "Амортизатор 1, & <co>"
+    assert "Цена" not in rows[1]
+
+
+def test_export_does_not_emit_formulas(search):
+    client, headers, search_request = search
+    Product.objects.filter(search_request=search_request, artid="A0").update(
+        name='=HYPERLINK("http://evil")', note="@SUM(1)", brand="-1+2"
+    )
+    url = f"/api/v1/search/{search_request.pk}/export"
+
+    response = client.get(f"{url}.csv", **headers)
+    rows = list(csv.reader(io.StringIO(_content(response).decode("utf-8-sig"))))
+    row = dict(zip(EXPORT_HEADER, rows[1], strict=True))
+    assert row["Наименование"] == '\'=HYPERLINK("http://evil")'
+    assert row["Примечание"] == "'@SUM(1)"
+    assert row["Бренд"] == "'-1+2"
+    assert rows[2][0] == "A1"
+
+    cells = _sheet_rows(_content(client.get(f"{url}.xlsx", **headers)))[1]
+    assert cells["Наименование"].get("t") == "inlineStr"
+    assert cells["Наименование"].find("x:f", NS) is None
+    text = cells["Наименование"].findtext("x:is/x:t", namespaces=NS)
+    assert text == '=HYPERLINK("http://evil")'
+
+
+def test_product_export_follows_list_filters(search):
+    client, headers, search_request = search
+
+    response = client.get(
+        f"/api/v1/products/export.csv?search_request_id={search_request.pk}",
+        **headers,
+    )
+
+    rows = list(csv.reader(io.StringIO(_content(response).decode("utf-8-sig"))))
+    assert [row[0] for row in rows[1:]] == ["A0", "A1", "A2"]
+    everything = _content(client.get("/api/v1/products/export.csv", **headers))
+    assert len(everything.decode("utf-8-sig").splitlines()) == 5
+
+
+def test_export_rejects_unknown_format_and_foreign_search(search, auth_headers):
+    client, headers, search_request = search
+    outsider = auth_headers(client, "outsider@example.com", "+79000000501")
+
+    unknown = client.get(f"/api/v1/search/{search_request.pk}/export.pdf", **headers)
+    foreign = client.get(f"/api/v1/search/{search_request.pk}/export.csv", **outsider)
+
+    assert unknown.status_code == 404
+    assert foreign.status_code == 404
+    assert "Search request not found" in foreign.content.decode("utf-8-sig")
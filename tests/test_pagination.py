@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from backend.apps.accounts.models import User
+from backend.apps.products.models import Product
+from backend.apps.search.models import SearchRequest
+
+
+def _walk(client, url, headers):
+    pages = []
+    while url:
+        data = client.get(url, **headers).json()
+        pages.append([row["id"] for row in data["results"]])
+        url = data["next"]
+    return pages
+
+
+@pytest.mark.django_db
+def test_products_page_by_created_at_then_id_without_count(
+    django_assert_num_queries, auth_headers
+):
+    client = Client()
+    headers = auth_headers(client, "pages@example.com", "+79000000300")
+    user = User.objects.get(email="pages@example.com")
+    search_request = SearchRequest.objects.create(user=user, query_string="P")
+    products = Product.objects.bulk_create(
+        Product(
+            user=user, search_request=search_request, artid=f"A{i}", name="n", pin="P"
+        )
+        for i in range(7)
+    )
+    # Rows 0-3 share one timestamp: the id breaks the tie.
+    now = timezone.now()
+    Product.objects.filter(pk__in=[p.pk for p in products[:4]]).update(created_at=now)
+    Product.objects.filter(pk__in=[p.pk for p in products[4:]]).update(
+        created_at=now + timedelta(seconds=1)
+    )
+    ids = [p.pk for p in products]
+
+    pages = _walk(client, "/api/v1/products/?page_size=3", headers)
+
+    assert pages == [
+        [ids[6], ids[5], ids[4]],
+        [ids[3], ids[2], ids[1]],
+        [ids[0]],
+    ]
+    with django_assert_num_queries(2):  # user + one page, no COUNT(*)
+        client.get("/api/v1/products/?page_size=3", **headers)
+
+
+@pytest.mark.django_db
+def test_search_history_is_cursor_paginated(auth_headers):
+    client = Client()
+    headers = auth_headers(client, "history@example.com", "+79000000301")
+    user = User.objects.get(email="history@example.com")
+    other = User.objects.create_user(
+        email="other@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000302",
+    )
+    SearchRequest.objects.create(user=other, query_string="X")
+    created = [
+        SearchRequest.objects.create(user=user, query_string=f"Q{i}").pk
+        for i in range(5)
+    ]
+
+    pages = _walk(client, "/api/v1/search/?page_size=2", headers)
+
+    newest = created[::-1]
+    assert pages == [newest[:2], newest[2:4], newest[4:]]
+    first = client.get("/api/v1/search/", **headers).json()
+    assert first["next"] is None and len(first["results"]) == 5
+    bad = client.get("/api/v1/search/?cursor=bm9wZQ", **headers)
+    assert bad.status_code == 404
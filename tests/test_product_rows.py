@@ -0,0 +1,75 @@
+import json
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from backend.apps.products.models import (
+    DetailsRequestStatus,
+    Product,
+    ProductDetails,
+    ProductDetailsRequest,
+)
+from backend.apps.products.rows import serialize_product_list, serialize_products
+from backend.apps.products.serializers import ProductSerializer
+from backend.apps.products.services import upsert_products_from_search
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.search.models import SearchRequest
+
+
+@pytest.fixture
+def products(db):
+    search_request = SearchRequest.objects.create(query_string="P")
+    items = [
+        ArmtekSearchItem(
+            pin="P",
+            brand="KYB",
+            artid=f"A{i}",
+            name=f"name {i}",
+            price=Decimal("270.4") if i % 2 else None,
+            supply_probability=Decimal("95.5"),
+            available_quantity=i,
+            is_analog=bool(i % 3) if i % 4 else None,
+        )
+        for i in range(6)
+    ]
+    products = upsert_products_from_search(
+        items, user=None, search_request=search_request
+    )
+    ProductDetails.objects.create(
+        product=products[1],
+        weight=Decimal("1.5"),
+        length=Decimal("12"),
+        image_url="https://img.example.com/1.jpg",
+        fetched_at=timezone.now(),
+    )
+    ProductDetails.objects.create(product=products[2])
+    ProductDetailsRequest.objects.filter(product=products[3]).update(
+        status=DetailsRequestStatus.FAILED, last_error="timeout"
+    )
+    ProductDetailsRequest.objects.filter(product=products[4]).delete()
+    return products
+
+
+def _json(data):
+    return json.dumps(data, default=str)
+
+
+def test_rows_match_product_serializer_output(products):
+    queryset = Product.objects.order_by("id")
+
+    expected = ProductSerializer(queryset, many=True).data
+
+    rows = serialize_products(queryset)
+    assert _json(rows) == _json(expected)
+    assert [list(row) for row in rows] == [list(row) for row in expected]
+
+
+def test_list_of_products_keeps_order_and_repeats(products, django_assert_num_queries):
+    wanted = [products[3], products[0], products[3]]
+
+    with django_assert_num_queries(1):
+        rows = serialize_product_list(wanted)
+
+    assert [row["id"] for row in rows] == [p.pk for p in wanted]
+    assert _json(rows) == _json(ProductSerializer(wanted, many=True).data)
@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.apps.products.models import (
+    DetailsRequestStatus,
+    Product,
+    ProductDetailsRequest,
+)
+from backend.apps.products.services import (
+    upsert_product_from_search,
+    upsert_products_from_search,
+)
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.search.models import SearchRequest
+
+
+def _item(artid, **fields):
+    fields.setdefault("name", f"name {artid}")
+    return ArmtekSearchItem(pin="P", brand="KYB", artid=artid, **fields)
+
+
+@pytest.mark.django_db
+def test_batch_upsert_creates_updates_and_keeps_non_blank_fields(
+    django_assert_max_num_queries,
+):
+    search_request = SearchRequest.objects.create(query_string="P")
+    existing = upsert_product_from_search(
+        _item("A1", note="keep me", price=1.0), user=None, search_request=search_request
+    )
+    ProductDetailsRequest.objects.filter(product=existing).update(last_error="old")
+    items = [_item(f"N{i}", price=float(i)) for i in range(20)]
+    items += [_item("A1", note=None, name="", price=2.0), _item("N0", price=5.0)]
+
+    with django_assert_max_num_queries(8):
+        products = upsert_products_from_search(
+            items, user=None, search_request=search_request
+        )
+
+    assert [p.artid for p in products] == [item.artid for item in items]
+    assert products[0] is products[-1]
+    assert Product.objects.filter(search_request=search_request).count() == 21
+    stored = Product.objects.get(search_request=search_request, artid="A1")
+    assert (stored.note, stored.name, float(stored.price)) == ("keep me", "name A1", 2)
+    assert float(Product.objects.get(artid="N0").price) == 5
+    requests = ProductDetailsRequest.objects.filter(
+        product__search_request=search_request
+    )
+    assert requests.count() == 21
+    assert set(requests.values_list("status", "last_error")) == {
+        (DetailsRequestStatus.PENDING, "")
+    }
+
+
+@pytest.mark.django_db
+def test_same_artid_in_other_search_request_is_a_new_row():
+    first = SearchRequest.objects.create(query_string="P")
+    second = SearchRequest.objects.create(query_string="P")
+
+    a = upsert_products_from_search([_item("A1")], user=None, search_request=first)
+    b = upsert_products_from_search([_item("A1")], user=None, search_request=second)
+
+    assert a[0].pk and b[0].pk and a[0].pk != b[0].pk
+
+
+@pytest.mark.django_db
+def test_refreshing_unchanged_decimal_prices_only_touches_fetch_time():
+    search_request = SearchRequest.objects.create(query_string="P")
+    item = _item("A1", price=Decimal("270.40"), markup=Decimal("12.5"))
+    upsert_products_from_search([item], user=None, search_request=search_request)
+
+    with CaptureQueriesContext(connection) as queries:
+        upsert_products_from_search([item], user=None, search_request=search_request)
+
+    (update,) = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+    assert '"fetched_at"' in update
+    assert '"price"' not in update and '"markup"' not in update
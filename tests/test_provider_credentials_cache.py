@@ -0,0 +1,82 @@
+import pytest
+from django.test import Client
+
+from backend.apps.accounts.models import User
+from backend.apps.providers.models import ProviderAccount
+from backend.apps.providers.services import (
+    clear_credentials_cache,
+    resolve_armtek_credentials,
+    save_provider_account,
+)
+
+
+def _save(user, login):
+    return save_provider_account(
+        user=user,
+        provider_name="armtek",
+        login=login,
+        password="secret",
+        vkorg="4000",
+        kunnr_rg="100",
+    )
+
+
+@pytest.mark.django_db
+def test_credentials_are_resolved_once_and_invalidated_on_save(
+    django_assert_num_queries,
+):
+    user = User.objects.create_user(
+        email="creds@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000100",
+    )
+    _save(user, "first")
+
+    with django_assert_num_queries(1):
+        assert resolve_armtek_credentials(user).login == "first"
+        assert resolve_armtek_credentials(user).login == "first"
+
+    _save(user, "second")
+    assert resolve_armtek_credentials(user).login == "second"
+
+
+@pytest.mark.django_db
+def test_foreign_writes_wait_for_ttl_unless_cache_disabled(settings):
+    user = User.objects.create_user(
+        email="creds2@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000101",
+    )
+    _save(user, "first")
+    resolve_armtek_credentials(user)
+    # Written by another process: only the TTL notices it.
+    ProviderAccount.objects.filter(user=user).update(login="other")
+    assert resolve_armtek_credentials(user).login == "first"
+
+    settings.ARMTEK_CREDENTIALS_CACHE_SECONDS = 0
+    clear_credentials_cache()
+    assert resolve_armtek_credentials(user).login == "other"
+    ProviderAccount.objects.filter(user=user).update(login="third")
+    assert resolve_armtek_credentials(user).login == "third"
+
+
+@pytest.mark.django_db
+def test_delete_view_drops_cached_credentials():
+    client = Client()
+    creds = {
+        "email": "creds3@example.com",
+        "password": "Sup3rStrongP@ssw0rd!",
+        "phone_number": "+79000000102",
+        "country": "RU",
+    }
+    client.post("/api/v1/auth/register", creds, content_type="application/json")
+    login = client.post("/api/v1/auth/login", creds, content_type="application/json")
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {login.json()['tokens']['access']}"}
+    user = User.objects.get(email=creds["email"])
+    _save(user, "first")
+    assert resolve_armtek_credentials(user) is not None
+
+    resp = client.delete("/api/v1/providers/armtek/credentials", **headers)
+
+    assert resp.status_code == 204
+    assert resolve_armtek_credentials(user) is None
@@ -0,0 +1,213 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.test import Client
+
+from backend.apps.accounts.models import User
+from backend.apps.pagination import UpdatedCursorPagination
+from backend.apps.products.models import ProductDetails, ProductDetailsRequest
+from backend.apps.providers.armtek.exceptions import ArmtekTransportError
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.providers.services import save_provider_account
+from backend.apps.search.services import perform_bulk_search
+
+SIZES = (1, 25)
+# A details changes cursor from before any change: every product is reported.
+EPOCH_CURSOR = UpdatedCursorPagination().encode_cursor(
+    (datetime.min.replace(tzinfo=timezone.utc), 0)
+)
+
+
+def _products(data):
+    return [product.pk for product in data["products"]]
+
+
+def _tokens(data):
+    return [str(product.details_request.request_id) for product in data["products"]]
+
+
+# name: (method, path, payload, budget); the budget holds for every result size.
+ENDPOINTS = {
+    "auth-profile": ("get", lambda d: "/api/v1/auth/profile", None, 2),
+    "product-list": ("get", lambda d: "/api/v1/products/", None, 2),
+    "product-list-by-search": (
+        "get",
+        lambda d: f"/api/v1/products/?search_request_id={d['search'].pk}",
+        None,
+        2,
+    ),
+    "product-detail": (
+        "get",
+        lambda d: f"/api/v1/products/{d['products'][-1].pk}",
+        None,
+        2,
+    ),
+    "product-export": ("get", lambda d: "/api/v1/products/export.csv", None, 2),
+    "product-details-ingest": (
+        "post",
+        lambda d: (
+            f"/api/v1/products/{d['products'][0].pk}/details"
+            f"?request_id={d['products'][0].details_request.request_id}"
+        ),
+        lambda d: {"weight": "1,5", "image_url": "https://img.example.com/1.jpg"},
+        8,
+    ),
+    "product-details-request": (
+        "post",
+        lambda d: "/api/v1/products/details/request",
+        lambda d: {"product_ids": _products(d)},
+        8,
+    ),
+    "product-details-status": (
+        "post",
+        lambda d: "/api/v1/products/details/status",
+        lambda d: {"request_ids": _tokens(d)},
+        2,
+    ),
+    "product-details-changes": (
+        "get",
+        lambda d: f"/api/v1/products/details/changes?timeout=0&cursor={EPOCH_CURSOR}",
+        None,
+        3,
+    ),
+    "product-details-jobs": (
+        "get",
+        lambda d: "/api/v1/products/details/jobs?limit=200",
+        None,
+        2,
+    ),
+    "search-history": ("get", lambda d: "/api/v1/search/", None, 2),
+    "search-single": (
+        "post",
+        lambda d: "/api/v1/search/",
+        lambda d: {"query": "NEW1_KYB"},
+        21,
+    ),
+    "search-bulk": (
+        "post",
+        lambda d: "/api/v1/search/bulk",
+        lambda d: {"queries": [f"NEW{i}_KYB" for i in range(len(d["products"]))]},
+        21,
+    ),
+    "search-bulk-stream": (
+        "post",
+        lambda d: "/api/v1/search/bulk/stream",
+        lambda d: {"queries": [f"NEW{i}_KYB" for i in range(len(d["products"]))]},
+        10,
+    ),
+    "search-detail": ("get", lambda d: f"/api/v1/search/{d['search'].pk}", None, 4),
+    "search-export": (
+        "get",
+        lambda d: f"/api/v1/search/{d['search'].pk}/export.xlsx",
+        None,
+        3,
+    ),
+    "search-queries": (
+        "get",
+        lambda d: f"/api/v1/search/{d['search'].pk}/queries",
+        None,
+        3,
+    ),
+    "search-resume": (
+        "post",
+        lambda d: f"/api/v1/search/{d['search'].pk}/resume",
+        lambda d: {},
+        20,
+    ),
+    "provider-accounts": ("get", lambda d: "/api/v1/providers/", None, 2),
+    "armtek-search-proxy": (
+        "post",
+        lambda d: "/api/v1/providers/armtek/search",
+        lambda d: {"query": "NEW1_KYB"},
+        22,
+    ),
+    "armtek-credentials": (
+        "get",
+        lambda d: "/api/v1/providers/armtek/credentials",
+        None,
+        2,
+    ),
+}
+
+# Queries allowed per result row on top of the budget: the stream commits and
+# serializes every query on its own.
+PER_ROW = {"search-bulk-stream": 11}
+
+
+@pytest.fixture
+def armtek(settings, monkeypatch):
+    settings.ARMTEK_ENABLE_STUB = False
+    settings.ARMTEK_SEARCH_CACHE_ENABLED = False
+    down = set()
+
+    def fake_search(self, *, pin, brand=None):
+        if pin in down:
+            raise ArmtekTransportError("timeout", timeout=True)
+        return [
+            ArmtekSearchItem(
+                pin=pin, brand=brand, name="n", artid=f"{pin}-1", price=Decimal("10")
+            )
+        ]
+
+    monkeypatch.setattr(ArmtekSearchService, "search", fake_search)
+    return down
+
+
+def _dataset(client, size, index):
+    creds = {
+        "email": f"budget{index}@example.com",
+        "password": "Sup3rStrongP@ssw0rd!",
+        "phone_number": f"+79000002{index:03d}",
+        "country": "RU",
+    }
+    client.post("/api/v1/auth/register", creds, content_type="application/json")
+    login = client.post("/api/v1/auth/login", creds, content_type="application/json")
+    user = User.objects.get(email=creds["email"])
+    save_provider_account(
+        user=user,
+        provider_name="armtek",
+        login="login",
+        password="secret",
+        vkorg="4000",
+        kunnr_rg="100",
+    )
+    # One failed line makes the search resumable.
+    queries = [f"P{i}_KYB" for i in range(size)] + ["FAIL_KYB"]
+    search, products = perform_bulk_search(queries, user=user)
+    for position, product in enumerate(products):
+        if position % 2:
+            ProductDetails.objects.create(product=product, weight=Decimal("1.5"))
+    ProductDetailsRequest.objects.filter(product__in=products[::3]).update(
+        last_error="timeout"
+    )
+    return {
+        "headers": {"HTTP_AUTHORIZATION": f"Bearer {login.json()['tokens']['access']}"},
+        "search": search,
+        "products": products,
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", sorted(ENDPOINTS))
+def test_endpoint_stays_within_query_budget(name, armtek, query_budget):
+    method, path, payload, limit = ENDPOINTS[name]
+    per_row = PER_ROW.get(name, 0)
+    counts = []
+    for index, size in enumerate(SIZES):
+        client = Client()
+        armtek.add("FAIL")
+        data = _dataset(client, size, index)
+        armtek.clear()
+        url, body = path(data), payload(data) if payload else None
+        kwargs = {"content_type": "application/json"} if payload else {}
+        budget = limit + per_row * size
+        with query_budget(budget, f"{name} with {size} rows") as captured:
+            response = getattr(client, method)(url, body, **kwargs, **data["headers"])
+            if response.streaming:
+                b"".join(response.streaming_content)
+        assert response.status_code < 300, response.content
+        counts.append(len(captured))
+    if not per_row:
+        assert counts[0] == counts[1], f"{name} query count grows with rows: {counts}"
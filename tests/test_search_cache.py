@@ -0,0 +1,56 @@
+import pytest
+from django.core.cache import cache
+
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.search.services import perform_bulk_search
+
+
+@pytest.fixture
+def armtek_calls(settings, monkeypatch):
+    settings.ARMTEK_ENABLE_STUB = False
+    cache.clear()
+    metrics.reset()
+    calls = []
+
+    def fake_search(self, *, pin, brand=None):
+        calls.append((self.credentials.kunnr_rg, pin, brand))
+        return [ArmtekSearchItem(pin=pin, brand=brand, name="n", artid=f"{pin}-1")]
+
+    monkeypatch.setattr(ArmtekSearchService, "search", fake_search)
+    return calls
+
+
+@pytest.mark.django_db
+def test_repeated_lookup_is_served_from_cache_across_requests(
+    armtek_calls, armtek_user
+):
+    first = armtek_user("c1@example.com", "+79000000030")
+    second = armtek_user("c2@example.com", "+79000000031")
+
+    perform_bulk_search(["1111_KYB"], user=first)
+    _, products = perform_bulk_search(["1111_kyb"], user=second)
+
+    assert armtek_calls == [("100", "1111", "KYB")]
+    assert products[0].artid == "1111-1"
+    assert products[0].user == second
+    assert metrics.snapshot() == {"search_cache.hit": 1, "search_cache.miss": 1}
+
+
+@pytest.mark.django_db
+def test_cache_is_scoped_to_account_context_and_ttl(
+    armtek_calls, settings, armtek_user
+):
+    first = armtek_user("c3@example.com", "+79000000032", kunnr_rg="100")
+    other = armtek_user("c4@example.com", "+79000000033", kunnr_rg="200")
+
+    perform_bulk_search(["1111_KYB"], user=first)
+    perform_bulk_search(["1111_KYB"], user=other)
+    assert len(armtek_calls) == 2
+
+    settings.SEARCH_CACHE_TTL_MINUTES = 0
+    cache.clear()
+    perform_bulk_search(["1111_KYB"], user=first)
+    perform_bulk_search(["1111_KYB"], user=first)
+    assert len(armtek_calls) == 4
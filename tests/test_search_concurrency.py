@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+from django.db import connections
+
+from backend.apps.accounts.models import User
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.search.services import perform_bulk_search
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        email="bulk@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000010",
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_search_fans_out_and_keeps_input_order(settings, monkeypatch, user):
+    settings.ARMTEK_ENABLE_STUB = True
+    settings.ARMTEK_MAX_CONCURRENCY = 3
+    original_search = ArmtekSearchService.search
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def slow_search(self, *, pin, brand=None):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        # Later queries finish first to prove the order is restored.
+        time.sleep(0.02 * (10 - int(pin)))
+        with lock:
+            state["active"] -= 1
+        return original_search(self, pin=pin, brand=brand)
+
+    monkeypatch.setattr(ArmtekSearchService, "search", slow_search)
+
+    queries = [f"{i}_KYB" for i in range(1, 9)]
+    search_request, products = perform_bulk_search(queries, user=user)
+
+    assert [p.pin for p in products] == [str(i) for i in range(1, 9)]
+    assert search_request.total_items == 8
+    assert 1 < state["peak"] <= 3
+
+
+@pytest.mark.django_db
+def test_bulk_search_runs_sequentially_with_concurrency_of_one(settings, user):
+    settings.ARMTEK_ENABLE_STUB = True
+    settings.ARMTEK_MAX_CONCURRENCY = 1
+
+    _, products = perform_bulk_search(["1_KYB", "2_KYB"], user=user)
+
+    assert [p.pin for p in products] == ["1", "2"]
+
+
+@pytest.mark.django_db
+def test_worker_connections_close_once_after_the_bulk(settings, monkeypatch, user):
+    settings.ARMTEK_ENABLE_STUB = True
+    settings.ARMTEK_MAX_CONCURRENCY = 3
+    wrapper_class = type(connections["default"])
+    original_close = wrapper_class.close
+    closed = []
+
+    def tracking_close(self):
+        closed.append((self, threading.current_thread()))
+        original_close(self)
+
+    monkeypatch.setattr(wrapper_class, "close", tracking_close)
+    original_search = ArmtekSearchService.search
+    workers = set()
+
+    def search(self, *, pin, brand=None):
+        # Each lookup uses the worker's connection, as rate-limit backends do.
+        connections["default"].ensure_connection()
+        workers.add((connections["default"], threading.current_thread()))
+        assert not closed
+        return original_search(self, pin=pin, brand=brand)
+
+    monkeypatch.setattr(ArmtekSearchService, "search", search)
+
+    perform_bulk_search([f"{i}_KYB" for i in range(1, 7)], user=user)
+
+    worker_wrappers = {wrapper for wrapper, _ in workers}
+    closed_wrappers = [wrapper for wrapper, _ in closed]
+    assert worker_wrappers <= set(closed_wrappers)
+    assert len(closed_wrappers) == len(set(closed_wrappers))
+    assert {thread for _, thread in closed} == {threading.main_thread()}
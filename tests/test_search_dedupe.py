@@ -0,0 +1,66 @@
+import pytest
+
+from backend.apps.accounts.models import User
+from backend.apps.products.models import Product
+from backend.apps.providers.armtek import metrics
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.providers.services import save_provider_account
+from backend.apps.search.models import QueryItemStatus
+from backend.apps.search.normalization import lookup_key, normalize_lookup
+from backend.apps.search.services import perform_bulk_search
+
+
+def test_lookup_key_ignores_case_whitespace_punctuation_and_aliases(settings):
+    settings.SEARCH_BRAND_ALIASES = {"MB": "MERCEDES-BENZ"}
+
+    assert lookup_key("abc-123", "bosch") == lookup_key("ABC123", " BOSCH ")
+    assert lookup_key("A.1/2", "Mann Filter") == lookup_key("a12", "MANN-FILTER")
+    assert normalize_lookup(" a1 ", "mb") == ("A1", "MERCEDES-BENZ")
+    assert lookup_key("A1", "MB") == lookup_key("a1", "Mercedes Benz")
+
+
+@pytest.mark.django_db
+def test_duplicate_lines_share_one_lookup_and_fan_out(settings, monkeypatch):
+    settings.ARMTEK_ENABLE_STUB = False
+    settings.ARMTEK_SEARCH_CACHE_ENABLED = False
+    metrics.reset()
+    calls = []
+
+    def fake_search(self, *, pin, brand=None):
+        calls.append((pin, brand))
+        return [ArmtekSearchItem(pin=pin, brand=brand, name="n", artid=f"{pin}-1")]
+
+    monkeypatch.setattr(ArmtekSearchService, "search", fake_search)
+    user = User.objects.create_user(
+        email="dedupe@example.com",
+        password="Sup3rStrongP@ssw0rd!",
+        phone_number="+79000000090",
+    )
+    save_provider_account(
+        user=user,
+        provider_name="armtek",
+        login="login",
+        password="secret",
+        vkorg="4000",
+        kunnr_rg="100",
+    )
+    queries = ["ABC123_Bosch", "X1_KYB", "abc123_BOSCH", "ABC-123_bosch", "x1_kyb"]
+
+    search_request, products = perform_bulk_search(queries, user=user)
+
+    assert calls == [("ABC123", "BOSCH"), ("X1", "KYB")]
+    assert [p.artid for p in products] == [
+        "ABC123-1",
+        "X1-1",
+        "ABC123-1",
+        "ABC123-1",
+        "X1-1",
+    ]
+    assert search_request.duplicate_queries == 3
+    assert search_request.total_items == 5
+    assert Product.objects.filter(search_request=search_request).count() == 2
+    assert set(search_request.items.values_list("status", flat=True)) == {
+        QueryItemStatus.DONE
+    }
+    assert metrics.snapshot()["search.lookups_saved"] == 3
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from django.test import Client
+
+from backend.apps.accounts.models import User
+from backend.apps.products.models import Product
+from backend.apps.products.rows import iter_product_rows, serialize_products
+from backend.apps.search.models import SearchRequest
+
+
+@pytest.fixture
+def search(db, auth_headers):
+    client = Client()
+    headers = auth_headers(client, "detail@example.com", "+79000000400")
+    user = User.objects.get(email="detail@example.com")
+    search_request = SearchRequest.objects.create(user=user, query_string="P")
+    Product.objects.bulk_create(
+        Product(
+            user=user, search_request=search_request, artid=f"A{i}", name="n", pin="P"
+        )
+        for i in range(7)
+    )
+    products = Product.objects.filter(search_request=search_request).order_by("id")
+    return client, headers, search_request, serialize_products(products)
+
+
+def test_detail_pages_products_in_insertion_order(search):
+    client, headers, search_request, expected = search
+    url = f"/api/v1/search/{search_request.pk}?page_size=3"
+
+    pages = []
+    while url:
+        data = client.get(url, **headers).json()
+        assert data["request"]["id"] == search_request.pk
+        assert data["count"] == 7
+        pages.append(data["products"])
+        url = data["next"]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [row for page in pages for row in page] == json.loads(json.dumps(expected))
+
+
+def test_detail_streams_all_products(search):
+    client, headers, search_request, expected = search
+
+    response = client.get(
+        f"/api/v1/search/{search_request.pk}",
+        HTTP_ACCEPT="application/x-ndjson",
+        **headers,
+    )
+
+    assert response.streaming
+    assert response["Content-Type"].startswith("application/x-ndjson")
+    events = [
+        json.loads(line) for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert [event["event"] for event in events] == ["request", "products", "summary"]
+    assert events[0]["count"] == 7
+    assert events[1]["products"] == json.loads(json.dumps(expected))
+    assert events[-1] == {"event": "summary", "count": 7}
+
+
+def test_product_rows_are_read_one_batch_per_query(search, django_assert_num_queries):
+    _, _, search_request, expected = search
+    products = Product.objects.filter(search_request=search_request)
+
+    with django_assert_num_queries(3):
+        batches = list(iter_product_rows(products, batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [row for batch in batches for row in batch] == expected
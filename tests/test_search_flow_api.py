@@ -91,6 +91,6 @@ def test_search_history_list(settings):
 
     list_resp = client.get("/api/v1/search/", **headers)
     assert list_resp.status_code == 200
-    history = list_resp.json()
+    history = list_resp.json()["results"]
     assert history, "Expected at least one history entry"
     assert history[0]["query_string"]
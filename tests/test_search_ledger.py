@@ -0,0 +1,89 @@
+import pytest
+from django.test import Client
+
+from backend.apps.providers.armtek.exceptions import ArmtekTransportError
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.search.models import QueryItemStatus, SearchQueryItem
+
+
+@pytest.fixture
+def armtek(settings, monkeypatch):
+    settings.ARMTEK_ENABLE_STUB = False
+    settings.ARMTEK_SEARCH_CACHE_ENABLED = False
+    state = {"calls": [], "down": {"2222"}}
+
+    def fake_search(self, *, pin, brand=None):
+        state["calls"].append(pin)
+        if pin in state["down"]:
+            raise ArmtekTransportError("timeout", timeout=True)
+        return [ArmtekSearchItem(pin=pin, brand=brand, name="n", artid=f"{pin}-1")]
+
+    monkeypatch.setattr(ArmtekSearchService, "search", fake_search)
+    return state
+
+
+@pytest.mark.django_db
+def test_bulk_continues_past_failed_queries_and_resumes_only_them(armtek, auth_headers):
+    client = Client()
+    headers = auth_headers(client, "ledger@example.com", "+79000000080", armtek=True)
+
+    resp = client.post(
+        "/api/v1/search/bulk",
+        {"bulk_text": "1111_KYB\n2222_MANN\n3333_KYB"},
+        content_type="application/json",
+        **headers,
+    )
+    assert resp.status_code == 201
+    request_data = resp.json()["request"]
+    assert request_data["status"] == "partial"
+    assert (request_data["processed_queries"], request_data["failed_queries"]) == (3, 1)
+    assert [p["pin"] for p in resp.json()["products"]] == ["1111", "3333"]
+
+    queries = client.get(
+        f"/api/v1/search/{request_data['id']}/queries?status=failed", **headers
+    ).json()
+    assert [(q["query"], q["attempts"]) for q in queries] == [("2222_MANN", 1)]
+    assert "timeout" in queries[0]["last_error"]
+
+    armtek["down"].clear()
+    armtek["calls"].clear()
+    resp = client.post(
+        f"/api/v1/search/{request_data['id']}/resume",
+        {},
+        content_type="application/json",
+        **headers,
+    )
+
+    assert resp.status_code == 200
+    assert armtek["calls"] == ["2222"]
+    assert resp.json()["request"]["status"] == "done"
+    assert resp.json()["request"]["total_items"] == 3
+    item = SearchQueryItem.objects.get(query="2222_MANN")
+    assert (item.status, item.attempts) == (QueryItemStatus.DONE, 2)
+
+    again = client.post(
+        f"/api/v1/search/{request_data['id']}/resume",
+        {},
+        content_type="application/json",
+        **headers,
+    )
+    assert again.status_code == 409
+
+
+@pytest.mark.django_db
+def test_search_where_every_query_failed_is_failed(armtek, auth_headers):
+    client = Client()
+    headers = auth_headers(client, "ledger2@example.com", "+79000000081", armtek=True)
+
+    resp = client.post(
+        "/api/v1/search/",
+        {"query": "2222_MANN"},
+        content_type="application/json",
+        **headers,
+    )
+
+    assert resp.status_code == 502
+    history = client.get("/api/v1/search/", **headers).json()["results"]
+    assert history[0]["status"] == "failed"
+    assert history[0]["failed_queries"] == 1
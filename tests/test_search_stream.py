@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from django.test import Client
+
+
+def _body(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_bulk_stream_emits_ndjson_line_per_query_then_summary(settings, auth_headers):
+    settings.ARMTEK_ENABLE_STUB = True
+    client = Client()
+    headers = auth_headers(client, "stream@example.com", "+79000000070")
+
+    resp = client.post(
+        "/api/v1/search/bulk/stream",
+        {"bulk_text": "1111_KYB\n2222_MANN"},
+        content_type="application/json",
+        **headers,
+    )
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in _body(resp).splitlines()]
+    assert [(e["event"], e.get("query")) for e in events] == [
+        ("query", "1111_KYB"),
+        ("query", "2222_MANN"),
+        ("summary", None),
+    ]
+    assert events[1]["products"][0]["brand"] == "MANN"
+    assert events[2]["request"]["status"] == "done"
+    assert events[2]["request"]["total_items"] == 2
+
+
+@pytest.mark.django_db
+def test_bulk_stream_as_server_sent_events_reports_errors(settings, auth_headers):
+    settings.ARMTEK_ENABLE_STUB = False
+    client = Client()
+    headers = auth_headers(client, "stream2@example.com", "+79000000071")
+
+    resp = client.post(
+        "/api/v1/search/bulk/stream",
+        {"queries": ["1111_KYB"]},
+        content_type="application/json",
+        HTTP_ACCEPT="text/event-stream",
+        **headers,
+    )
+
+    assert resp["Content-Type"].startswith("text/event-stream")
+    event, data = _body(resp).strip().split("\n")
+    assert event == "event: error"
+    payload = json.loads(data.removeprefix("data: "))
+    assert "credentials" in payload["detail"]
+    assert payload["request"]["status"] == "failed"
+
+
+@pytest.mark.django_db
+def test_bulk_stream_validation_error_is_a_single_event(auth_headers):
+    client = Client()
+    headers = auth_headers(client, "stream3@example.com", "+79000000072")
+
+    resp = client.post(
+        "/api/v1/search/bulk/stream",
+        {"queries": []},
+        content_type="application/json",
+        **headers,
+    )
+
+    assert resp.status_code == 400
+    assert json.loads(resp.content)["event"] == "error"
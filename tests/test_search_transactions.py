@@ -0,0 +1,92 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from backend.apps.products.models import Product
+from backend.apps.providers.armtek.services import ArmtekSearchService
+from backend.apps.providers.armtek.types import ArmtekSearchItem
+from backend.apps.search import services as search_services
+from backend.apps.search.models import SearchRequest, SearchStatus
+from backend.apps.search.services import (
+    perform_bulk_search,
+    perform_single_search,
+    requeue_stale_searches,
+)
+
+
+@pytest.fixture
+def armtek(settings, monkeypatch):
+    settings.ARMTEK_ENABLE_STUB = False
+    settings.ARMTEK_SEARCH_CACHE_ENABLED = False
+    settings.ARMTEK_MAX_CONCURRENCY = 1
+    state = {"in_transaction": [], "crash_on": None}
+
+    def fake_search(self, *, pin, brand=None):
+        state["in_transaction"].append(connection.in_atomic_block)
+        if pin == state["crash_on"]:
+            raise RuntimeError("worker killed")
+        return [ArmtekSearchItem(pin=pin, brand=brand, name="n", artid=f"{pin}-1")]
+
+    monkeypatch.setattr(ArmtekSearchService, "search", fake_search)
+    return state
+
+
+@pytest.mark.django_db(transaction=True)
+def test_armtek_calls_run_outside_transactions(armtek, armtek_user):
+    user = armtek_user("tx1@example.com", "+79000000060")
+
+    perform_single_search("1_KYB", user=user)
+    perform_bulk_search(["2_KYB", "3_KYB"], user=user)
+
+    assert armtek["in_transaction"] == [False, False, False]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_search_keeps_committed_batches_consistent(
+    armtek, monkeypatch, armtek_user
+):
+    monkeypatch.setattr(search_services, "_PERSIST_BATCH", 2)
+    armtek["crash_on"] = "4"
+    user = armtek_user("tx2@example.com", "+79000000061")
+
+    with pytest.raises(RuntimeError):
+        perform_bulk_search([f"{i}_KYB" for i in range(1, 6)], user=user)
+
+    search_request = SearchRequest.objects.get(user=user)
+    assert search_request.status == SearchStatus.FAILED
+    assert search_request.processed_queries == 2
+    assert search_request.total_items == 2
+    assert Product.objects.filter(search_request=search_request).count() == 2
+
+
+@pytest.mark.django_db
+def test_stale_in_progress_search_is_requeued_and_finished(armtek, armtek_user):
+    user = armtek_user("tx3@example.com", "+79000000062")
+    stale = SearchRequest.objects.create(
+        user=user,
+        query_string="1_KYB\n2_KYB",
+        status=SearchStatus.IN_PROGRESS,
+        total_queries=2,
+        processed_queries=1,
+    )
+    fresh = SearchRequest.objects.create(
+        user=user, query_string="3_KYB", status=SearchStatus.IN_PROGRESS
+    )
+    SearchRequest.objects.filter(pk=stale.pk).update(
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+
+    assert requeue_stale_searches() == 1
+    stale.refresh_from_db()
+    assert stale.status == SearchStatus.PENDING
+
+    call_command("run_search_worker", "--once", stdout=StringIO())
+
+    stale.refresh_from_db()
+    fresh.refresh_from_db()
+    assert (stale.status, stale.processed_queries) == (SearchStatus.DONE, 2)
+    assert fresh.status == SearchStatus.IN_PROGRESS
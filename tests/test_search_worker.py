@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+
+@pytest.mark.django_db
+def test_async_bulk_search_is_processed_by_worker(settings, auth_headers):
+    settings.ARMTEK_ENABLE_STUB = True
+    client = Client()
+    headers = auth_headers(client, "worker@example.com", "+79000000020")
+
+    resp = client.post(
+        "/api/v1/search/bulk",
+        {"bulk_text": "1111_KYB\n2222_MANN", "mode": "async"},
+        content_type="application/json",
+        **headers,
+    )
+    assert resp.status_code == 202
+    request_data = resp.json()["request"]
+    assert request_data["status"] == "pending"
+    assert request_data["total_queries"] == 2
+    assert request_data["processed_queries"] == 0
+
+    detail = client.get(f"/api/v1/search/{request_data['id']}", **headers).json()
+    assert detail["products"] == []
+
+    call_command("run_search_worker", "--once", stdout=StringIO())
+
+    detail = client.get(f"/api/v1/search/{request_data['id']}", **headers).json()
+    assert detail["request"]["status"] == "done"
+    assert detail["request"]["processed_queries"] == 2
+    assert detail["request"]["total_items"] == 2
+    assert [p["pin"] for p in detail["products"]] == ["1111", "2222"]
+
+
+@pytest.mark.django_db
+def test_worker_records_failure_on_request(settings, auth_headers):
+    settings.ARMTEK_ENABLE_STUB = False
+    client = Client()
+    headers = auth_headers(client, "worker2@example.com", "+79000000021")
+
+    resp = client.post(
+        "/api/v1/search/bulk",
+        {"queries": ["1111_KYB"], "mode": "async"},
+        content_type="application/json",
+        **headers,
+    )
+    request_id = resp.json()["request"]["id"]
+
+    call_command("run_search_worker", "--once", stdout=StringIO())
+
+    detail = client.get(f"/api/v1/search/{request_id}", **headers).json()
+    assert detail["request"]["status"] == "failed"
+    assert "credentials" in detail["request"]["last_error"]